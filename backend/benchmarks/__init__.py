@@ -0,0 +1,4 @@
+"""
+Repeatable benchmarks for the MeetingService read/write paths and webhook
+ingestion on synthetic data. Run with `python benchmarks/run.py`.
+"""
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmark result files from benchmarks/run.py, e.g.
+    python benchmarks/compare.py baseline.json results.json --threshold 0.15
+
+Exits 1 when any benchmark's p50 grew by more than the threshold.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """Per-benchmark p50 change; regressed when it grew by more than threshold"""
+    rows = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if not before or not before["p50_ms"]:
+            continue
+        change = (result["p50_ms"] - before["p50_ms"]) / before["p50_ms"]
+        rows.append({
+            "name": name,
+            "baseline_ms": before["p50_ms"],
+            "current_ms": result["p50_ms"],
+            "change": change,
+            "regressed": change > threshold
+        })
+    return rows
+
+def print_comparison(baseline: dict, current: dict, rows: list):
+    if baseline.get("params") != current.get("params"):
+        print(f"⚠️  Parameters differ: {baseline.get('params')} vs {current.get('params')}")
+    print(f"p50 {baseline['meta']['commit']} -> {current['meta']['commit']}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regressed"] else ""
+        print(f"  {row['name']:<36}{row['baseline_ms']:>10.3f}{row['current_ms']:>10.3f} ms{row['change']:>+8.1%}{flag}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed p50 slowdown before failing")
+    args = parser.parse_args()
+
+    baseline = json.loads(Path(args.baseline).read_text())
+    current = json.loads(Path(args.current).read_text())
+    rows = compare(baseline, current, args.threshold)
+    print_comparison(baseline, current, rows)
+    sys.exit(1 if any(row["regressed"] for row in rows) else 0)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Load test for the /api/events stream with thousands of idle subscribers.
+
+Without --url the event bus is exercised in-process: N subscribers are
+attached, events are published and fan-out time is measured.
+
+With --url the script opens N SSE connections to a running server, posts
+meeting.participant_joined webhooks and measures delivery latency, e.g.
+    python benchmarks/event_stream.py --url http://localhost:8000 --subscribers 2000 --output events.json
+
+Results are in the benchmarks/run.py format, so benchmarks/compare.py (or
+--baseline) compares two runs made in the same mode.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.run import add_report_arguments, build_report, finish, percentile, summarize
+
+async def run_in_process(subscribers: int, events: int, topic_ratio: float) -> dict:
+    """Measure publish fan-out cost against idle in-process subscribers"""
+    from services.event_bus import EventBus
+
+    bus = EventBus()
+    tracemalloc.start()
+    topic_subscribers = int(subscribers * topic_ratio)
+    subs = [bus.subscribe([f"meeting-{i % 50}"]) for i in range(topic_subscribers)]
+    subs += [bus.subscribe() for _ in range(subscribers - topic_subscribers)]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = []
+    for i in range(events):
+        started = time.perf_counter()
+        bus.publish("meeting.participant_joined", f"meeting-{i % 50}", {"participant": f"user {i}"})
+        timings.append((time.perf_counter() - started) * 1000)
+        # Idle subscribers read nothing; drain so the bounded buffers don't drop them
+        for sub in subs:
+            while not sub.queue.empty():
+                sub.queue.get_nowait()
+
+    print(f"In-process bus: {subscribers} subscribers ({topic_subscribers} topic-filtered), {events} events")
+    print(f"  subscriber memory: {peak / subscribers:.0f} bytes each")
+    print(f"  publish p50={percentile(timings, 50):.3f} ms  p99={percentile(timings, 99):.3f} ms")
+    print(f"  dropped subscribers: {bus.stats()['dropped_subscribers']}")
+    return {"event_bus.publish": summarize(timings)}
+
+async def run_http(url: str, subscribers: int, events: int, interval: float) -> dict:
+    """Measure end-to-end delivery latency through a running server"""
+    import httpx
+
+    sent_at = {}
+    latencies = []
+    connected = 0
+    ready = asyncio.Event()
+
+    async def subscriber(client: httpx.AsyncClient, index: int):
+        nonlocal connected
+        async with client.stream("GET", f"{url}/api/events") as response:
+            connected += 1
+            if connected == subscribers:
+                ready.set()
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                data = json.loads(line[6:])
+                marker = data.get("participant")
+                if marker in sent_at:
+                    latencies.append((time.perf_counter() - sent_at[marker]) * 1000)
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(limits=limits, timeout=None) as client:
+        tasks = [asyncio.create_task(subscriber(client, i)) for i in range(subscribers)]
+        await asyncio.wait_for(ready.wait(), timeout=120)
+        print(f"{subscribers} subscribers connected")
+
+        for i in range(events):
+            marker = f"load-test-{i}"
+            sent_at[marker] = time.perf_counter()
+            await client.post(f"{url}/webhooks/zoom", json={
+                "event": "meeting.participant_joined",
+                "payload": {"object": {
+                    "id": "load-test",
+                    "join_time": "2025-01-01T00:00:00Z",
+                    "participant": {"user_id": f"u{i}", "user_name": marker}
+                }}
+            })
+            await asyncio.sleep(interval)
+
+        await asyncio.sleep(2)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    expected = subscribers * events
+    print(f"Delivered {len(latencies)}/{expected} events")
+    if not latencies:
+        return {}
+    print(
+        f"  latency p50={percentile(latencies, 50):.1f} ms  p95={percentile(latencies, 95):.1f} ms  "
+        f"p99={percentile(latencies, 99):.1f} ms  mean={statistics.mean(latencies):.1f} ms"
+    )
+    return {"events_stream.delivery": summarize(latencies)}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the SSE event stream")
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--url", help="Base URL of a running server; omit for the in-process test")
+    parser.add_argument("--interval", type=float, default=0.05, help="Seconds between webhooks (HTTP mode)")
+    parser.add_argument("--topic-ratio", type=float, default=0.5, help="Share of topic-filtered subscribers")
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    params = {"subscribers": args.subscribers, "events": args.events}
+    if args.url:
+        params.update(mode="http", interval=args.interval)
+        results = asyncio.run(run_http(args.url.rstrip("/"), args.subscribers, args.events, args.interval))
+    else:
+        params.update(mode="in-process", topic_ratio=args.topic_ratio)
+        results = asyncio.run(run_in_process(args.subscribers, args.events, args.topic_ratio))
+    sys.exit(finish(build_report(params, results), args))
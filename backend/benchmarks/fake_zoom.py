@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+A local stand-in for the Zoom API and OAuth server, serving synthetic
+meetings from benchmarks/synthetic.py, e.g.
+    python benchmarks/fake_zoom.py --port 9100 --meetings 500 --latency-ms 80 --rate-limit-rps 20
+
+Point the app at it with
+    ZOOM_API_BASE_URL=http://127.0.0.1:9100/v2 ZOOM_OAUTH_BASE_URL=http://127.0.0.1:9100
+
+Every API response is delayed by --latency-ms (plus up to --jitter-ms), fails
+with 500 at --error-rate and with 429 at --rate-limit-rate or once more than
+--rate-limit-rps calls arrive in a second. Recording downloads stream
+--download-mb of bytes, optionally capped at --download-mbps. Injection can be
+changed while running with PUT /_fake/config; counters are at GET /_fake/stats.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from benchmarks.synthetic import generate_meetings
+
+DOWNLOAD_CHUNK = b"\0" * 65536
+
+config = {
+    "latency_ms": 0.0,
+    "jitter_ms": 0.0,
+    "error_rate": 0.0,
+    "rate_limit_rate": 0.0,
+    "rate_limit_rps": 0,
+    "retry_after": 1,
+    "download_mb": 20.0,
+    "download_mbps": 0.0
+}
+stats = {"requests": 0, "errors": 0, "rate_limited": 0, "downloads": 0, "download_bytes": 0, "tokens": 0}
+meetings: Dict[str, Dict] = {}
+_window = {"second": 0, "calls": 0}
+
+app = FastAPI(title="Fake Zoom API")
+
+
+def load(count: int, participants: int, rejoin_rate: float, recordings: int, seed: int, public_url: str):
+    """Generate the meetings served, with download URLs pointing back here"""
+    meetings.clear()
+    for meeting in generate_meetings(count, participants, rejoin_rate, recordings, seed=seed):
+        meeting_id = meeting["meeting"]["meeting_id"]
+        for recording in meeting["recordings"]:
+            recording["download_url"] = f"{public_url}/download/{meeting_id}/{recording['id']}"
+        meetings[meeting_id] = meeting
+
+
+async def _inject() -> Optional[JSONResponse]:
+    """Apply the configured latency and return an injected failure, if any"""
+    stats["requests"] += 1
+    delay = config["latency_ms"] + random.random() * config["jitter_ms"]
+    if delay > 0:
+        await asyncio.sleep(delay / 1000)
+
+    second = int(time.monotonic())
+    if _window["second"] != second:
+        _window["second"], _window["calls"] = second, 0
+    _window["calls"] += 1
+    over_limit = config["rate_limit_rps"] and _window["calls"] > config["rate_limit_rps"]
+    if over_limit or random.random() < config["rate_limit_rate"]:
+        stats["rate_limited"] += 1
+        return JSONResponse(
+            {"code": 429, "message": "You have reached the maximum per-second rate limit for this API."},
+            status_code=429,
+            headers={"Retry-After": str(config["retry_after"])}
+        )
+    if random.random() < config["error_rate"]:
+        stats["errors"] += 1
+        return JSONResponse({"code": 500, "message": "Injected failure"}, status_code=500)
+    return None
+
+
+def _meeting(meeting_id: str) -> Dict:
+    meeting = meetings.get(meeting_id)
+    if meeting is None:
+        raise HTTPException(status_code=404, detail={"code": 3001, "message": "Meeting does not exist."})
+    return meeting
+
+
+@app.post("/oauth/token")
+async def token(request: Request):
+    """Any code or refresh token is accepted"""
+    stats["tokens"] += 1
+    return {
+        "access_token": uuid.uuid4().hex,
+        "refresh_token": uuid.uuid4().hex,
+        "token_type": "bearer",
+        "expires_in": 3600,
+        "scope": "meeting:read recording:read report:read"
+    }
+
+
+@app.get("/v2/users/{user_id}/meetings")
+async def list_meetings(user_id: str, page_size: int = 30):
+    if failure := await _inject():
+        return failure
+    page = [
+        {"id": int(m["meeting"]["meeting_id"]), "topic": m["meeting"]["topic"], "start_time": m["meeting"]["start_time"]}
+        for m in list(meetings.values())[:page_size]
+    ]
+    return {"page_size": page_size, "total_records": len(meetings), "meetings": page}
+
+
+@app.get("/v2/meetings/{meeting_id}")
+async def meeting_details(meeting_id: str):
+    if failure := await _inject():
+        return failure
+    details = _meeting(meeting_id)["meeting"]
+    return {**details, "id": int(meeting_id), "duration": 60, "type": 2}
+
+
+@app.get("/v2/past_meetings/{meeting_id}/participants")
+async def past_participants(meeting_id: str):
+    if failure := await _inject():
+        return failure
+    participants = _meeting(meeting_id)["participants"]
+    return {"page_size": len(participants), "total_records": len(participants), "participants": participants}
+
+
+@app.get("/v2/report/meetings/{meeting_id}")
+async def meeting_report(meeting_id: str):
+    if failure := await _inject():
+        return failure
+    meeting = _meeting(meeting_id)
+    return {**meeting["meeting"], "participants": meeting["participants"]}
+
+
+@app.get("/v2/meetings/{meeting_id}/recordings")
+async def recordings(meeting_id: str):
+    if failure := await _inject():
+        return failure
+    size = int(config["download_mb"] * 1024 * 1024)
+    return {
+        "id": int(meeting_id),
+        "recording_files": [{**r, "file_size": size} for r in _meeting(meeting_id)["recordings"]]
+    }
+
+
+@app.get("/download/{meeting_id}/{recording_id}")
+async def download(meeting_id: str, recording_id: str):
+    """Stream download_mb of zeros, throttled to download_mbps when set"""
+    if failure := await _inject():
+        return failure
+    size = int(config["download_mb"] * 1024 * 1024)
+    stats["downloads"] += 1
+
+    async def body():
+        sent = 0
+        started = time.perf_counter()
+        while sent < size:
+            chunk = DOWNLOAD_CHUNK[:size - sent]
+            yield chunk
+            sent += len(chunk)
+            stats["download_bytes"] += len(chunk)
+            if config["download_mbps"]:
+                ahead = sent / (config["download_mbps"] * 1024 * 1024) - (time.perf_counter() - started)
+                if ahead > 0:
+                    await asyncio.sleep(ahead)
+
+    return StreamingResponse(
+        body(), media_type="application/octet-stream", headers={"Content-Length": str(size)}
+    )
+
+
+@app.get("/_fake/config")
+async def get_config():
+    return config
+
+
+@app.put("/_fake/config")
+async def update_config(changes: Dict):
+    unknown = set(changes) - set(config)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown settings: {sorted(unknown)}")
+    for key, value in changes.items():
+        config[key] = type(config[key])(value)
+    return config
+
+
+@app.get("/_fake/stats")
+async def get_stats():
+    return {**stats, "meetings": len(meetings)}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run a fake Zoom API for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--public-url", help="Base URL the app reaches this server at (default http://HOST:PORT)")
+    parser.add_argument("--meetings", type=int, default=200)
+    parser.add_argument("--participants", type=int, default=50)
+    parser.add_argument("--rejoin-rate", type=float, default=0.2)
+    parser.add_argument("--recordings", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rps", type=int, default=0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--download-mb", type=float, default=20.0)
+    parser.add_argument("--download-mbps", type=float, default=0.0)
+    args = parser.parse_args()
+
+    for key in config:
+        config[key] = getattr(args, key)
+    load(
+        args.meetings, args.participants, args.rejoin_rate, args.recordings, args.seed,
+        (args.public_url or f"http://{args.host}:{args.port}").rstrip("/")
+    )
+    print(f"Fake Zoom serving {len(meetings)} meetings on http://{args.host}:{args.port}")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
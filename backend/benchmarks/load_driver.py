@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+End-to-end load against a running app wired to benchmarks/fake_zoom.py:
+concurrent meeting syncs, recording downloads and signed webhook
+deliveries, with throughput and p50/p95/p99 latency per scenario, e.g.
+
+    python benchmarks/fake_zoom.py --meetings 200 --latency-ms 80 &
+    ZOOM_API_BASE_URL=http://127.0.0.1:9100/v2 ZOOM_OAUTH_BASE_URL=http://127.0.0.1:9100 \\
+        ZOOM_CLIENT_ID=x ZOOM_CLIENT_SECRET=x ZOOM_REDIRECT_URI=x WEBHOOK_SECRET_TOKEN=load python main.py &
+    python benchmarks/load_driver.py --concurrency 20 --requests 200 --webhook-secret load
+    python benchmarks/load_driver.py --scenarios outage --requests 100
+
+If the app has no OAuth token yet, the driver gets one through
+/auth/zoom/callback, which the fake server answers.
+
+The outage scenario has the fake server fail every call, then hang on every
+call, timing Zoom meeting lists (answered from the last good list, marked
+stale) and syncs (failing fast once their circuit opens) during each, and
+how long after Zoom recovers the list is fresh again. It changes the fake
+server's config and resets it to the latency and error rate it had.
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+from benchmarks.run import percentile
+from benchmarks.synthetic import generate_meetings, webhook_events
+
+SCENARIOS = ["sync", "download", "webhook", "outage"]
+
+# Fake server settings for each outage phase: failing with 500s, then hanging
+OUTAGES = {"down": {"error_rate": 1.0}, "hung": {"latency_ms": 60000.0}}
+
+def stale_status(response: httpx.Response) -> str:
+    """The status code, with " stale" when a Zoom list came from the last good response"""
+    if response.status_code == 200 and response.json().get("stale"):
+        return "200 stale"
+    return str(response.status_code)
+
+async def drive(name: str, requests, concurrency: int, client: httpx.AsyncClient, label=None) -> dict:
+    """Send (method, path, kwargs) requests with at most `concurrency` in flight.
+
+    Responses are counted by status code, or by label(response) if given.
+    """
+    queue = asyncio.Queue()
+    for request in requests:
+        queue.put_nowait(request)
+    timings, statuses = [], {}
+
+    async def worker():
+        while not queue.empty():
+            method, path, kwargs = queue.get_nowait()
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, **kwargs)
+                status = label(response) if label else str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            timings.append((time.perf_counter() - started) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+
+    result = {
+        "requests": len(timings),
+        "statuses": statuses,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(timings) / elapsed, 2) if elapsed else None,
+        "p50_ms": round(percentile(timings, 50), 2) if timings else None,
+        "p95_ms": round(percentile(timings, 95), 2) if timings else None,
+        "p99_ms": round(percentile(timings, 99), 2) if timings else None
+    }
+    print(f"{name:<12}{result['requests']:>7} req{result['throughput_rps'] or 0:>9.1f} req/s"
+          f"  p50 {result['p50_ms']} ms  p95 {result['p95_ms']} ms  p99 {result['p99_ms']} ms  {statuses}")
+    return result
+
+async def ensure_authenticated(client: httpx.AsyncClient):
+    status = (await client.get("/auth/status")).json()
+    if not status.get("authenticated"):
+        # The fake OAuth server accepts any code
+        response = await client.get("/auth/zoom/callback", params={"code": "load-test"})
+        if response.status_code >= 400:
+            raise SystemExit(f"Could not authenticate against the fake server: {response.text}")
+
+async def meeting_ids(zoom_url: str, count: int):
+    async with httpx.AsyncClient(base_url=zoom_url) as zoom:
+        response = await zoom.get("/v2/users/me/meetings", params={"page_size": count})
+        response.raise_for_status()
+        return [str(m["id"]) for m in response.json()["meetings"]]
+
+async def outage(client: httpx.AsyncClient, zoom_url: str, ids, args) -> dict:
+    """List and sync during each outage phase, then time the list's recovery"""
+    report = {}
+    async with httpx.AsyncClient(base_url=zoom_url) as zoom:
+        original = (await zoom.get("/_fake/config")).json()
+        # The last good list the app falls back on
+        (await client.get("/api/meetings/zoom/list")).raise_for_status()
+        for phase, changes in OUTAGES.items():
+            await zoom.put("/_fake/config", json=changes)
+            try:
+                lists = [("GET", "/api/meetings/zoom/list", {})] * args.requests
+                syncs = [
+                    ("POST", f"/api/meetings/{ids[i % len(ids)]}/sync", {"params": {"force": "true"}})
+                    for i in range(args.requests)
+                ]
+                report[phase] = {
+                    "list": await drive(f"{phase} list", lists, args.concurrency, client, stale_status),
+                    "sync": await drive(f"{phase} sync", syncs, args.concurrency, client)
+                }
+            finally:
+                await zoom.put("/_fake/config", json={key: original[key] for key in changes})
+
+            # Fresh again once the list's circuit lets a probe through and it succeeds
+            started = time.perf_counter()
+            while time.perf_counter() - started < args.timeout:
+                response = await client.get("/api/meetings/zoom/list")
+                if stale_status(response) == "200":
+                    break
+                await asyncio.sleep(0.25)
+            report[phase]["recovered_after_s"] = round(time.perf_counter() - started, 2)
+            print(f"{'':<12}list fresh again {report[phase]['recovered_after_s']} s after Zoom recovered")
+    return report
+
+def sign_body(body: bytes, secret: str) -> dict:
+    """Headers for a webhook body signed the way routes/webhooks.py verifies it"""
+    headers = {"Content-Type": "application/json"}
+    if secret:
+        digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        headers["x-zoom-signature"] = f"v0={digest}"
+    return headers
+
+def signed_webhook(payload: dict, secret: str) -> dict:
+    """Request kwargs for a signed webhook with this payload"""
+    body = json.dumps(payload).encode()
+    return {"content": body, "headers": sign_body(body, secret)}
+
+async def main(args):
+    report = {"url": args.url, "concurrency": args.concurrency, "scenarios": {}}
+    ids = await meeting_ids(args.zoom_url, args.meetings)
+    if not ids:
+        raise SystemExit("The fake Zoom server has no meetings")
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+        await ensure_authenticated(client)
+
+        if "sync" in args.scenarios:
+            requests = [
+                ("POST", f"/api/meetings/{ids[i % len(ids)]}/sync", {"params": {"force": "true"}})
+                for i in range(args.requests)
+            ]
+            report["scenarios"]["sync"] = await drive("sync", requests, args.concurrency, client)
+
+        if "download" in args.scenarios:
+            # Recordings have to be stored before they can be downloaded
+            recordings = []
+            for meeting_id in ids[:max(1, args.requests // 2)]:
+                await client.post(f"/api/meetings/{meeting_id}/recordings/sync")
+                listed = (await client.get(f"/api/meetings/{meeting_id}/recordings")).json()
+                recordings += [(meeting_id, r["recording_id"]) for r in listed.get("recordings", [])]
+            requests = [
+                ("POST", f"/api/meetings/{meeting_id}/recordings/{recording_id}/download", {})
+                for meeting_id, recording_id in (recordings * args.requests)[:args.requests]
+            ]
+            async with httpx.AsyncClient(base_url=args.zoom_url) as zoom:
+                before = (await zoom.get("/_fake/stats")).json()["download_bytes"]
+                result = await drive("download", requests, args.concurrency, client)
+                downloaded = (await zoom.get("/_fake/stats")).json()["download_bytes"] - before
+            result["bytes_per_sec"] = round(downloaded / result["elapsed_s"]) if result["elapsed_s"] else None
+            print(f"{'':<12}{downloaded / 1e6:.0f} MB at {(result['bytes_per_sec'] or 0) / 1e6:.1f} MB/s")
+            report["scenarios"]["download"] = result
+
+        if "webhook" in args.scenarios:
+            # Meetings outside the fake server's range, so meeting.ended syncs are not triggered
+            fresh = generate_meetings(meetings=args.requests // 100 + 1, participants=50, recordings=0, seed=3)
+            for offset, meeting in enumerate(fresh):
+                meeting["meeting"]["meeting_id"] = str(95000000000 + offset)
+            payloads = [event for meeting in fresh for event in webhook_events(meeting)][:args.requests]
+            requests = [("POST", "/webhooks/zoom", signed_webhook(p, args.webhook_secret)) for p in payloads]
+            report["scenarios"]["webhook"] = await drive("webhook", requests, args.concurrency, client)
+
+        if "outage" in args.scenarios:
+            report["scenarios"]["outage"] = await outage(client, args.zoom_url, ids, args)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test syncs, downloads and webhooks end to end")
+    parser.add_argument("--url", default="http://localhost:8000", help="The app")
+    parser.add_argument("--zoom-url", default="http://127.0.0.1:9100", help="benchmarks/fake_zoom.py")
+    # outage changes the fake server's config, so it only runs when asked for
+    parser.add_argument("--scenarios", nargs="*", choices=SCENARIOS, default=["sync", "download", "webhook"])
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=100, help="Requests per scenario")
+    parser.add_argument("--meetings", type=int, default=50, help="Fake meetings to sync and download from")
+    parser.add_argument("--webhook-secret", default="", help="The app's WEBHOOK_SECRET_TOKEN, if set")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--output", help="Write JSON results here")
+    asyncio.run(main(parser.parse_args()))
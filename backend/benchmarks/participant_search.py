@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark: participant search through the FTS5 index against a LIKE '%x%'
+scan, on a scratch SQLite database filled with synthetic rows, e.g.
+    python benchmarks/participant_search.py --participants 1000000 --output search.json
+
+LIKE with a LIMIT stops early on common words; its cost shows on rare ones.
+Results are in the benchmarks/run.py format, one entry per query and
+method, so benchmarks/compare.py (or --baseline) compares two runs.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.run import add_report_arguments, build_report, finish, summarize
+
+FIRST_NAMES = [
+    "Alice", "Bob", "Carol", "Dmitri", "Eve", "Fatima", "Grace", "Hiro", "Ines", "Jamal",
+    "Kofi", "Lena", "Mateo", "Nadia", "Oscar", "Priya", "Quinn", "Rosa", "Sven", "Tariq"
+]
+LAST_NAMES = [
+    "Anderson", "Baker", "Chen", "Dubois", "Evans", "Garcia", "Haddad", "Ivanova", "Jensen", "Kowalski",
+    "Larsen", "Moreau", "Nakamura", "Okafor", "Petrov", "Rossi", "Silva", "Tanaka", "Usman", "Smith"
+]
+COMPANIES = ["acme", "globex", "initech", "umbrella", "hooli"]
+TOPIC_WORDS = ["Standup", "Planning", "Retro", "Review", "Sync", "Onboarding", "Roadmap", "Budget"]
+QUERIES = ["al", "chen", "grace nakamura", "okafor@glob", "initech42", "zzz"]
+
+def populate(db_file: str, participants: int, per_meeting: int):
+    """Bulk insert synthetic meetings and participants; the triggers index them"""
+    rng = random.Random(42)
+    start = datetime(2025, 1, 1, 9, 0, 0)
+    conn = sqlite3.connect(db_file)
+    meetings = max(1, participants // per_meeting)
+    conn.executemany(
+        "INSERT INTO meetings (meeting_id, topic, start_time, host_email, participant_count) VALUES (?, ?, ?, ?, ?)",
+        (
+            (
+                str(100000000 + m),
+                f"{rng.choice(TOPIC_WORDS)} {rng.choice(TOPIC_WORDS)} #{m}",
+                (start + timedelta(hours=m)).isoformat(" "),
+                f"host{m % 200}@example.com",
+                per_meeting
+            )
+            for m in range(meetings)
+        )
+    )
+
+    def rows():
+        for i in range(participants):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            join = start + timedelta(hours=i // per_meeting, seconds=i % per_meeting)
+            yield (
+                str(100000000 + i // per_meeting),
+                f"user{i}",
+                f"{first} {last}",
+                f"{first.lower()}.{last.lower()}@{rng.choice(COMPANIES)}{i % 500}.com",
+                join.isoformat(" "),
+                (join + timedelta(minutes=30)).isoformat(" "),
+                1800
+            )
+
+    conn.executemany(
+        "INSERT INTO participants (meeting_id, user_id, user_name, user_email, join_time, leave_time, duration) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        rows()
+    )
+    conn.commit()
+    conn.close()
+
+def like_scan(db_file: str, q: str, limit: int) -> int:
+    """The query search would need without the index"""
+    conn = sqlite3.connect(db_file)
+    pattern = f"%{q}%"
+    rows = conn.execute(
+        "SELECT id FROM participants WHERE user_name LIKE ? OR user_email LIKE ? LIMIT ?",
+        (pattern, pattern, limit)
+    ).fetchall()
+    conn.close()
+    return len(rows)
+
+async def run(participants: int, per_meeting: int, repeat: int) -> dict:
+    from config.database import init_db, engine, AsyncSessionLocal
+    from services.search_service import search_service
+
+    # Keep SQL echo out of the timings
+    engine.echo = False
+    await init_db()
+    db_file = engine.url.database
+
+    started = time.perf_counter()
+    populate(db_file, participants, per_meeting)
+    print(f"Inserted {participants} participants with indexing in {time.perf_counter() - started:.1f}s "
+          f"({os.path.getsize(db_file) / 1e6:.0f} MB on disk)")
+
+    results = {}
+    print(f"{'query':<16}{'fts5 p50':>10}{'like p50':>10}{'hits':>6}  order")
+    async with AsyncSessionLocal() as db:
+        for q in QUERIES:
+            fts_timings, like_timings = [], []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                response = await search_service.search(db, q, ["participants"], limit=20)
+                fts_timings.append((time.perf_counter() - started) * 1000)
+
+                started = time.perf_counter()
+                like_scan(db_file, q, 20)
+                like_timings.append((time.perf_counter() - started) * 1000)
+            page = response["participants"]
+            order = "bm25" if page["ranked"] else "newest"
+            fts = results[f"search_participants.fts5[{q}]"] = summarize(fts_timings)
+            like = results[f"search_participants.like[{q}]"] = summarize(like_timings)
+            print(f"{q:<16}{fts['p50_ms']:>10.2f}{like['p50_ms']:>10.2f}{len(page['results']):>6}  {order}")
+    await engine.dispose()
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark FTS5 participant search")
+    parser.add_argument("--participants", type=int, default=1000000)
+    parser.add_argument("--per-meeting", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        # Must be set before config.database creates the engine
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{scratch}/bench_search.db"
+        results = asyncio.run(run(args.participants, args.per_meeting, args.repeat))
+    params = {"participants": args.participants, "per_meeting": args.per_meeting, "repeat": args.repeat}
+    sys.exit(finish(build_report(params, results), args))
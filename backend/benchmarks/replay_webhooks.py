@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Re-deliver a webhook stream captured with WEBHOOK_CAPTURE_PATH (or
+POST /webhooks/capture) to a running app, e.g.
+
+    python benchmarks/replay_webhooks.py data/webhooks.jsonl.gz --speed 50 --webhook-secret load
+    python benchmarks/replay_webhooks.py data/webhooks.jsonl.gz --max-rate --concurrency 50
+    python benchmarks/replay_webhooks.py data/webhooks.*.jsonl.gz   # one log per worker
+
+Deliveries keep their original spacing divided by --speed, or go out as fast
+as --concurrency allows with --max-rate. Bodies are sent byte for byte and
+re-signed with the target's WEBHOOK_SECRET_TOKEN.
+
+Reports sustained events/sec and, per event, the end-to-end lag from sending
+it until the app has stored it. The lag is taken from the /api/events
+stream, which the app publishes to after the event is committed; events it
+doesn't publish fall back to the HTTP response time.
+
+Replaying into a database that already holds the captured meetings adds
+duplicate join/leave events, so point the app at a scratch DATABASE_URL.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+from benchmarks.load_driver import sign_body
+from benchmarks.run import percentile
+from services.webhook_capture import read_capture
+from routes.webhooks import PUBLISHED_EVENTS
+
+# Captured headers sent again; the signature is recomputed
+FORWARDED_HEADERS = ("x-zm-request-timestamp", "x-zoom-request-id")
+
+
+def event_key(event: Optional[str], meeting_id, participant: Optional[str]) -> Tuple:
+    """Identify a delivery by the fields routes/webhooks.py publishes"""
+    return (event, str(meeting_id) if meeting_id else None, participant)
+
+
+def delivery_key(body: str) -> Optional[Tuple]:
+    """The stream key of a captured body, or None when the app won't publish it"""
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return None
+    event = payload.get("event")
+    if event not in PUBLISHED_EVENTS:
+        return None
+    event_data = payload.get("payload", {}).get("object", {})
+    return event_key(event, event_data.get("id"), (event_data.get("participant") or {}).get("user_name"))
+
+
+def _latency_summary(values: List[float]) -> Dict:
+    if not values:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+    return {
+        "p50_ms": round(percentile(values, 50), 2),
+        "p95_ms": round(percentile(values, 95), 2),
+        "p99_ms": round(percentile(values, 99), 2),
+        "max_ms": round(max(values), 2)
+    }
+
+
+class Replay:
+    """Sends captured deliveries and matches them against the event stream"""
+
+    def __init__(self, client: httpx.AsyncClient, secret: str, concurrency: int):
+        self.client = client
+        self.secret = secret
+        self.slots = asyncio.Semaphore(concurrency)
+        # Stream key -> send times of deliveries not yet seen on the stream
+        self.pending: Dict[Tuple, deque] = {}
+        self.unmatched = 0
+        self.lags: List[float] = []
+        self.response_ms: List[float] = []
+        self.statuses: Dict[str, int] = {}
+        self.stream_ready = asyncio.Event()
+        self.stream_drops = 0
+        self.last_stored: Optional[float] = None
+
+    async def watch_stream(self):
+        """Match published events to pending deliveries, reconnecting if dropped"""
+        while True:
+            try:
+                async with self.client.stream("GET", "/api/events", timeout=None) as response:
+                    event = None
+                    async for line in response.aiter_lines():
+                        if line.startswith("retry:"):
+                            self.stream_ready.set()
+                        elif line.startswith("event:"):
+                            event = line[6:].strip()
+                        elif line.startswith("data:") and event != "dropped":
+                            self._stored(json.loads(line[5:]))
+                        elif line.startswith("data:"):
+                            self.stream_drops += 1
+            except httpx.HTTPError:
+                await asyncio.sleep(0.5)
+
+    def _stored(self, data: Dict):
+        sent = self.pending.get(event_key(data.get("event"), data.get("meeting_id"), data.get("participant")))
+        if sent:
+            now = time.perf_counter()
+            self.lags.append((now - sent.popleft()) * 1000)
+            self.last_stored = now
+
+    async def deliver(self, record: Dict):
+        body = record["body"].encode()
+        headers = {name: value for name, value in record["headers"].items() if name in FORWARDED_HEADERS}
+        headers.update(sign_body(body, self.secret))
+        key = delivery_key(record["body"])
+
+        try:
+            started = time.perf_counter()
+            if key is not None:
+                self.pending.setdefault(key, deque()).append(started)
+            try:
+                response = await self.client.post("/webhooks/zoom", content=body, headers=headers)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            finished = time.perf_counter()
+            self.response_ms.append((finished - started) * 1000)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if key is None and status == "200":
+                # Not published, so stored is as soon as the handler returns
+                self.lags.append((finished - started) * 1000)
+                self.last_stored = finished
+            elif key is not None and status != "200" and started in self.pending[key]:
+                # Failed deliveries never show up on the stream
+                self.pending[key].remove(started)
+        finally:
+            self.slots.release()
+
+    async def settle(self, timeout: float):
+        """Wait for the stream to catch up with every successful delivery"""
+        deadline = time.perf_counter() + timeout
+        while any(self.pending.values()) and time.perf_counter() < deadline:
+            await asyncio.sleep(0.05)
+        self.unmatched = sum(len(sent) for sent in self.pending.values())
+
+
+async def main(args):
+    records = list(read_capture(*args.capture))[:args.limit or None]
+    if not records:
+        raise SystemExit(f"No captured deliveries in {', '.join(args.capture)}")
+    captured_s = records[-1]["received_at"] - records[0]["received_at"]
+    mode = "max rate" if args.max_rate else f"{args.speed:g}x"
+    print(f"Replaying {len(records)} deliveries spanning {captured_s:.1f}s at {mode}")
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+        replay = Replay(client, args.webhook_secret, args.concurrency)
+        watcher = asyncio.create_task(replay.watch_stream())
+        try:
+            await asyncio.wait_for(replay.stream_ready.wait(), 10)
+        except asyncio.TimeoutError:
+            raise SystemExit(f"Could not subscribe to {args.url}/api/events")
+
+        tasks = []
+        behind_ms = 0.0
+        started = time.perf_counter()
+        first = records[0]["received_at"]
+        for record in records:
+            if not args.max_rate:
+                due = started + (record["received_at"] - first) / args.speed
+                wait = due - time.perf_counter()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                else:
+                    behind_ms = max(behind_ms, -wait * 1000)
+            await replay.slots.acquire()
+            tasks.append(asyncio.create_task(replay.deliver(record)))
+        await asyncio.gather(*tasks)
+        sent_s = time.perf_counter() - started
+
+        await replay.settle(args.settle_timeout)
+        watcher.cancel()
+
+    stored_s = ((replay.last_stored or started) - started) or sent_s
+    report = {
+        "capture": args.capture,
+        "url": args.url,
+        "mode": mode,
+        "events": len(records),
+        "statuses": replay.statuses,
+        "captured_s": round(captured_s, 3),
+        "elapsed_s": round(stored_s, 3),
+        "events_per_sec": round(len(replay.lags) / stored_s, 2) if stored_s else None,
+        # How late the sender fell behind the scaled schedule; large means --speed outran --concurrency
+        "max_schedule_lag_ms": round(behind_ms, 2),
+        "response": _latency_summary(replay.response_ms),
+        "lag": _latency_summary(replay.lags),
+        "stored": len(replay.lags),
+        "unobserved": replay.unmatched,
+        "stream_drops": replay.stream_drops
+    }
+
+    print(f"{report['stored']}/{report['events']} stored in {report['elapsed_s']}s: "
+          f"{report['events_per_sec']} events/s  {replay.statuses}")
+    print(f"  response  p50 {report['response']['p50_ms']} ms  p95 {report['response']['p95_ms']} ms"
+          f"  p99 {report['response']['p99_ms']} ms")
+    print(f"  lag       p50 {report['lag']['p50_ms']} ms  p95 {report['lag']['p95_ms']} ms"
+          f"  p99 {report['lag']['p99_ms']} ms  max {report['lag']['max_ms']} ms")
+    if report["unobserved"] or report["stream_drops"]:
+        print(f"  {report['unobserved']} deliveries never appeared on the event stream"
+              f" ({report['stream_drops']} stream drops; raise EVENT_BUFFER_SIZE)")
+    if behind_ms > 100:
+        print(f"  fell {behind_ms:.0f} ms behind schedule; raise --concurrency or lower --speed")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay captured Zoom webhooks against the app")
+    parser.add_argument("capture", nargs="+", help="Log(s) written by WEBHOOK_CAPTURE_PATH")
+    parser.add_argument("--url", default="http://localhost:8000", help="The app")
+    timing = parser.add_mutually_exclusive_group()
+    timing.add_argument("--speed", type=float, default=1.0, help="Replay this many times faster than captured")
+    timing.add_argument("--max-rate", action="store_true", help="Ignore the captured timing")
+    parser.add_argument("--concurrency", type=int, default=20, help="Deliveries in flight at most")
+    parser.add_argument("--limit", type=int, default=0, help="Only the first N deliveries")
+    parser.add_argument("--webhook-secret", default="", help="The app's WEBHOOK_SECRET_TOKEN, if set")
+    parser.add_argument("--settle-timeout", type=float, default=30.0,
+                        help="Seconds to wait for stored events after the last delivery")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="Write JSON results here")
+    args = parser.parse_args()
+    if args.speed <= 0:
+        parser.error("--speed must be positive")
+    asyncio.run(main(args))
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Run the benchmark suite on a scratch SQLite database and write JSON results,
+e.g.
+    python benchmarks/run.py --meetings 200 --participants 100 --output results.json
+    python benchmarks/run.py --baseline results.json   # exit 1 on a regression
+
+Results carry the git commit and the dataset parameters; compare two runs
+with benchmarks/compare.py. Only runs with the same parameters compare.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.compare import compare, print_comparison
+from benchmarks.synthetic import generate_meetings
+from benchmarks.suite import BENCHMARKS, FakeZoom
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def summarize(timings) -> dict:
+    total = sum(timings)
+    return {
+        "ops": len(timings),
+        "mean_ms": round(statistics.mean(timings), 4),
+        "p50_ms": round(percentile(timings, 50), 4),
+        "p95_ms": round(percentile(timings, 95), 4),
+        "max_ms": round(max(timings), 4),
+        "ops_per_sec": round(len(timings) / (total / 1000), 2) if total else None
+    }
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=Path(__file__).parent, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def build_report(params: dict, results: dict) -> dict:
+    """Results with the commit and environment they were measured on, as compare.py reads them"""
+    import sqlalchemy
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "sqlite": __import__("sqlite3").sqlite_version,
+            "platform": platform.platform()
+        },
+        "params": params,
+        "results": results
+    }
+
+def add_report_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--output", help="Write JSON results here")
+    parser.add_argument("--baseline", help="Compare against an earlier results file")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed p50 slowdown before failing")
+
+def finish(report: dict, args) -> int:
+    """Write the report and compare it with --baseline; returns the exit status"""
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Results written to {args.output}")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        rows = compare(baseline, report, args.threshold)
+        print_comparison(baseline, report, rows)
+        return 1 if any(row["regressed"] for row in rows) else 0
+    return 0
+
+async def run(params: dict, repeat: int, only) -> dict:
+    from config.database import init_db, engine
+    from services.zoom_service import zoom_service
+
+    # Keep SQL echo out of the timings
+    engine.echo = False
+    # Importing the app installs its engine instrumentation, as in production
+    import main  # noqa: F401
+    await init_db()
+
+    dataset = generate_meetings(**params)
+    FakeZoom(dataset).install(zoom_service)
+
+    results = {}
+    for name, benchmark in BENCHMARKS.items():
+        # The initial sync loads the data the others read, so it always runs
+        if only and name not in only and not name.endswith(".initial"):
+            continue
+        started = time.perf_counter()
+        timings = await benchmark(dataset, repeat)
+        results[name] = summarize(timings)
+        print(f"{name:<36}{results[name]['p50_ms']:>10.3f} ms p50{results[name]['p95_ms']:>10.3f} ms p95"
+              f"{results[name]['ops_per_sec'] or 0:>12.1f} ops/s  ({time.perf_counter() - started:.1f}s)")
+    await engine.dispose()
+    return build_report({**params, "repeat": repeat}, results)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark MeetingService and webhook paths on synthetic data")
+    parser.add_argument("--meetings", type=int, default=200)
+    parser.add_argument("--participants", type=int, default=50, help="Attendees per meeting")
+    parser.add_argument("--rejoin-rate", type=float, default=0.2, help="Share of attendees who leave and rejoin")
+    parser.add_argument("--recordings", type=int, default=2, help="Recordings per meeting")
+    parser.add_argument("--people", type=int, default=2000, help="Distinct people attendees are drawn from")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=200, help="Operations per benchmark")
+    parser.add_argument("--only", nargs="*", choices=list(BENCHMARKS), help="Run only these benchmarks")
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    params = {
+        "meetings": args.meetings,
+        "participants": args.participants,
+        "rejoin_rate": args.rejoin_rate,
+        "recordings": args.recordings,
+        "people": args.people,
+        "seed": args.seed
+    }
+    with tempfile.TemporaryDirectory() as scratch:
+        # Must be set before config.database creates the engine
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{scratch}/benchmark.db"
+        report = asyncio.run(run(params, args.repeat, args.only))
+    sys.exit(finish(report, args))
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: serialize a meeting with many participants the old way
+(hand-built dicts + jsonable_encoder + stdlib json) and through
+services.serializers (compiled serializers + orjson), e.g.
+    python benchmarks/serialization.py --participants 10000 --output serialization.json
+
+Results are in the benchmarks/run.py format, so benchmarks/compare.py (or
+--baseline) compares two runs.
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.run import add_report_arguments, build_report, finish, summarize
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from config.database import Participant
+from services.serializers import FastJSONResponse, serialize_participant
+
+def make_participants(count: int):
+    """Build detached participant rows with realistic values"""
+    start = datetime(2025, 11, 25, 10, 0, 0)
+    return [
+        Participant(
+            id=i,
+            meeting_id="123456789",
+            user_id=f"user{i}",
+            user_name=f"Participant {i}",
+            user_email=f"participant{i}@example.com",
+            join_time=start + timedelta(seconds=i),
+            leave_time=start + timedelta(hours=1),
+            duration=3600 - i,
+            device="Windows",
+            ip_address="192.168.1.1",
+            location="New York, US"
+        )
+        for i in range(count)
+    ]
+
+def legacy_render(participants) -> bytes:
+    """Serialization path used by the routes before services.serializers"""
+    content = {
+        "participants": [
+            {
+                "id": p.id,
+                "user_id": p.user_id,
+                "user_name": p.user_name,
+                "user_email": p.user_email,
+                "join_time": p.join_time.isoformat() if p.join_time else None,
+                "leave_time": p.leave_time.isoformat() if p.leave_time else None,
+                "duration": p.duration,
+                "device": p.device,
+                "ip_address": p.ip_address,
+                "location": p.location
+            }
+            for p in participants
+        ]
+    }
+    return JSONResponse(jsonable_encoder(content)).body
+
+def fast_render(participants) -> bytes:
+    """Serialization path used by the routes now"""
+    content = {"participants": [serialize_participant(p) for p in participants]}
+    return FastJSONResponse(content).body
+
+def timed(func, participants, repeat: int) -> list:
+    """Wall-clock time in milliseconds of each run"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(participants)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare participant serialization paths")
+    parser.add_argument("--participants", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    participants = make_participants(args.participants)
+    assert len(legacy_render(participants)) > 0 and len(fast_render(participants)) > 0
+
+    results = {
+        "serialize_participants.jsonable_encoder": summarize(timed(legacy_render, participants, args.repeat)),
+        "serialize_participants.orjson": summarize(timed(fast_render, participants, args.repeat))
+    }
+    legacy_ms = results["serialize_participants.jsonable_encoder"]["p50_ms"]
+    fast_ms = results["serialize_participants.orjson"]["p50_ms"]
+
+    print(f"Serializing {args.participants} participants (p50 of {args.repeat}):")
+    print(f"  jsonable_encoder + json: {legacy_ms:8.1f} ms")
+    print(f"  compiled + orjson:       {fast_ms:8.1f} ms")
+    print(f"  speedup:                 {legacy_ms / fast_ms:8.1f}x")
+    report = build_report({"participants": args.participants, "repeat": args.repeat}, results)
+    sys.exit(finish(report, args))
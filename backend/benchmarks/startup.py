@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Measure how long the app takes to start: import time, time until /health
+answers, the startup phases main.py logs, the background warm-up and the
+first real request, over several boots against the same database, e.g.
+
+    python benchmarks/startup.py --runs 5 --budget-ms 1500
+    python benchmarks/startup.py --database data/meetings.db --upgrade
+
+Exits 1 when the median time to /health exceeds --budget-ms. --upgrade
+clears schema_version before each boot, so every boot takes the full
+schema upgrade path instead of the fingerprint fast path. A --database is
+copied first; the original is never opened by the app.
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+
+BACKEND = Path(__file__).parent.parent
+
+IMPORT_SNIPPET = "import time; started = time.perf_counter(); import main; print((time.perf_counter() - started) * 1000)"
+
+
+def app_env(database_url: str, port: int) -> Dict[str, str]:
+    return {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "HOST": "127.0.0.1",
+        "PORT": str(port),
+        "WORKERS": "1",
+        "LOG_FORMAT": "json",
+        "LOG_LEVEL": "INFO"
+    }
+
+
+def measure_import(env: Dict[str, str]) -> float:
+    """Milliseconds to import main in a fresh interpreter"""
+    result = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], cwd=BACKEND, env=env,
+                            capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def clear_schema_version(path: Path):
+    with sqlite3.connect(path) as conn:
+        conn.execute("DELETE FROM schema_version")
+
+
+def boot(env: Dict[str, str], url: str, log_path: Path, timeout: float) -> Dict:
+    """Start the app, time /health and the first request, stop it and read its startup log"""
+    # Built before the clock starts: a client's TLS setup would compete with the app for CPU
+    client = httpx.Client(base_url=url, timeout=30)
+    with open(log_path, "wb") as log, client:
+        started = time.perf_counter()
+        app = subprocess.Popen([sys.executable, "main.py"], cwd=BACKEND, env=env, stdout=log, stderr=subprocess.STDOUT)
+        try:
+            ready_ms = None
+            while time.perf_counter() - started < timeout:
+                if app.poll() is not None:
+                    raise SystemExit(f"The app exited with {app.returncode}; see {log_path}")
+                try:
+                    if client.get("/health").status_code == 200:
+                        ready_ms = (time.perf_counter() - started) * 1000
+                        break
+                except httpx.HTTPError:
+                    pass
+                time.sleep(0.005)
+            if ready_ms is None:
+                raise SystemExit(f"The app did not answer /health within {timeout:.0f}s")
+
+            request_started = time.perf_counter()
+            client.get("/api/meetings/", params={"limit": 50}).raise_for_status()
+            first_request_ms = (time.perf_counter() - request_started) * 1000
+            # Let the background warm-up log its time
+            time.sleep(0.5)
+        finally:
+            app.terminate()
+            try:
+                app.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                app.kill()
+                app.wait()
+
+    result = {"ready_ms": round(ready_ms, 1), "first_request_ms": round(first_request_ms, 1)}
+    for line in log_path.read_text().splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if "startup" in record:
+            result.update(record["startup"])
+        if "warm_up_ms" in record:
+            result["warm_up_ms"] = record["warm_up_ms"]
+    return result
+
+
+def median(runs: List[Dict], key: str) -> Optional[float]:
+    values = [run[key] for run in runs if key in run]
+    return round(statistics.median(values), 1) if values else None
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as scratch:
+        db_path = Path(scratch) / "startup.db"
+        database_url = f"sqlite+aiosqlite:///{db_path}"
+        if args.database:
+            shutil.copyfile(args.database, db_path)
+        else:
+            from benchmarks.worker_scaling import seed
+            # Must be set before config.database creates the engine
+            os.environ["DATABASE_URL"] = database_url
+            print(f"Seeding {args.meetings} meetings x {args.participants} participants")
+            asyncio.run(seed({"meetings": args.meetings, "participants": args.participants, "seed": 1}))
+
+        env = app_env(database_url, args.port)
+        url = f"http://127.0.0.1:{args.port}"
+        # One untimed boot brings a copied database up to date and warms the OS file cache
+        boot(env, url, Path(scratch) / "app.log", args.timeout)
+
+        runs = []
+        for n in range(args.runs):
+            if args.upgrade:
+                clear_schema_version(db_path)
+            run = {"import_ms": round(measure_import(env), 1)}
+            run.update(boot(env, url, Path(scratch) / "app.log", args.timeout))
+            runs.append(run)
+            print(f"boot {n + 1}: import {run['import_ms']} ms  ready {run['ready_ms']} ms"
+                  f"  (init_db {run.get('init_db_ms')} ms, lifespan {run.get('total_ms')} ms)"
+                  f"  warm-up {run.get('warm_up_ms')} ms  first request {run['first_request_ms']} ms")
+
+    keys = ["import_ms", "ready_ms", "coordination_ms", "init_db_ms", "backfill_ms", "live_state_ms",
+            "total_ms", "warm_up_ms", "first_request_ms"]
+    summary = {key: median(runs, key) for key in keys}
+    within = summary["ready_ms"] <= args.budget_ms
+    print(f"median: ready {summary['ready_ms']} ms (budget {args.budget_ms:g} ms, {'ok' if within else 'OVER'})"
+          f"  import {summary['import_ms']} ms  lifespan {summary['total_ms']} ms"
+          f"  first request {summary['first_request_ms']} ms")
+
+    if args.output:
+        report = {
+            "params": {"runs": args.runs, "upgrade": args.upgrade, "database": args.database,
+                       "meetings": None if args.database else args.meetings,
+                       "participants": None if args.database else args.participants},
+            "budget_ms": args.budget_ms,
+            "median": summary,
+            "runs": runs
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Results written to {args.output}")
+    sys.exit(0 if within else 1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure app startup time against a budget")
+    parser.add_argument("--runs", type=int, default=5, help="Timed boots")
+    parser.add_argument("--budget-ms", type=float, default=1500, help="Allowed median time until /health answers")
+    parser.add_argument("--database", help="Boot against a copy of this SQLite file instead of synthetic data")
+    parser.add_argument("--meetings", type=int, default=200)
+    parser.add_argument("--participants", type=int, default=50, help="Attendees per meeting")
+    parser.add_argument("--upgrade", action="store_true", help="Force the full schema upgrade on every boot")
+    parser.add_argument("--port", type=int, default=8831)
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for /health")
+    parser.add_argument("--output", help="Write JSON results here")
+    main(parser.parse_args())
@@ -0,0 +1,175 @@
+"""
+The benchmarks. Each one takes the generated dataset and returns the
+wall-clock milliseconds of every operation it timed; run.py turns those
+into summary statistics.
+
+Zoom is replaced by FakeZoom, which answers from the generated dataset, so
+sync benchmarks measure our own parsing and storage rather than the network.
+"""
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.synthetic import generate_meetings, webhook_events
+
+PAGE_SIZE = 50
+
+
+class FakeZoom:
+    """Serve ZoomService calls from a generated dataset"""
+
+    def __init__(self, dataset: List[Dict]):
+        self.by_id = {meeting["meeting"]["meeting_id"]: meeting for meeting in dataset}
+
+    def install(self, zoom_service):
+        async def get_meeting_details(meeting_id, db):
+            return self.by_id[meeting_id]["meeting"]
+
+        async def get_meeting_participants(meeting_id, db):
+            return self.by_id[meeting_id]["participants"]
+
+        async def get_meeting_recordings(meeting_id, db):
+            return self.by_id[meeting_id]["recordings"]
+
+        zoom_service.get_meeting_details = get_meeting_details
+        zoom_service.get_meeting_participants = get_meeting_participants
+        zoom_service.get_meeting_recordings = get_meeting_recordings
+
+
+async def _timed(operation) -> float:
+    started = time.perf_counter()
+    await operation
+    return (time.perf_counter() - started) * 1000
+
+
+async def bench_sync_initial(dataset: List[Dict], repeat: int) -> List[float]:
+    """First sync of every meeting: participants, sessions and recordings inserted.
+
+    Also loads the database the read benchmarks run against.
+    """
+    from config.database import AsyncSessionLocal
+    from services.meeting_service import meeting_service
+
+    timings = []
+    for meeting in dataset:
+        async with AsyncSessionLocal() as db:
+            meeting_id = meeting["meeting"]["meeting_id"]
+            await meeting_service.store_meeting(db, dict(meeting["meeting"]))
+            timings.append(await _timed(meeting_service.sync_meeting_participants(db, meeting_id)))
+            await meeting_service.sync_meeting_recordings(db, meeting_id)
+    return timings
+
+
+async def bench_sync_resync(dataset: List[Dict], repeat: int) -> List[float]:
+    """Re-sync of an already stored meeting: every session replaced, participants updated"""
+    from config.database import AsyncSessionLocal
+    from services.meeting_service import meeting_service
+
+    timings = []
+    for i in range(repeat):
+        meeting_id = dataset[i % len(dataset)]["meeting"]["meeting_id"]
+        async with AsyncSessionLocal() as db:
+            timings.append(await _timed(meeting_service.sync_meeting_participants(db, meeting_id)))
+    return timings
+
+
+async def bench_store_participant(dataset: List[Dict], repeat: int) -> List[float]:
+    """One webhook-style participant upsert: lookup, directory link, commit, refresh"""
+    from config.database import AsyncSessionLocal
+    from services.meeting_service import meeting_service
+
+    source = dataset[0]["participants"]
+    timings = []
+    async with AsyncSessionLocal() as db:
+        await meeting_service.store_meeting(db, {"meeting_id": "bench-store", "topic": "store_participant"})
+        for i in range(repeat):
+            entry = source[i % len(source)]
+            timings.append(await _timed(meeting_service.store_participant(db, {
+                "meeting_id": "bench-store",
+                # Half new rows, half updates of earlier ones
+                "user_id": f"{entry['user_id']}-{i // 2}",
+                "user_name": entry["name"],
+                "user_email": entry["user_email"],
+                "join_time": entry["join_time"],
+                "leave_time": entry["leave_time"],
+                "device": entry["device"],
+                "location": entry["location"]
+            })))
+    return timings
+
+
+async def bench_get_meeting_details(dataset: List[Dict], repeat: int) -> List[float]:
+    """Meeting with all its participants, on a fresh session like a request"""
+    from config.database import AsyncSessionLocal
+    from services.meeting_service import meeting_service
+
+    timings = []
+    for i in range(repeat):
+        meeting_id = dataset[i % len(dataset)]["meeting"]["meeting_id"]
+        async with AsyncSessionLocal() as db:
+            timings.append(await _timed(meeting_service.get_meeting_details(db, meeting_id)))
+    return timings
+
+
+async def bench_get_all_meetings(dataset: List[Dict], repeat: int) -> List[float]:
+    """Every page of the meeting list, first to last, PAGE_SIZE per page"""
+    from config.database import AsyncSessionLocal
+    from services.meeting_service import meeting_service
+
+    pages = max(1, (len(dataset) + PAGE_SIZE - 1) // PAGE_SIZE)
+    timings = []
+    for i in range(max(repeat, pages)):
+        async with AsyncSessionLocal() as db:
+            offset = (i % pages) * PAGE_SIZE
+            timings.append(await _timed(meeting_service.get_all_meetings(db, limit=PAGE_SIZE, offset=offset)))
+    return timings
+
+
+async def bench_get_participant_stats(dataset: List[Dict], repeat: int) -> List[float]:
+    """Duration aggregates for one meeting"""
+    from config.database import AsyncSessionLocal
+    from services.meeting_service import meeting_service
+
+    timings = []
+    for i in range(repeat):
+        meeting_id = dataset[i % len(dataset)]["meeting"]["meeting_id"]
+        async with AsyncSessionLocal() as db:
+            timings.append(await _timed(meeting_service.get_participant_stats(db, meeting_id)))
+    return timings
+
+
+async def bench_webhook_ingestion(dataset: List[Dict], repeat: int) -> List[float]:
+    """POST /webhooks/zoom join/leave events through the full ASGI stack.
+
+    Uses meetings that are not in the database yet, so every join is a new
+    row; meeting.ended is left out because it would sync from Zoom.
+    """
+    import httpx
+    from main import app
+
+    # 50 attendees make at least 101 events per meeting
+    fresh = generate_meetings(meetings=repeat // 100 + 1, participants=50, recordings=0, seed=2)
+    for offset, meeting in enumerate(fresh):
+        meeting["meeting"]["meeting_id"] = str(90000000000 + offset)
+    events = [event for meeting in fresh for event in webhook_events(meeting)][:repeat]
+
+    timings = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for payload in events:
+            started = time.perf_counter()
+            response = await client.post("/webhooks/zoom", json=payload)
+            timings.append((time.perf_counter() - started) * 1000)
+            response.raise_for_status()
+    return timings
+
+
+# Name -> benchmark, in run order; the initial sync must come first as it loads the data
+BENCHMARKS: Dict[str, Callable] = {
+    "sync_meeting_participants.initial": bench_sync_initial,
+    "sync_meeting_participants.resync": bench_sync_resync,
+    "store_participant": bench_store_participant,
+    "get_meeting_details": bench_get_meeting_details,
+    "get_all_meetings.page": bench_get_all_meetings,
+    "get_participant_stats": bench_get_participant_stats,
+    "webhook_ingestion": bench_webhook_ingestion,
+}
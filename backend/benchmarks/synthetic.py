@@ -0,0 +1,171 @@
+"""
+Synthetic Zoom data: meetings with participants in the shape the Zoom API
+returns them (one entry per join-to-leave interval, so a rejoin is a second
+entry for the same person), recordings, the webhooks a live meeting would
+send, and the transcript and chat files of a recording.
+"""
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+FIRST_NAMES = ["Alice", "Bob", "Carol", "Dmitri", "Eve", "Fatima", "Grace", "Hiro", "Ines", "Jamal"]
+LAST_NAMES = ["Anderson", "Baker", "Chen", "Dubois", "Evans", "Garcia", "Haddad", "Ivanova", "Jensen", "Okafor"]
+DEVICES = ["Mac", "Windows", "iOS", "Android", "Linux", "Web Browser Chrome", "Zoom Rooms"]
+LOCATIONS = ["New York, US", "London, GB", "Berlin, DE", "Sao Paulo, BR", "Mumbai, IN", "Tokyo, JP"]
+RECORDING_KINDS = [("shared_screen_with_speaker_view", "MP4"), ("audio_only", "M4A"), ("chat_file", "TXT")]
+
+START = datetime(2025, 1, 6, 9, 0, 0)
+MEETING_MINUTES = 60
+
+
+def _iso(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def generate_meetings(
+    meetings: int = 100,
+    participants: int = 50,
+    rejoin_rate: float = 0.2,
+    recordings: int = 2,
+    people: int = 2000,
+    seed: int = 1
+) -> List[Dict]:
+    """Build meetings as {"meeting", "participants", "recordings"} Zoom API payloads.
+
+    Attendees are drawn from a pool of `people` so the same person shows up
+    across meetings; `rejoin_rate` of them drop out and rejoin once.
+    """
+    rng = random.Random(seed)
+    data = []
+    for m in range(meetings):
+        meeting_id = str(80000000000 + m)
+        start = START + timedelta(hours=m)
+        end = start + timedelta(minutes=MEETING_MINUTES)
+
+        entries = []
+        for index in rng.sample(range(people), min(participants, people)):
+            person = {
+                "id": f"user{index}",
+                "user_id": f"user{index}",
+                "name": f"{FIRST_NAMES[index % 10]} {LAST_NAMES[index // 10 % 10]} {index}",
+                "user_email": f"user{index}@example.com",
+                "device": rng.choice(DEVICES),
+                "ip_address": f"10.{index // 250 % 250}.{index % 250}.{rng.randrange(1, 250)}",
+                "location": rng.choice(LOCATIONS)
+            }
+            join = start + timedelta(seconds=rng.randrange(600))
+            leave = end - timedelta(seconds=rng.randrange(600))
+            if rng.random() < rejoin_rate:
+                dropped = join + (leave - join) * rng.uniform(0.2, 0.6)
+                back = dropped + timedelta(seconds=rng.randrange(30, 300))
+                intervals = [(join, dropped), (back, leave)]
+            else:
+                intervals = [(join, leave)]
+            for joined, left in intervals:
+                entries.append({**person, "join_time": _iso(joined), "leave_time": _iso(left)})
+
+        data.append({
+            "meeting": {
+                "meeting_id": meeting_id,
+                "topic": f"Synthetic meeting {m}",
+                "start_time": _iso(start),
+                "end_time": _iso(end),
+                "host_email": f"host{m % 20}@example.com"
+            },
+            "participants": entries,
+            "recordings": [
+                {
+                    "id": f"rec-{meeting_id}-{r}",
+                    "recording_type": RECORDING_KINDS[r % len(RECORDING_KINDS)][0],
+                    "file_type": RECORDING_KINDS[r % len(RECORDING_KINDS)][1],
+                    "file_size": rng.randrange(1_000_000, 500_000_000),
+                    "download_url": f"https://zoom.example/rec/{meeting_id}/{r}",
+                    "play_url": f"https://zoom.example/play/{meeting_id}/{r}",
+                    "recording_start": _iso(start),
+                    "recording_end": _iso(end)
+                }
+                for r in range(recordings)
+            ]
+        })
+    return data
+
+
+def webhook_events(meeting: Dict) -> Iterator[Dict]:
+    """The webhook payloads Zoom would send for one generated meeting, in time order"""
+    details = meeting["meeting"]
+    numeric_id = int(details["meeting_id"])
+    events = [(details["start_time"], 0, {
+        "event": "meeting.started",
+        "payload": {"object": {"id": numeric_id, "topic": details["topic"], "start_time": details["start_time"]}}
+    })]
+    for entry in meeting["participants"]:
+        participant = {
+            "user_id": entry["user_id"],
+            "user_name": entry["name"],
+            "email": entry["user_email"],
+            "ip_address": entry["ip_address"],
+            "location": entry["location"]
+        }
+        events.append((entry["join_time"], 1, {
+            "event": "meeting.participant_joined",
+            "payload": {"object": {"id": numeric_id, "participant": {**participant, "join_time": entry["join_time"]}}}
+        }))
+        events.append((entry["leave_time"], 1, {
+            "event": "meeting.participant_left",
+            "payload": {"object": {"id": numeric_id, "participant": {**participant, "leave_time": entry["leave_time"]}}}
+        }))
+    events.sort(key=lambda event: event[:2])
+    for _, _, payload in events:
+        yield payload
+
+
+WORDS = (
+    "the a we to and of that is it for on this budget review next quarter team plan launch customer "
+    "feedback roadmap design release timeline risk update action item follow up agree think need "
+    "should could numbers metrics hiring onboarding support ticket backlog sprint demo question"
+).split()
+
+
+def _timestamp(seconds: float) -> str:
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{secs:06.3f}"
+
+
+def _sentence(rng: random.Random, low: int, high: int) -> str:
+    words = rng.choices(WORDS, k=rng.randint(low, high))
+    return " ".join(words).capitalize() + "."
+
+
+def generate_transcript(minutes: int = MEETING_MINUTES, speakers: int = 6, seed: int = 1) -> str:
+    """A Zoom audio transcript (WebVTT, "Name: text" cues of 2-8 seconds) of a meeting that long"""
+    rng = random.Random(seed)
+    names = [f"{FIRST_NAMES[n % 10]} {LAST_NAMES[n // 10 % 10]}" for n in range(speakers)]
+    # A few people do most of the talking
+    weights = [1 / (n + 1) for n in range(speakers)]
+    lines = ["WEBVTT", ""]
+    at, cue = 0.0, 1
+    while at < minutes * 60:
+        length = rng.uniform(2, 8)
+        lines += [
+            str(cue),
+            f"{_timestamp(at)} --> {_timestamp(at + length)}",
+            f"{rng.choices(names, weights)[0]}: {_sentence(rng, 4, 20)}",
+            ""
+        ]
+        at += length + rng.uniform(0, 1.5)
+        cue += 1
+    return "\n".join(lines)
+
+
+def generate_chat(minutes: int = MEETING_MINUTES, speakers: int = 6, messages: int = 300, seed: int = 1) -> str:
+    """A Zoom chat log in the current format, with some direct messages and multi-line messages"""
+    rng = random.Random(seed)
+    names = [f"{FIRST_NAMES[n % 10]} {LAST_NAMES[n // 10 % 10]}" for n in range(speakers)]
+    lines = []
+    for at in sorted(rng.uniform(0, minutes * 60) for _ in range(messages)):
+        sender = rng.choice(names)
+        recipient = "Everyone" if rng.random() < 0.9 else f"{rng.choice(names)}(Direct Message)"
+        lines.append(f"{_timestamp(at)[:8]} From {sender} to {recipient}:")
+        lines += [f"\t{_sentence(rng, 3, 15)}" for _ in range(1 if rng.random() < 0.8 else 2)]
+    return "\n".join(lines) + "\n"
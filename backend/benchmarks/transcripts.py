@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Measure transcript ingestion on hour-long synthetic meetings: parsing one
+Zoom transcript and chat log in-process, parsing a batch of them in the
+process pool with 1, 2, 4... processes, and the whole pipeline (pool parse,
+segment insert and FTS indexing) on a scratch database, together with the
+longest the event loop stalled meanwhile, e.g.
+
+    python benchmarks/transcripts.py --files 16 --workers 0 1 2 4 --output transcripts.json
+
+Worker count 0 parses on a thread of the app process, as TRANSCRIPT_WORKERS=0
+does: throughput is about the same as one pool process, but the parse
+holds the GIL, so the event loop stalls for as long as a file takes.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.run import percentile, summarize
+from benchmarks.synthetic import generate_chat, generate_transcript
+from services.transcript_parser import PARSERS, ParserContext, parse_file
+
+# Words searched for in the query timings; all occur in the synthetic text
+SEARCH_QUERIES = ["budget", "roadmap release", "cust", "follow up action"]
+
+
+def bench_parse(texts: Dict[str, str], repeat: int) -> Dict:
+    """Parse each file repeat times in this process"""
+    results = {}
+    for kind, text in texts.items():
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            segments = PARSERS[kind](text)
+            timings.append(time.perf_counter() - started)
+        elapsed = statistics.median(timings)
+        results[kind] = {
+            "bytes": len(text.encode()),
+            "segments": len(segments),
+            "ms_per_file": round(elapsed * 1000, 2),
+            "mb_per_sec": round(len(text.encode()) / elapsed / 1e6, 1),
+            "segments_per_sec": round(len(segments) / elapsed)
+        }
+    return results
+
+
+def bench_pool(jobs: List[Tuple[str, str]], workers: int, minutes: int) -> Dict:
+    """Parse every file once with this many pool processes (0: sequentially, in this process)"""
+    if workers == 0:
+        started = time.perf_counter()
+        parsed = [parse_file(kind, path) for kind, path in jobs]
+        elapsed = time.perf_counter() - started
+    else:
+        with ProcessPoolExecutor(workers, mp_context=ParserContext()) as pool:
+            # Process start-up is paid once by the app, not per file
+            list(pool.map(parse_file, *zip(*jobs[:workers])))
+            started = time.perf_counter()
+            parsed = list(pool.map(parse_file, *zip(*jobs)))
+            elapsed = time.perf_counter() - started
+    transcripts = sum(1 for kind, _ in jobs if kind == "transcript")
+    return {
+        "files": len(jobs),
+        "elapsed_s": round(elapsed, 3),
+        "files_per_sec": round(len(jobs) / elapsed, 1),
+        "segments_per_sec": round(sum(len(segments) for segments in parsed) / elapsed),
+        # Meeting hours of transcript (plus their chat logs) parsed per second
+        "meeting_hours_per_sec": round(transcripts * minutes / 60 / elapsed, 1)
+    }
+
+
+async def _watch_loop(lags: List[float], stop: asyncio.Event, interval: float = 0.005):
+    """How late each short sleep wakes up: the event loop's stalls"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append((time.perf_counter() - started - interval) * 1000)
+
+
+async def seed(jobs: List[Tuple[str, str]]) -> List[str]:
+    """A meeting per transcript and chat log pair, with both files downloaded"""
+    from config.database import init_db, AsyncSessionLocal, Meeting, Recording
+
+    await init_db()
+    meeting_ids = []
+    async with AsyncSessionLocal() as db:
+        for n in range(0, len(jobs), 2):
+            meeting_id = str(90000000000 + n // 2)
+            meeting_ids.append(meeting_id)
+            db.add(Meeting(meeting_id=meeting_id, topic=f"Transcript benchmark {n // 2}"))
+            for kind, path in jobs[n:n + 2]:
+                db.add(Recording(
+                    meeting_id=meeting_id,
+                    recording_id=f"{meeting_id}-{kind}",
+                    file_type={"transcript": "TRANSCRIPT", "chat": "CHAT"}[kind],
+                    file_path=path,
+                    status="downloaded"
+                ))
+        await db.commit()
+    return meeting_ids
+
+
+async def bench_ingest(workers: int, files: int, minutes: int) -> Dict:
+    """Queue every file and run the parsing loop's work until the queue is empty"""
+    from config.database import AsyncSessionLocal
+    from services.transcript_service import TranscriptService
+
+    service = TranscriptService(workers)
+    try:
+        if workers:
+            # Start the pool processes before timing, as a running app has
+            service._pool().submit(int).result()
+        async with AsyncSessionLocal() as db:
+            await service.queue_downloaded(db, force=True)
+
+        lags: List[float] = []
+        stop = asyncio.Event()
+        watcher = asyncio.create_task(_watch_loop(lags, stop))
+        started = time.perf_counter()
+        while await service.process_queued() > 0:
+            pass
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await watcher
+    finally:
+        service.shutdown()
+
+    async with AsyncSessionLocal() as db:
+        from sqlalchemy import func, select
+        from config.database import TranscriptSegment
+        segments = await db.scalar(select(func.count(TranscriptSegment.id)))
+    return {
+        "files": files,
+        "elapsed_s": round(elapsed, 3),
+        "files_per_sec": round(files / elapsed, 1),
+        "segments_per_sec": round(segments / elapsed),
+        "meeting_hours_per_sec": round(files / 2 * minutes / 60 / elapsed, 2),
+        "loop_lag_p99_ms": round(percentile(lags, 99), 1) if lags else None,
+        "loop_lag_max_ms": round(max(lags), 1) if lags else None
+    }
+
+
+async def bench_queries(meeting_ids: List[str], repeat: int) -> Dict:
+    """Per-meeting transcript search, talk time and cross-meeting transcript search"""
+    from config.database import AsyncSessionLocal
+    from services.search_service import search_service, build_match_query
+    from services.transcript_service import transcript_service
+
+    timings: Dict[str, List[float]] = {"meeting_search": [], "talk_time": [], "search_all_meetings": []}
+    async with AsyncSessionLocal() as db:
+        for n in range(repeat):
+            meeting_id = meeting_ids[n % len(meeting_ids)]
+            match = build_match_query(SEARCH_QUERIES[n % len(SEARCH_QUERIES)])
+            for name, call in (
+                ("meeting_search", lambda: transcript_service.list_segments(db, meeting_id, match=match)),
+                ("talk_time", lambda: transcript_service.talk_time(db, meeting_id)),
+                ("search_all_meetings", lambda: search_service.search_transcripts(db, match, 20, 0))
+            ):
+                started = time.perf_counter()
+                await call()
+                timings[name].append((time.perf_counter() - started) * 1000)
+    return {name: summarize(values) for name, values in timings.items()}
+
+
+def main(args):
+    texts = {
+        "transcript": generate_transcript(args.minutes, args.speakers, seed=1),
+        "chat": generate_chat(args.minutes, args.speakers, seed=1)
+    }
+    print(f"{args.minutes}-minute meeting: transcript {len(texts['transcript']) / 1e3:.0f} kB,"
+          f" chat {len(texts['chat']) / 1e3:.0f} kB")
+    parse = bench_parse(texts, args.repeat)
+    for kind, result in parse.items():
+        print(f"  parse {kind:<10}{result['ms_per_file']:>8.1f} ms/file  {result['mb_per_sec']:>6.1f} MB/s"
+              f"  {result['segments_per_sec']:>9,} segments/s  ({result['segments']} segments)")
+
+    with tempfile.TemporaryDirectory() as scratch:
+        jobs = []
+        for n in range(args.files):
+            for kind in ("transcript", "chat"):
+                path = Path(scratch) / f"{n}.{kind}"
+                generate = generate_transcript if kind == "transcript" else generate_chat
+                path.write_text(generate(args.minutes, args.speakers, seed=n))
+                jobs.append((kind, str(path)))
+
+        print(f"Parsing {len(jobs)} files ({args.files} meetings)")
+        pool = {}
+        for workers in args.workers:
+            result = pool[workers] = bench_pool(jobs, workers, args.minutes)
+            label = "in-process" if workers == 0 else f"{workers} processes"
+            print(f"  {label:<14}{result['files_per_sec']:>8.1f} files/s  {result['segments_per_sec']:>9,} segments/s"
+                  f"  {result['meeting_hours_per_sec']:>6.1f} meeting-hours/s")
+
+        # Must be set before config.database creates the engine
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{scratch}/transcripts.db"
+        meeting_ids = asyncio.run(seed(jobs))
+        print("Ingesting (parse, insert, FTS index) into SQLite")
+        ingest = {}
+        for workers in args.workers:
+            result = ingest[workers] = asyncio.run(bench_ingest(workers, len(jobs), args.minutes))
+            label = "thread" if workers == 0 else f"{workers} processes"
+            print(f"  {label:<14}{result['files_per_sec']:>8.1f} files/s  {result['segments_per_sec']:>9,} segments/s"
+                  f"  {result['meeting_hours_per_sec']:>6.2f} meeting-hours/s"
+                  f"  loop stalls p99 {result['loop_lag_p99_ms']} ms, max {result['loop_lag_max_ms']} ms")
+
+        queries = asyncio.run(bench_queries(meeting_ids, args.repeat * 10))
+        for name, result in queries.items():
+            print(f"  {name:<20} p50 {result['p50_ms']:.2f} ms  p95 {result['p95_ms']:.2f} ms")
+
+    if max(args.workers) > (os.cpu_count() or 1):
+        print(f"Only {os.cpu_count()} CPUs here: pool processes beyond that can't add throughput")
+
+    if args.output:
+        report = {
+            "params": {"minutes": args.minutes, "speakers": args.speakers, "files": args.files, "repeat": args.repeat},
+            "cpus": os.cpu_count(),
+            "parse": parse,
+            "pool": {str(workers): result for workers, result in pool.items()},
+            "ingest": {str(workers): result for workers, result in ingest.items()},
+            "queries": queries
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure transcript and chat log parsing and ingestion")
+    parser.add_argument("--minutes", type=int, default=60, help="Length of each synthetic meeting")
+    parser.add_argument("--speakers", type=int, default=6)
+    parser.add_argument("--files", type=int, default=16, help="Meetings (a transcript and a chat log each) ingested")
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4], help="Pool sizes to compare")
+    parser.add_argument("--repeat", type=int, default=5, help="In-process parses per file")
+    parser.add_argument("--output", help="Write JSON results here")
+    main(parser.parse_args())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Measure how read throughput scales with WORKERS: seed a scratch database
+with synthetic meetings, start the app with 1, 2, 4... workers on it in
+turn and drive the read endpoints from several client processes, e.g.
+
+    python benchmarks/worker_scaling.py --workers 1 2 4 --duration 15 --output scaling.json
+
+Reports requests/sec and p50/p95/p99 latency per worker count, and the
+speedup and efficiency (speedup / workers) against the first count. The
+app can use at most os.cpu_count() cores, and the client processes
+compete with it for them, so run the clients from another machine with
+--url when measuring beyond half the cores.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+from benchmarks.run import percentile
+from benchmarks.synthetic import generate_meetings
+
+BACKEND = Path(__file__).parent.parent
+
+
+async def seed(params: Dict) -> List[str]:
+    """Load the synthetic meetings into DATABASE_URL the way a first sync would"""
+    from config.database import init_db, engine
+    from services.zoom_service import zoom_service
+    from benchmarks.suite import FakeZoom, bench_sync_initial
+
+    await init_db()
+    dataset = generate_meetings(**params)
+    FakeZoom(dataset).install(zoom_service)
+    await bench_sync_initial(dataset, 0)
+    await engine.dispose()
+    return [meeting["meeting"]["meeting_id"] for meeting in dataset]
+
+
+def read_requests(meeting_ids: List[str], rng: random.Random):
+    """An endless mix of the dashboard's read requests"""
+    while True:
+        meeting_id = rng.choice(meeting_ids)
+        yield rng.choice([
+            f"/api/meetings/{meeting_id}",
+            f"/api/meetings/{meeting_id}/participants?limit=100",
+            f"/api/meetings/{meeting_id}/stats",
+            f"/api/meetings/?limit=50&offset={rng.randrange(0, len(meeting_ids), 50)}"
+        ])
+
+
+async def _client(url: str, meeting_ids: List[str], concurrency: int, duration: float, seed: int) -> Dict:
+    requests = read_requests(meeting_ids, random.Random(seed))
+    timings, statuses = [], {}
+    deadline = time.perf_counter() + duration
+
+    # A connection each, so the kernel can spread them over the workers
+    async def worker():
+        async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(next(requests))
+                    status = str(response.status_code)
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                timings.append((time.perf_counter() - started) * 1000)
+                statuses[status] = statuses.get(status, 0) + 1
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return {"timings": timings, "statuses": statuses}
+
+
+def client_process(job: tuple) -> Dict:
+    return asyncio.run(_client(*job))
+
+
+def drive(url: str, meeting_ids: List[str], clients: int, concurrency: int, duration: float) -> Dict:
+    """Run the client processes for duration seconds and pool their results"""
+    jobs = [(url, meeting_ids, concurrency, duration, n) for n in range(clients)]
+    with multiprocessing.get_context("spawn").Pool(clients) as pool:
+        started = time.perf_counter()
+        results = pool.map(client_process, jobs)
+        elapsed = time.perf_counter() - started
+    timings = [t for result in results for t in result["timings"]]
+    statuses: Dict[str, int] = {}
+    for result in results:
+        for status, count in result["statuses"].items():
+            statuses[status] = statuses.get(status, 0) + count
+    # Pool start-up isn't load; the clients stop together at their deadline
+    elapsed = min(elapsed, duration) or duration
+    return {
+        "requests": len(timings),
+        "statuses": statuses,
+        "throughput_rps": round(len(timings) / elapsed, 2),
+        "p50_ms": round(percentile(timings, 50), 2) if timings else None,
+        "p95_ms": round(percentile(timings, 95), 2) if timings else None,
+        "p99_ms": round(percentile(timings, 99), 2) if timings else None
+    }
+
+
+def start_app(workers: int, port: int, database_url: str, log_path: Path) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "WORKERS": str(workers),
+        "HOST": "127.0.0.1",
+        "PORT": str(port),
+        "DATABASE_URL": database_url,
+        # Access logs would be measured along with the requests
+        "LOG_LEVEL": "WARNING"
+    }
+    log = open(log_path, "ab")
+    return subprocess.Popen([sys.executable, "main.py"], cwd=BACKEND, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+def wait_healthy(url: str, app: subprocess.Popen, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if app.poll() is not None:
+            raise SystemExit(f"The app exited with {app.returncode}")
+        try:
+            if httpx.get(f"{url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"The app did not answer {url}/health within {timeout:.0f}s")
+
+
+def stop_app(app: subprocess.Popen):
+    app.terminate()
+    try:
+        app.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        app.kill()
+        app.wait()
+
+
+def main(args):
+    params = {"meetings": args.meetings, "participants": args.participants, "seed": args.seed}
+    with tempfile.TemporaryDirectory() as scratch:
+        database_url = f"sqlite+aiosqlite:///{scratch}/scaling.db"
+        # Must be set before config.database creates the engine
+        os.environ["DATABASE_URL"] = database_url
+        print(f"Seeding {args.meetings} meetings x {args.participants} participants")
+        meeting_ids = asyncio.run(seed(params))
+
+        url = f"http://127.0.0.1:{args.port}"
+        runs = {}
+        for workers in args.workers:
+            app = start_app(workers, args.port, database_url, Path(scratch) / "app.log")
+            try:
+                wait_healthy(url, app)
+                # Fill every worker's caches before measuring
+                drive(url, meeting_ids, args.clients, args.concurrency, args.warmup)
+                result = drive(url, meeting_ids, args.clients, args.concurrency, args.duration)
+            finally:
+                stop_app(app)
+            runs[workers] = result
+            base = runs[args.workers[0]]
+            result["speedup"] = round(result["throughput_rps"] / base["throughput_rps"], 2) if base["throughput_rps"] else None
+            result["efficiency"] = round(result["speedup"] * args.workers[0] / workers, 2) if result["speedup"] else None
+            print(f"{workers:>3} workers{result['throughput_rps']:>10.1f} req/s  x{result['speedup']}"
+                  f" ({result['efficiency']:.0%})  p50 {result['p50_ms']} ms  p95 {result['p95_ms']} ms"
+                  f"  p99 {result['p99_ms']} ms  {result['statuses']}")
+
+    cpus = os.cpu_count() or 1
+    if max(args.workers) > cpus:
+        print(f"Only {cpus} CPUs here: workers beyond that can't add throughput")
+
+    if args.output:
+        report = {
+            "params": {**params, "clients": args.clients, "concurrency": args.concurrency, "duration_s": args.duration},
+            "cpus": cpus,
+            "runs": {str(workers): result for workers, result in runs.items()}
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure read throughput against the number of app workers")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker counts to compare")
+    parser.add_argument("--meetings", type=int, default=200)
+    parser.add_argument("--participants", type=int, default=50, help="Attendees per meeting")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--clients", type=int, default=4, help="Client processes")
+    parser.add_argument("--concurrency", type=int, default=16, help="Connections per client process")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds measured per worker count")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Seconds of load before measuring")
+    parser.add_argument("--port", type=int, default=8830)
+    parser.add_argument("--output", help="Write JSON results here")
+    main(parser.parse_args())
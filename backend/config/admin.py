@@ -0,0 +1,12 @@
+from fastapi import Header, HTTPException
+import hmac
+import os
+
+
+async def require_admin(x_admin_token: str = Header(None)):
+    """Guard admin endpoints with ADMIN_TOKEN when it is configured"""
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token:
+        return
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required")
@@ -1,7 +1,17 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import declarative_base
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy.orm import declarative_base, Session
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.schema import CreateIndex, CreateTable
+from sqlalchemy import (
+    Column, Integer, Float, String, DateTime, Text, ForeignKey, Index, UniqueConstraint,
+    TypeDecorator, event, inspect, select, text
+)
+from typing import Dict, Optional, Tuple
+from contextlib import AsyncExitStack
 from datetime import datetime
+import asyncio
+import hashlib
 import os
 from pathlib import Path
 from dotenv import load_dotenv
@@ -9,6 +19,8 @@ from dotenv import load_dotenv
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./data/meetings.db")
+# Connections kept open between requests; more are opened (and closed again) under load
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
 
 # Ensure data directory exists
 # Extract path from DATABASE_URL if it's a file path
@@ -27,7 +39,12 @@ if "sqlite" in DATABASE_URL:
         Path(db_dir).mkdir(parents=True, exist_ok=True)
 
 # Create engine
-engine = create_async_engine(DATABASE_URL, echo=True, future=True)
+engine_options = {}
+if DATABASE_URL.startswith("sqlite") and ":memory:" not in DATABASE_URL:
+    # aiosqlite files default to NullPool: a new connection, thread and schema parse per session
+    engine_options = {"poolclass": AsyncAdaptedQueuePool, "pool_size": DB_POOL_SIZE, "max_overflow": -1}
+# Statements are logged through the "sqlalchemy.engine" logger (LOG_LEVELS=sqlalchemy.engine=INFO)
+engine = create_async_engine(DATABASE_URL, echo=False, future=True, **engine_options)
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -39,6 +56,171 @@ Base = declarative_base()
 
 
 # Database Models
+class LookupValue(Base):
+    """Distinct values of low-cardinality string attributes, keyed by a small integer"""
+    __tablename__ = "lookup_values"
+    __table_args__ = (UniqueConstraint("kind", "value"),)
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)  # Attribute name, e.g. "device"
+    value = Column(String, nullable=False)
+
+
+# Bound in a filter on a value never interned; no lookup_values row has it, so the filter matches nothing
+UNKNOWN_LOOKUP_ID = 0
+
+
+class LookupCache:
+    """In-process copy of lookup_values, used to encode and decode attributes.
+
+    Values are append-only, so entries never go stale. Writes intern their
+    values on the session's connection before flushing, and the ids are
+    published to the other workers once committed. An id read before that
+    broadcast arrives decodes to None, and starts a catch-up that reads the
+    newer rows for later reads; decoding itself never touches the database.
+    """
+
+    def __init__(self):
+        self._ids: Dict[Tuple[str, str], int] = {}
+        self._values: Dict[int, str] = {}
+        # Every id up to this one has been read from lookup_values
+        self._read_through = 0
+        self._catching_up: Optional[asyncio.Task] = None
+        self.reloads = 0
+
+    def load(self, rows, complete: bool = False):
+        """Add (id, kind, value) rows; complete when they are every row up to their highest id"""
+        for lookup_id, kind, value in rows:
+            self._ids[(kind, value)] = lookup_id
+            self._values[lookup_id] = value
+            if complete:
+                self._read_through = max(self._read_through, lookup_id)
+
+    def learned(self, rows):
+        """Add rows another worker committed (published through the coordinator)"""
+        self.load(rows)
+
+    def rows_for(self, keys):
+        """(id, kind, value) rows for (kind, value) keys known here"""
+        return [[self._ids[key], key[0], key[1]] for key in keys if key in self._ids]
+
+    def intern(self, connection, kind: str, values) -> Dict[str, int]:
+        """Ids for values of one kind, inserting the unknown ones"""
+        missing = [value for value in values if (kind, value) not in self._ids]
+        if missing:
+            connection.execute(
+                sqlite_insert(LookupValue)
+                .values([{"kind": kind, "value": value} for value in missing])
+                .on_conflict_do_nothing()
+            )
+            self.load(connection.execute(
+                select(LookupValue.id, LookupValue.kind, LookupValue.value)
+                .where(LookupValue.kind == kind, LookupValue.value.in_(missing))
+            ))
+        return {value: self._ids[(kind, value)] for value in values}
+
+    def id_for(self, kind: str, value: str) -> int:
+        """The id of a value being written.
+
+        ORM writes intern their values first (see _intern_lookup_values); a
+        Core insert or update of a new value would lose it, so it raises.
+        """
+        lookup_id = self._ids.get((kind, value))
+        if lookup_id is None:
+            raise LookupError(f"{kind} value {value!r} has no lookup id; write it through an ORM session")
+        return lookup_id
+
+    def filter_id(self, kind: str, value: str) -> int:
+        """The id to compare a column with; UNKNOWN_LOOKUP_ID for a value never stored"""
+        return self._ids.get((kind, value), UNKNOWN_LOOKUP_ID)
+
+    def value_for(self, lookup_id: int) -> Optional[str]:
+        value = self._values.get(lookup_id)
+        if value is None and lookup_id > self._read_through:
+            # Committed by another process whose broadcast hasn't arrived yet.
+            # Ids interned here or broadcast can be newer, so they don't count.
+            self._start_catch_up()
+        return value
+
+    def _start_catch_up(self):
+        if self._catching_up is not None and not self._catching_up.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._catching_up = loop.create_task(self.catch_up())
+        # A failed catch-up is retried by the next unknown id
+        self._catching_up.add_done_callback(lambda done: done.cancelled() or done.exception())
+
+    async def catch_up(self):
+        """Read the lookup_values rows not read here yet"""
+        self.reloads += 1
+        async with engine.connect() as conn:
+            self.load((await conn.execute(
+                select(LookupValue.id, LookupValue.kind, LookupValue.value)
+                .where(LookupValue.id > self._read_through)
+                .order_by(LookupValue.id)
+            )).all(), complete=True)
+
+    def forget(self, keys):
+        """Drop ids learned in a transaction that rolled back"""
+        for key in keys:
+            lookup_id = self._ids.pop(key, None)
+            self._values.pop(lookup_id, None)
+            # SQLite hands rolled-back ids out again; catch_up must not skip them
+            if lookup_id is not None:
+                self._read_through = min(self._read_through, lookup_id - 1)
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._ids
+
+    def __len__(self):
+        return len(self._ids)
+
+
+lookup_cache = LookupCache()
+
+
+class LookupType(TypeDecorator):
+    """A string attribute stored as an integer id into lookup_values"""
+    impl = Integer
+    cache_ok = True
+
+    def __init__(self, kind: str):
+        super().__init__()
+        self.kind = kind
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return lookup_cache.id_for(self.kind, str(value))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return lookup_cache.value_for(value)
+
+    def coerce_compared_value(self, op, value):
+        # Values compared with the column (filters) may never have been stored
+        return LookupFilterType(self.kind)
+
+
+class LookupFilterType(LookupType):
+    """LookupType for values a column is compared with; unknown values match nothing"""
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return lookup_cache.filter_id(self.kind, str(value))
+
+
+def lookup_column(kind: str):
+    """Dictionary-encoded string column, stored as <kind>_id"""
+    return Column(f"{kind}_id", LookupType(kind), ForeignKey("lookup_values.id"))
+
+
 class Meeting(Base):
     __tablename__ = "meetings"
 
@@ -50,43 +232,136 @@ class Meeting(Base):
     duration = Column(Integer)  # Duration in seconds
     participant_count = Column(Integer, default=0)
     host_email = Column(String)
+    # Bumped on every participant / recording write; part of the resource ETags
+    participants_version = Column(Integer, default=0)
+    recordings_version = Column(Integer, default=0)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+class Person(Base):
+    """One attendee across meetings, deduplicated by email, else user id, else name.
+
+    The totals are maintained by triggers on participants (see
+    _create_attendance_triggers), so they never need a recount.
+    """
+    __tablename__ = "people"
+
+    id = Column(Integer, primary_key=True, index=True)
+    person_key = Column(String, unique=True, nullable=False)
+    user_id = Column(String)
+    user_name = Column(String)
+    user_email = Column(String, index=True)
+    meetings_attended = Column(Integer, default=0, nullable=False)
+    total_duration = Column(Integer, default=0, nullable=False)  # Seconds across all meetings
+    first_seen = Column(DateTime)
+    last_seen = Column(DateTime)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
 class Participant(Base):
     __tablename__ = "participants"
+    __table_args__ = (
+        # Serves per-meeting participant listings ordered by join time
+        Index("ix_participants_meeting_join_time", "meeting_id", "join_time"),
+        # Serves per-person attendance history
+        Index("ix_participants_person_join_time", "person_id", "join_time"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     meeting_id = Column(String, ForeignKey("meetings.meeting_id"), nullable=False)
+    person_id = Column(Integer, ForeignKey("people.id"))
     user_id = Column(String)
     user_name = Column(String)
     user_email = Column(String)
     join_time = Column(DateTime)
     leave_time = Column(DateTime)
     duration = Column(Integer)  # Duration in seconds
-    device = Column(String)
+    device = lookup_column("device")
+    ip_address = lookup_column("ip_address")
+    location = lookup_column("location")
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ParticipantEvent(Base):
+    """Append-only join/leave log written by webhooks. Each event refolds its
+    person's log into participants and participant_sessions; the log is
+    deleted once the meeting ends."""
+    __tablename__ = "participant_events"
+    __table_args__ = (
+        Index("ix_participant_events_meeting_id", "meeting_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    meeting_id = Column(String, nullable=False)
+    event_type = Column(String, nullable=False)  # "joined" or "left"
+    event_time = Column(DateTime)
+    user_id = Column(String)
+    user_name = Column(String)
+    user_email = Column(String)
     ip_address = Column(String)
     location = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+class ParticipantSession(Base):
+    """One join-to-leave interval of a participant"""
+    __tablename__ = "participant_sessions"
+    __table_args__ = (
+        Index("ix_participant_sessions_meeting_user", "meeting_id", "user_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    meeting_id = Column(String, ForeignKey("meetings.meeting_id"), nullable=False)
+    user_id = Column(String)
+    user_name = Column(String)
+    user_email = Column(String)
+    join_time = Column(DateTime)
+    leave_time = Column(DateTime)
+    duration = Column(Integer)  # Duration in seconds
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
 class Recording(Base):
     __tablename__ = "recordings"
 
     id = Column(Integer, primary_key=True, index=True)
     meeting_id = Column(String, ForeignKey("meetings.meeting_id"), nullable=False)
     recording_id = Column(String, unique=True, nullable=False)
-    recording_type = Column(String)
+    recording_type = lookup_column("recording_type")
     file_size = Column(Integer)
-    file_type = Column(String)
+    file_type = lookup_column("file_type")
     download_url = Column(Text)
     play_url = Column(Text)
     recording_start = Column(DateTime)
     recording_end = Column(DateTime)
     file_path = Column(String)
     status = Column(String, default="pending")
+    # Transcript and chat files: "queued", "parsed" or "failed" (see services.transcript_service)
+    transcript_status = Column(String)
+    segment_count = Column(Integer)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class TranscriptSegment(Base):
+    """One transcript cue or chat message parsed from a downloaded recording file"""
+    __tablename__ = "transcript_segments"
+    __table_args__ = (
+        # Serves per-meeting transcript listings and talk time
+        Index("ix_transcript_segments_meeting_start", "meeting_id", "start_seconds"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    meeting_id = Column(String, ForeignKey("meetings.meeting_id"), nullable=False)
+    recording_id = Column(String, nullable=False, index=True)
+    kind = Column(String, nullable=False)  # "transcript", "captions" or "chat"
+    start_seconds = Column(Float, nullable=False)  # From the start of the recording
+    end_seconds = Column(Float)  # None for chat messages
+    speaker = Column(String)
+    text = Column(Text, nullable=False)
+    words = Column(Integer, default=0)
 
 
 class OAuthToken(Base):
@@ -100,6 +375,104 @@ class OAuthToken(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+class ArchivedMeeting(Base):
+    """Where a meeting moved by the retention job now lives"""
+    __tablename__ = "archived_meetings"
+
+    id = Column(Integer, primary_key=True)
+    meeting_id = Column(String, unique=True, nullable=False)
+    month = Column(String, nullable=False)  # YYYY-MM, names the archive file
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+
+class SchemaVersion(Base):
+    """Fingerprint of the schema init_db last brought the database to"""
+    __tablename__ = "schema_version"
+
+    id = Column(Integer, primary_key=True)
+    fingerprint = Column(String, nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow)
+
+
+class Lease(Base):
+    """A named lock held by one worker process until expires_at (see services.coordination)"""
+    __tablename__ = "leases"
+
+    name = Column(String, primary_key=True)
+    holder = Column(String, nullable=False)
+    expires_at = Column(Float, nullable=False)  # Unix time
+
+
+class RateLimit(Base):
+    """Zoom API calls made in the current second, and how long a 429 blocks, across workers"""
+    __tablename__ = "rate_limits"
+
+    name = Column(String, primary_key=True)
+    window = Column(Integer, nullable=False, default=0)  # Unix second being counted
+    used = Column(Integer, nullable=False, default=0)
+    blocked_until = Column(Float, nullable=False, default=0)
+
+
+class WorkerBroadcast(Base):
+    """In-memory state changes one worker passes to the others"""
+    __tablename__ = "worker_broadcasts"
+    # Workers read ids above the last they saw; without AUTOINCREMENT SQLite
+    # hands out low ids again once old broadcasts are deleted
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    origin = Column(String, nullable=False)
+    topic = Column(String, nullable=False)
+    payload = Column(Text, nullable=False)
+    created_at = Column(Float, nullable=False)
+
+
+# Dictionary-encoded attributes per model
+DICTIONARY_ATTRIBUTES = {
+    Participant: ["device", "ip_address", "location"],
+    Recording: ["recording_type", "file_type"],
+}
+
+
+@event.listens_for(Session, "before_flush")
+def _intern_lookup_values(session, flush_context, instances):
+    """Make sure every dictionary-encoded value about to be written has an id"""
+    pending = {}
+    for obj in list(session.new) + list(session.dirty):
+        attributes = DICTIONARY_ATTRIBUTES.get(type(obj))
+        if not attributes:
+            continue
+        state = inspect(obj)
+        for attribute in attributes:
+            for value in state.attrs[attribute].history.added:
+                if value is not None and (attribute, str(value)) not in lookup_cache:
+                    pending.setdefault(attribute, set()).add(str(value))
+
+    if not pending:
+        return
+    # Same connection and transaction as the flush that follows
+    connection = session.connection()
+    learned = session.info.setdefault("lookup_keys", set())
+    for kind, values in pending.items():
+        lookup_cache.intern(connection, kind, values)
+        learned.update((kind, value) for value in values)
+
+
+@event.listens_for(Session, "after_commit")
+def _keep_lookup_values(session):
+    learned = session.info.pop("lookup_keys", None)
+    if learned:
+        # Imported here: services.coordination imports this module
+        from services.coordination import coordinator
+        # Told to the other workers now that the ids are durable
+        coordinator.publish("lookups.learned", lookup_cache.rows_for(learned))
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_lookup_values(session):
+    lookup_cache.forget(session.info.pop("lookup_keys", ()))
+
+
 # Database dependency
 async def get_db():
     async with AsyncSessionLocal() as session:
@@ -114,8 +487,273 @@ async def get_db():
             await session.close()
 
 
-# Initialize database
-async def init_db():
+def _upgrade_schema(sync_conn):
+    """Add columns and indexes declared on models but missing from existing tables"""
+    inspector = inspect(sync_conn)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=sync_conn.dialect)
+            sync_conn.execute(
+                text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}')
+            )
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
+def _autoincrement_broadcast_ids(sync_conn):
+    """Rebuild a worker_broadcasts table created without AUTOINCREMENT, keeping its rows and ids"""
+    if sync_conn.dialect.name != "sqlite":
+        return
+    ddl = sync_conn.execute(text(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'worker_broadcasts'"
+    )).scalar()
+    if ddl is None or "AUTOINCREMENT" in ddl.upper():
+        return
+    sync_conn.execute(text("ALTER TABLE worker_broadcasts RENAME TO worker_broadcasts_old"))
+    WorkerBroadcast.__table__.create(sync_conn)
+    # Copying the ids seeds sqlite_sequence, so new ones continue above them
+    sync_conn.execute(text(
+        "INSERT INTO worker_broadcasts (id, origin, topic, payload, created_at) "
+        "SELECT id, origin, topic, payload, created_at FROM worker_broadcasts_old"
+    ))
+    sync_conn.execute(text("DROP TABLE worker_broadcasts_old"))
+
+
+def _legacy_lookup_columns(sync_conn):
+    """(model, attribute, id column) of pre-dictionary string columns still present"""
+    if sync_conn.dialect.name != "sqlite":
+        return []
+    inspector = inspect(sync_conn)
+    found = []
+    for model, attributes in DICTIONARY_ATTRIBUTES.items():
+        table = model.__tablename__
+        if not inspector.has_table(table):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table)}
+        for attribute in attributes:
+            if attribute in existing:
+                found.append((model, attribute, model.__mapper__.columns[attribute].name))
+    return found
+
+
+def _unencoded_legacy_values(sync_conn) -> Dict[str, int]:
+    """Rows per legacy column whose value has no <name>_id yet"""
+    unencoded = {}
+    for model, attribute, id_column in _legacy_lookup_columns(sync_conn):
+        table = model.__tablename__
+        count = sync_conn.execute(text(
+            f"SELECT count(*) FROM {table} "
+            f"WHERE {attribute} IS NOT NULL AND {attribute} != '' AND {id_column} IS NULL"
+        )).scalar()
+        if count:
+            unencoded[f"{table}.{attribute}"] = count
+    return unencoded
+
+
+def _encode_legacy_columns(sync_conn, drop: bool) -> Dict[str, int]:
+    """Copy values of pre-dictionary string columns into lookup_values and the
+    <name>_id columns; returns the rows encoded per column.
+
+    The legacy columns are kept unless drop is set, which drops them (or
+    empties them on SQLite older than 3.35).
+    """
+    encoded = {}
+    for model, attribute, id_column in _legacy_lookup_columns(sync_conn):
+        table = model.__tablename__
+        sync_conn.execute(text(
+            f"INSERT OR IGNORE INTO lookup_values (kind, value) "
+            f"SELECT DISTINCT '{attribute}', {attribute} FROM {table} "
+            f"WHERE {attribute} IS NOT NULL AND {attribute} != ''"
+        ))
+        encoded[f"{table}.{attribute}"] = sync_conn.execute(text(
+            f"UPDATE {table} SET {id_column} = (SELECT id FROM lookup_values "
+            f"WHERE kind = '{attribute}' AND value = {table}.{attribute}) "
+            f"WHERE {attribute} IS NOT NULL AND {attribute} != '' AND {id_column} IS NULL"
+        )).rowcount
+        if not drop:
+            continue
+        if sync_conn.dialect.server_version_info >= (3, 35):
+            sync_conn.execute(text(f"ALTER TABLE {table} DROP COLUMN {attribute}"))
+        else:
+            sync_conn.execute(text(f"UPDATE {table} SET {attribute} = NULL"))
+    return encoded
+
+
+async def encode_legacy_lookup_columns(drop: bool = False) -> Dict[str, int]:
+    """Dictionary-encode a database created before lookup_values existed.
+
+    Run by scripts/encode_lookup_columns.py, which backs the file up first;
+    the app only refuses to start while values are left unencoded.
+    """
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_upgrade_schema)
+        return await conn.run_sync(_encode_legacy_columns, drop)
+
+
+# FTS5 indexes over searchable columns: external-content tables that read
+# their text from the base table and are kept in sync by triggers
+SEARCH_INDEXES = {
+    "meetings_fts": ("meetings", ["topic", "host_email"]),
+    "participants_fts": ("participants", ["user_name", "user_email"]),
+    "transcript_segments_fts": ("transcript_segments", ["text", "speaker"]),
+}
+
+
+def _create_search_indexes(sync_conn):
+    """Create the FTS5 search tables and triggers (SQLite only)"""
+    if sync_conn.dialect.name != "sqlite":
+        return
+    inspector = inspect(sync_conn)
+    for fts_table, (table, columns) in SEARCH_INDEXES.items():
+        exists = inspector.has_table(fts_table)
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{column}" for column in columns)
+        old_values = ", ".join(f"old.{column}" for column in columns)
+        statements = [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+            f"{column_list}, content='{table}', content_rowid='id', prefix='2 3')",
+            f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) "
+            f"VALUES ('delete', old.id, {old_values}); END",
+            # Only updates touching indexed columns rewrite the index entry
+            f"CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {column_list} ON {table} BEGIN "
+            f"INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) "
+            f"VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values}); END",
+        ]
+        for statement in statements:
+            sync_conn.execute(text(statement))
+        if not exists:
+            # Index rows written before search existed
+            sync_conn.execute(text(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')"))
+
+
+def _create_attendance_triggers(sync_conn):
+    """Keep each person's totals in step with their participant rows (SQLite only)"""
+    if sync_conn.dialect.name != "sqlite":
+        return
+    add = (
+        "UPDATE people SET "
+        "meetings_attended = meetings_attended + 1, "
+        "total_duration = total_duration + coalesce(new.duration, 0), "
+        "first_seen = CASE WHEN first_seen IS NULL OR new.join_time < first_seen "
+        "THEN coalesce(new.join_time, first_seen) ELSE first_seen END, "
+        "last_seen = CASE WHEN last_seen IS NULL OR new.join_time > last_seen "
+        "THEN coalesce(new.join_time, last_seen) ELSE last_seen END "
+        "WHERE id = new.person_id;"
+    )
+    # first_seen/last_seen can't be undone from the old row alone, so they are read
+    # back from the person's remaining rows; each min/max is one probe of
+    # ix_participants_person_join_time. On update the row already holds its new
+    # values, which the add step then folds in again.
+    seen = "(SELECT {}(join_time) FROM participants WHERE person_id = {})"
+    remove = (
+        "UPDATE people SET "
+        "meetings_attended = meetings_attended - 1, "
+        "total_duration = total_duration - coalesce(old.duration, 0), "
+        f"first_seen = {seen.format('min', 'old.person_id')}, "
+        f"last_seen = {seen.format('max', 'old.person_id')} "
+        "WHERE id = old.person_id;"
+    )
+    statements = [
+        # Replaced rather than kept, so databases with older triggers pick up changes
+        "DROP TRIGGER IF EXISTS participants_people_ai",
+        "DROP TRIGGER IF EXISTS participants_people_ad",
+        "DROP TRIGGER IF EXISTS participants_people_au",
+        f"CREATE TRIGGER participants_people_ai AFTER INSERT ON participants BEGIN {add} END",
+        f"CREATE TRIGGER participants_people_ad AFTER DELETE ON participants BEGIN {remove} END",
+        "CREATE TRIGGER participants_people_au "
+        f"AFTER UPDATE OF person_id, duration, join_time ON participants BEGIN {remove} {add} END",
+        # Older triggers left these as they were before deletes
+        "UPDATE people SET "
+        f"first_seen = {seen.format('min', 'people.id')}, last_seen = {seen.format('max', 'people.id')}",
+    ]
+    for statement in statements:
+        sync_conn.execute(text(statement))
+
+
+# Bump when a migration step in init_db (triggers, backfills) changes without
+# the models changing; model changes alter the fingerprint by themselves
+SCHEMA_REVISION = 2
+
+
+def schema_fingerprint() -> str:
+    """Hash of the DDL for every table and index, plus SCHEMA_REVISION"""
+    digest = hashlib.sha256(f"{SCHEMA_REVISION}:{sorted(SEARCH_INDEXES.items())}".encode())
+    for table in Base.metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=engine.dialect)).encode())
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            digest.update(str(CreateIndex(index).compile(dialect=engine.dialect)).encode())
+    return digest.hexdigest()
+
+
+def _schema_is_current(sync_conn, fingerprint: str) -> bool:
+    if not inspect(sync_conn).has_table(SchemaVersion.__tablename__):
+        return False
+    stored = sync_conn.execute(select(SchemaVersion.fingerprint).where(SchemaVersion.id == 1)).scalar()
+    return stored == fingerprint
+
+
+def _record_schema_version(sync_conn, fingerprint: str):
+    sync_conn.execute(SchemaVersion.__table__.delete())
+    sync_conn.execute(SchemaVersion.__table__.insert().values(id=1, fingerprint=fingerprint))
+
+
+# Initialize database
+def _enable_incremental_vacuum(sync_conn):
+    """New SQLite databases reclaim space incrementally (see services.retention_service)"""
+    if sync_conn.dialect.name == "sqlite" and not inspect(sync_conn).get_table_names():
+        # Only takes effect before the first table is created
+        sync_conn.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+
+
+async def init_db() -> bool:
+    """Create or upgrade the schema unless schema_version says it is current.
+
+    The upgrade inspects every table; a database already at this code's
+    fingerprint skips it with a single lookup. Returns whether it upgraded.
+    """
+    fingerprint = schema_fingerprint()
+    async with engine.begin() as conn:
+        upgrade = not await conn.run_sync(_schema_is_current, fingerprint)
+        if upgrade:
+            await conn.run_sync(_enable_incremental_vacuum)
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_upgrade_schema)
+            await conn.run_sync(_autoincrement_broadcast_ids)
+            unencoded = await conn.run_sync(_unencoded_legacy_values)
+            if unencoded:
+                # Rolls the upgrade back; reads would show these attributes as empty
+                raise RuntimeError(
+                    "Values in " + ", ".join(sorted(unencoded)) + " are not dictionary-encoded yet; "
+                    "back the database up and encode them with scripts/encode_lookup_columns.py"
+                )
+            await conn.run_sync(_create_search_indexes)
+            await conn.run_sync(_create_attendance_triggers)
+            await conn.run_sync(_record_schema_version, fingerprint)
+        result = await conn.execute(select(LookupValue.id, LookupValue.kind, LookupValue.value))
+        lookup_cache.load(result.all(), complete=True)
+    return upgrade
+
+
+async def warm_up_connections(count: int = DB_POOL_SIZE):
+    """Open the pool's connections ahead of the first requests.
+
+    Each SQLite connection parses the schema on its first statement, so
+    that is done here too.
+    """
+    async with AsyncExitStack() as stack:
+        for _ in range(count):
+            conn = await stack.enter_async_context(engine.connect())
+            await conn.exec_driver_sql(
+                "SELECT count(*) FROM sqlite_master" if engine.dialect.name == "sqlite" else "SELECT 1"
+            )
 
@@ -1,30 +1,116 @@
 from fastapi import FastAPI, Depends, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from contextlib import asynccontextmanager
+import asyncio
+import logging
 import os
+import time
 from dotenv import load_dotenv
 
-from config.database import init_db, get_db
-from routes import auth, meetings, webhooks
+from config.database import init_db, get_db, AsyncSessionLocal, engine, warm_up_connections
+from services.structured_logging import setup_logging, RequestIdMiddleware
+
+# Before the routers are imported, so anything they log on import is kept
+setup_logging()
+
+from routes import auth, meetings, webhooks, export, events, search, people, retention, debug
+from services.serializers import FastJSONResponse
+from services.response_cache import response_cache
+from services.live_state import live_state
+from services.metrics import metrics, MetricsMiddleware, instrument_engine, CONTENT_TYPE
+from services.tracing import TracingMiddleware, trace_engine
+from services.people_service import people_service
+from services.retention_service import retention_service, RETENTION_INTERVAL_HOURS
+from services.webhook_capture import webhook_capture
+from services.coordination import coordinator, WORKERS
+from services.zoom_service import zoom_service
+from services.transcript_service import transcript_service
 
 load_dotenv()
 
+logger = logging.getLogger("main")
+
+# How long a crashed worker's migration can hold up the others
+STARTUP_LEASE_SECONDS = 300
+
+async def warm_up():
+    """Open pooled DB connections and the Zoom client before the first requests need them"""
+    started = time.perf_counter()
+    try:
+        await warm_up_connections()
+        await zoom_service.warm_up()
+    except Exception:
+        # Requests open whatever is missing themselves
+        logger.exception("Warm-up failed")
+        return
+    elapsed = round((time.perf_counter() - started) * 1000, 1)
+    logger.info("Warm-up done in %.0f ms", elapsed, extra={"warm_up_ms": elapsed})
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    await init_db()
-    print("Database initialized")
+    phases = {}
+    started = last = time.perf_counter()
+
+    def phase(name: str):
+        nonlocal last
+        now = time.perf_counter()
+        phases[name] = round((now - last) * 1000, 1)
+        last = now
+
+    await coordinator.setup()
+    # Workers migrate and backfill one at a time
+    async with coordinator.exclusive("startup", STARTUP_LEASE_SECONDS):
+        phase("coordination_ms")
+        upgraded = await init_db()
+        logger.info("Database %s", "schema upgraded" if upgraded else "schema current")
+        phase("init_db_ms")
+        async with AsyncSessionLocal() as db:
+            linked = await people_service.backfill(db)
+            if linked:
+                logger.info("Linked %d participants to the people directory", linked)
+        phase("backfill_ms")
+    async with AsyncSessionLocal() as db:
+        await live_state.rebuild(db)
+    logger.info("Live state rebuilt: %d meetings in progress", len(live_state.live_meetings()))
+    phase("live_state_ms")
+
+    # With several workers, each one's in-memory state follows what the others publish
+    await coordinator.start()
+
+    retention_task = None
+    if RETENTION_INTERVAL_HOURS > 0:
+        retention_task = asyncio.create_task(
+            coordinator.run_as_leader("retention", retention_service.run_periodically)
+        )
+    # One worker parses downloaded transcripts and chat logs
+    transcript_task = asyncio.create_task(
+        coordinator.run_as_leader("transcripts", transcript_service.run_periodically)
+    )
+    # Runs while the server already accepts requests
+    warm_up_task = asyncio.create_task(warm_up())
+    phases["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    logger.info("Started in %.0f ms", phases["total_ms"], extra={"startup": phases})
     yield
     # Shutdown
-    print("Shutting down")
+    logger.info("Shutting down")
+    warm_up_task.cancel()
+    if retention_task:
+        retention_task.cancel()
+    transcript_task.cancel()
+    transcript_service.shutdown()
+    await coordinator.stop()
+    webhook_capture.close()
+    await zoom_service.close()
 
 app = FastAPI(
     title="Zoom Meeting Tracker API",
     description="API for tracking Zoom meetings, participants, and recordings",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # CORS middleware
@@ -37,10 +123,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request id on every log record, returned as X-Request-ID
+app.add_middleware(RequestIdMiddleware)
+
+# Span breakdown of sampled or X-Profile requests, browsable at /debug/slow
+app.add_middleware(TracingMiddleware)
+trace_engine(engine)
+
+# Request counts and latency per route, outermost so CORS handling is included
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine)
+
 # Include routers
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 app.include_router(meetings.router, prefix="/api/meetings", tags=["Meetings"])
 app.include_router(webhooks.router, prefix="/webhooks", tags=["Webhooks"])
+app.include_router(export.router, prefix="/api/export", tags=["Export"])
+app.include_router(events.router, prefix="/api/events", tags=["Events"])
+app.include_router(search.router, prefix="/api/search", tags=["Search"])
+app.include_router(people.router, prefix="/api/people", tags=["People"])
+app.include_router(retention.router, prefix="/api/retention", tags=["Retention"])
+app.include_router(debug.router, prefix="/debug", tags=["Debug"])
 
 @app.get("/")
 async def root():
@@ -50,7 +153,12 @@ async def root():
         "endpoints": {
             "auth": "/auth/zoom",
             "meetings": "/api/meetings",
-            "webhooks": "/webhooks"
+            "webhooks": "/webhooks",
+            "export": "/api/export",
+            "events": "/api/events",
+            "search": "/api/search",
+            "people": "/api/people",
+            "retention": "/api/retention"
         }
     }
 
@@ -58,9 +166,24 @@ async def root():
 async def health():
     return {"status": "healthy"}
 
+@app.get("/cache/stats")
+async def cache_stats():
+    """Response cache hit-rate and occupancy"""
+    return response_cache.stats()
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Request, SQL, Zoom API, sync, webhook and download metrics in Prometheus text format"""
+    return Response(metrics.render(), media_type=CONTENT_TYPE)
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
     host = os.getenv("HOST", "0.0.0.0")
-    uvicorn.run(app, host=host, port=port)
+    # log_config=None keeps uvicorn's access and error logs on the queue set up above
+    if WORKERS > 1:
+        # Each worker process imports the app itself
+        uvicorn.run("main:app", host=host, port=port, workers=WORKERS, log_config=None)
+    else:
+        uvicorn.run(app, host=host, port=port, log_config=None)
 
@@ -1,11 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-import httpx
+from sqlalchemy import select, delete
 import os
 import base64
 from datetime import datetime, timedelta
 from config.database import get_db, OAuthToken
+from services.zoom_service import zoom_service
+from services.lazy_import import lazy_import
+
+# Only the OAuth callback talks to Zoom from here
+httpx = lazy_import("httpx")
 
 router = APIRouter()
 
@@ -22,7 +27,7 @@ async def initiate_oauth():
         )
     
     zoom_auth_url = (
-        f"https://zoom.us/oauth/authorize?"
+        f"{zoom_service.oauth_base_url}/oauth/authorize?"
         f"response_type=code&"
         f"client_id={client_id}&"
         f"redirect_uri={redirect_uri}"
@@ -55,7 +60,7 @@ async def oauth_callback(
         
         async with httpx.AsyncClient() as client:
             response = await client.post(
-                "https://zoom.us/oauth/token",
+                f"{zoom_service.oauth_base_url}/oauth/token",
                 data={
                     "grant_type": "authorization_code",
                     "code": code,
@@ -80,7 +85,6 @@ async def oauth_callback(
         await db.commit()
 
         # Redirect to frontend with success
-        from fastapi.responses import RedirectResponse
         frontend_url = os.getenv("FRONTEND_URL", "http://localhost:3000")
         return RedirectResponse(url=f"{frontend_url}/?auth=success")
     except httpx.HTTPStatusError as e:
@@ -95,7 +99,6 @@ async def oauth_callback(
 async def auth_status(db: AsyncSession = Depends(get_db)):
     """Check authentication status"""
     try:
-        from services.zoom_service import zoom_service
         token = await zoom_service.get_access_token(db)
         return {
             "authenticated": True,
@@ -111,9 +114,6 @@ async def auth_status(db: AsyncSession = Depends(get_db)):
 async def disconnect_zoom(db: AsyncSession = Depends(get_db)):
     """Disconnect Zoom - Remove OAuth tokens"""
     try:
-        from sqlalchemy import delete
-        from config.database import OAuthToken
-        
         # Delete all OAuth tokens
         await db.execute(delete(OAuthToken))
         await db.commit()
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from config.admin import require_admin
+from services.serializers import FastJSONResponse
+from services.tracing import slow_traces, PROFILING_SAMPLE_RATE
+from services.coordination import coordinator
+from services.zoom_service import zoom_service
+
+# Traces carry SQL text and request paths, so every endpoint here is admin-only
+router = APIRouter(default_response_class=FastJSONResponse, dependencies=[Depends(require_admin)])
+
+
+@router.get("/slow")
+async def list_slow_traces(limit: int = Query(20, ge=1, le=500)):
+    """The slowest traced requests with their time per span kind"""
+    return FastJSONResponse({
+        "sample_rate": PROFILING_SAMPLE_RATE,
+        "recorded": slow_traces.recorded,
+        "capacity": slow_traces.size,
+        "traces": [trace.summary() for trace in slow_traces.slowest(limit)]
+    })
+
+
+@router.get("/slow/{trace_id}")
+async def get_slow_trace(trace_id: str):
+    """One trace with every span"""
+    trace = slow_traces.get(trace_id)
+    if not trace:
+        raise HTTPException(status_code=404, detail="Trace not found (not among the slowest kept)")
+    return FastJSONResponse(trace.details())
+
+
+@router.delete("/slow")
+async def clear_slow_traces():
+    """Forget the kept traces"""
+    slow_traces.clear()
+    return FastJSONResponse({"status": "cleared"})
+
+
+@router.get("/worker")
+async def worker_status():
+    """The worker that answered: its id, the roles it leads and broadcast counters"""
+    return FastJSONResponse(coordinator.stats())
+
+
+@router.get("/zoom")
+async def zoom_status():
+    """This worker's Zoom circuit breakers and the age of the last good responses it can serve stale"""
+    return FastJSONResponse(zoom_service.stats())
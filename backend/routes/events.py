@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from services.event_bus import event_bus
+
+router = APIRouter()
+
+# Seconds between keep-alive comments; also how often disconnects are noticed
+HEARTBEAT_INTERVAL = 15
+
+
+@router.get("")
+async def stream_events(
+    request: Request,
+    meeting_id: Optional[List[str]] = Query(None, description="Only events for these meetings")
+):
+    """Stream webhook events to the dashboard as Server-Sent Events"""
+    subscription = event_bus.subscribe(meeting_id)
+
+    async def event_stream():
+        try:
+            # Tell EventSource how long to wait before reconnecting
+            yield b"retry: 3000\n\n"
+            while True:
+                message = await subscription.get(timeout=HEARTBEAT_INTERVAL)
+                if message is not None:
+                    yield message
+                    continue
+                if subscription.dropped:
+                    # Buffer overflowed and is drained; the client reconnects
+                    yield b"event: dropped\ndata: {}\n\n"
+                    break
+                if await request.is_disconnected():
+                    break
+                yield b": keep-alive\n\n"
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/stats")
+async def event_stats():
+    """Subscriber and delivery counters"""
+    return event_bus.stats()
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from datetime import datetime
+from config.admin import require_admin
+from services.export_service import (
+    export_service,
+    MEETING_EXPORT_FIELDS,
+    PARTICIPANT_EXPORT_FIELDS
+)
+
+router = APIRouter()
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+
+
+def _export_response(query, fields, name: str, fmt: str, compress: bool) -> StreamingResponse:
+    """Wrap an export query in a streaming download response"""
+    filename = f"{name}.{fmt}"
+    media_type = MEDIA_TYPES[fmt]
+    if compress:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        export_service.stream_export(query, fields, fmt, compress),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/meetings")
+async def export_meetings(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    start: Optional[datetime] = Query(None, description="Only meetings starting at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only meetings starting before this time"),
+    gzip: bool = Query(False)
+):
+    """Stream all stored meetings as NDJSON or CSV"""
+    query = export_service.meetings_query(start, end)
+    return _export_response(query, MEETING_EXPORT_FIELDS, "meetings", format, gzip)
+
+
+@router.get("/participants")
+async def export_participants(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    start: Optional[datetime] = Query(None, description="Only participants joining at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only participants joining before this time"),
+    meeting_id: Optional[str] = Query(None),
+    gzip: bool = Query(False)
+):
+    """Stream all stored participants as NDJSON or CSV"""
+    query = export_service.participants_query(start, end, meeting_id)
+    return _export_response(query, PARTICIPANT_EXPORT_FIELDS, "participants", format, gzip)
+
+
+@router.post("/parquet", dependencies=[Depends(require_admin)])
+async def export_parquet(full: bool = Query(False, description="Ignore the watermark and export everything")):
+    """Write a month-partitioned Parquet snapshot to PARQUET_EXPORT_DIR"""
+    from services.parquet_export import parquet_export_service
+
+    try:
+        return await parquet_export_service.export_all(full=full)
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
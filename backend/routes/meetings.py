@@ -1,12 +1,114 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-import httpx
+from pydantic import BaseModel, Field
+from datetime import datetime, timezone
+import hashlib
+import logging
 from config.database import get_db
-from services.meeting_service import meeting_service
+from services.meeting_service import meeting_service, PARTICIPANT_SORT_FIELDS
+from services.serializers import (
+    FastJSONResponse,
+    PARTICIPANT_FIELDS,
+    serialize_meeting,
+    serialize_participant,
+    serialize_recording,
+    serialize_session
+)
+from services.response_cache import response_cache, meeting_tag, MEETINGS_LIST_TAG
+from services.coordination import coordinator
+from services.live_state import live_state
+from services.search_service import build_match_query
+from services.transcript_service import transcript_service
 from services.zoom_service import zoom_service
+from services.circuit_breaker import CircuitOpenError
+from services.lazy_import import lazy_import
 
-router = APIRouter()
+httpx = lazy_import("httpx")
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(default_response_class=FastJSONResponse)
+
+BATCH_MAX_MEETINGS = 100
+# Page size when a cursor is sent without a limit
+PARTICIPANT_PAGE_SIZE = 100
+
+
+class MeetingBatchRequest(BaseModel):
+    meeting_ids: List[str] = Field(..., min_length=1, max_length=BATCH_MAX_MEETINGS)
+    include: List[str] = Field(default_factory=list, description="participants, stats and/or recordings")
+
+
+def _resource_etag(versions, resource: str) -> str:
+    """Strong ETag for one of a meeting's resources"""
+    if resource in ("recordings", "transcript", "talk-time"):
+        # Storing a parsed transcript bumps recordings_version too
+        parts = [versions.recordings_version or 0]
+    elif resource == "stats":
+        parts = [versions.participants_version or 0]
+    else:
+        updated_at = versions.updated_at.isoformat() if versions.updated_at else ""
+        parts = [updated_at, versions.participants_version or 0]
+    raw = ":".join(str(part) for part in [versions.id, resource, *parts])
+    return f'"{hashlib.sha1(raw.encode()).hexdigest()[:24]}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate If-None-Match (weak comparison, per RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+async def _check_not_modified(
+    db: AsyncSession,
+    meeting_id: str,
+    resource: str,
+    if_none_match: Optional[str]
+):
+    """Return (etag, 304 response or None) from a single meeting-row lookup"""
+    versions = await meeting_service.get_meeting_versions(db, meeting_id)
+    if versions is None:
+        return None, None
+    etag = _resource_etag(versions, resource)
+    if _etag_matches(if_none_match, etag):
+        return etag, Response(status_code=304, headers=_cache_headers(etag))
+    return etag, None
+
+
+def _cached_response(cached) -> Response:
+    """Serve pre-serialized bytes from the response cache"""
+    return Response(
+        content=cached.body,
+        media_type="application/json",
+        headers=_cache_headers(cached.etag)
+    )
+
+
+def _zoom_unavailable(e: Exception) -> HTTPException:
+    """503 (504 for a timeout) for a Zoom call refused by its open circuit or that never got an answer"""
+    if isinstance(e, CircuitOpenError):
+        return HTTPException(status_code=503, detail=str(e),
+                             headers={"Retry-After": str(max(int(e.retry_after + 0.999), 1))})
+    if isinstance(e, httpx.TimeoutException):
+        return HTTPException(status_code=504, detail="Zoom API did not answer in time")
+    return HTTPException(status_code=503, detail=f"Could not reach the Zoom API: {e}")
+
+
+def _cache_headers(etag: Optional[str]) -> dict:
+    """Headers asking clients to revalidate cached copies with the ETag"""
+    if not etag:
+        return {}
+    return {"ETag": etag, "Cache-Control": "no-cache"}
 
 @router.get("/")
 async def get_all_meetings(
@@ -15,43 +117,37 @@ async def get_all_meetings(
     db: AsyncSession = Depends(get_db)
 ):
     """Get all stored meetings"""
+    cache_key = ("meetings:list", limit, offset)
+    cached = response_cache.get(cache_key)
+    if cached:
+        return _cached_response(cached)
+
+    tags = (MEETINGS_LIST_TAG,)
+    generation = response_cache.generation(tags)
     meetings = await meeting_service.get_all_meetings(db, limit, offset)
-    return {
-        "meetings": [
-            {
-                "id": m.id,
-                "meeting_id": m.meeting_id,
-                "topic": m.topic,
-                "start_time": m.start_time.isoformat() if m.start_time else None,
-                "end_time": m.end_time.isoformat() if m.end_time else None,
-                "duration": m.duration,
-                "participant_count": m.participant_count,
-                "host_email": m.host_email,
-                "created_at": m.created_at.isoformat() if m.created_at else None
-            }
-            for m in meetings
-        ],
+    response = FastJSONResponse({
+        "meetings": [serialize_meeting(m) for m in meetings],
         "limit": limit,
         "offset": offset
-    }
+    })
+    response_cache.set(cache_key, response.body, tags, generation)
+    return response
 
 @router.get("/zoom/list")
 async def list_zoom_meetings(
     meeting_type: str = Query("past", regex="^(past|live|upcoming)$"),
-    page_size: int = Query(30, ge=1, le=300),
-    db: AsyncSession = Depends(get_db)
+    page_size: int = Query(30, ge=1, le=300)
 ):
-    """List meetings from Zoom API"""
+    """List meetings from Zoom API, or the last list it returned while Zoom is down or slow"""
     try:
-        # Add pagination parameters
-        meetings_data = await zoom_service.list_meetings("me", meeting_type, db, page_size=page_size)
+        meetings_data, stale_since = await zoom_service.list_meetings_or_stale("me", meeting_type, page_size=page_size)
         meetings = meetings_data.get("meetings", [])
         
         # Handle case where meetings might be None or empty
         if not meetings:
             meetings = []
         
-        return {
+        return FastJSONResponse({
             "success": True,
             "meetings": [
                 {
@@ -66,8 +162,13 @@ async def list_zoom_meetings(
                 for m in meetings
             ],
             "total": len(meetings),
-            "message": f"Found {len(meetings)} {meeting_type} meetings" if meetings else f"No {meeting_type} meetings found"
-        }
+            "message": f"Found {len(meetings)} {meeting_type} meetings" if meetings else f"No {meeting_type} meetings found",
+            "stale": stale_since is not None,
+            "stale_since": datetime.fromtimestamp(stale_since, timezone.utc).isoformat() if stale_since else None
+        })
+    except (CircuitOpenError, httpx.TransportError) as e:
+        logger.warning("Error listing meetings: %s", e, extra={"throttle": True})
+        raise _zoom_unavailable(e)
     except httpx.HTTPStatusError as e:
         error_detail = f"Zoom API Error: {e.response.status_code}"
         if e.response.status_code == 404:
@@ -80,73 +181,104 @@ async def list_zoom_meetings(
                 error_detail = f"Zoom API Error ({e.response.status_code}): {error_body.get('message', error_body.get('error', str(error_body)))}"
             except:
                 error_detail = f"Zoom API Error ({e.response.status_code}): {e.response.text[:200]}"
-        print(f"Error listing meetings: {error_detail}")
+        logger.warning("Error listing meetings: %s", error_detail)
         raise HTTPException(status_code=e.response.status_code, detail=error_detail)
     except Exception as e:
         error_msg = str(e)
-        print(f"Exception listing meetings: {error_msg}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Exception listing meetings: %s", error_msg)
         raise HTTPException(status_code=500, detail=f"Error listing meetings: {error_msg}")
 
+@router.get("/live")
+async def get_live_meetings():
+    """In-progress meetings with their current participant counts"""
+    return FastJSONResponse({"meetings": live_state.live_meetings()})
+
+@router.post("/batch")
+async def get_meetings_batch(
+    request: MeetingBatchRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get several meetings with optional participants, stats and recordings"""
+    unknown = set(request.include) - {"participants", "stats", "recordings"}
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown include values: {', '.join(sorted(unknown))}")
+    return FastJSONResponse(
+        await meeting_service.get_meetings_batch(db, request.meeting_ids, request.include)
+    )
+
 @router.get("/{meeting_id}")
 async def get_meeting(
     meeting_id: str,
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
     """Get meeting details with participants"""
+    # Cached entries are invalidated on every write, so their ETag is current
+    cache_key = ("meeting", meeting_id)
+    cached = response_cache.get(cache_key)
+    if cached and coordinator.multi_worker:
+        # Another worker's write reaches this cache only with the next broadcast
+        versions = await meeting_service.get_meeting_versions(db, meeting_id)
+        if versions is None or _resource_etag(versions, "meeting") != cached.etag:
+            cached = None
+    if cached:
+        if _etag_matches(if_none_match, cached.etag):
+            return Response(status_code=304, headers=_cache_headers(cached.etag))
+        return _cached_response(cached)
+
+    tags = (meeting_tag(meeting_id),)
+    generation = response_cache.generation(tags)
+    etag, not_modified = await _check_not_modified(db, meeting_id, "meeting", if_none_match)
+    if not_modified:
+        return not_modified
+
     meeting = await meeting_service.get_meeting_details(db, meeting_id)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
-    return meeting
+    response = FastJSONResponse(meeting, headers=_cache_headers(etag))
+    response_cache.set(cache_key, response.body, tags, generation, etag=etag)
+    return response
+
+@router.get("/{meeting_id}/live")
+async def get_live_roster(meeting_id: str):
+    """Who is in the meeting right now"""
+    return FastJSONResponse({
+        "meeting_id": meeting_id,
+        "live": live_state.is_live(meeting_id),
+        "live_count": live_state.count(meeting_id),
+        "participants": live_state.roster(meeting_id)
+    })
 
 @router.post("/{meeting_id}/sync")
 async def sync_meeting(
     meeting_id: str,
-    db: AsyncSession = Depends(get_db)
+    force: bool = Query(False, description="Sync even if the meeting was synced moments ago")
 ):
     """Sync meeting data from Zoom API"""
     try:
-        # Get meeting details from Zoom
-        meeting_data = await zoom_service.get_meeting_details(meeting_id, db)
-        
-        # Store meeting
-        stored_meeting = await meeting_service.store_meeting(db, {
-            "meeting_id": meeting_id,
-            "topic": meeting_data.get("topic"),
-            "start_time": meeting_data.get("start_time"),
-            "host_email": meeting_data.get("host_email")
-        })
-
-        # Sync participants
-        participants = await meeting_service.sync_meeting_participants(db, meeting_id)
-
-        # Sync recordings
-        recordings = await meeting_service.sync_meeting_recordings(db, meeting_id)
+        # Concurrent syncs of the same meeting share one run, which outlives a disconnecting caller
+        result = await meeting_service.sync_meeting(meeting_id, force=force)
+        stored_meeting = result["meeting"]
+        participants = result["participants"]
+        recordings = result["recordings"]
 
         message = "Meeting data synced successfully"
         if len(participants) == 0:
             message += ". Note: Participant data requires a paid Zoom account for past meetings."
 
         # Return meeting data in a format frontend can use
-        return {
+        return FastJSONResponse({
             "success": True,
             "message": message,
-            "meeting": {
-                "id": stored_meeting.id,
-                "meeting_id": stored_meeting.meeting_id,
-                "topic": stored_meeting.topic,
-                "start_time": stored_meeting.start_time.isoformat() if stored_meeting.start_time else None,
-                "end_time": stored_meeting.end_time.isoformat() if stored_meeting.end_time else None,
-                "duration": stored_meeting.duration,
-                "participant_count": stored_meeting.participant_count,
-                "host_email": stored_meeting.host_email,
-                "created_at": stored_meeting.created_at.isoformat() if stored_meeting.created_at else None
-            },
+            "meeting": serialize_meeting(stored_meeting) if stored_meeting else None,
             "participants_count": len(participants),
             "recordings_count": len(recordings),
+            "cached": result["cached"],
             "note": "Participant data may be limited on free Zoom accounts" if len(participants) == 0 else None
-        }
+        })
+    except (CircuitOpenError, httpx.TransportError) as e:
+        logger.warning("Sync error: %s", e, extra={"throttle": True})
+        raise _zoom_unavailable(e)
     except httpx.HTTPStatusError as e:
         error_detail = f"Zoom API Error: {e.response.status_code}"
         if e.response.status_code == 404:
@@ -159,25 +291,56 @@ async def sync_meeting(
                 error_detail = f"Zoom API Error ({e.response.status_code}): {error_body.get('message', str(error_body))}"
             except:
                 error_detail = f"Zoom API Error ({e.response.status_code}): {e.response.text}"
-        print(f"Sync error: {error_detail}")
+        logger.warning("Sync error: %s", error_detail)
         raise HTTPException(status_code=e.response.status_code, detail=error_detail)
     except Exception as e:
         error_msg = str(e)
-        print(f"Sync error: {error_msg}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Sync error: %s", error_msg)
         raise HTTPException(status_code=500, detail=f"Internal error: {error_msg}")
 
 @router.get("/{meeting_id}/participants")
 async def get_meeting_participants(
     meeting_id: str,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size; without limit or cursor every participant is returned"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    sort: str = Query("join_time", regex=f"^({'|'.join(PARTICIPANT_SORT_FIELDS)})$"),
+    order: str = Query("asc", regex="^(asc|desc)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated participant fields to return"),
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get participants for a meeting"""
-    meeting = await meeting_service.get_meeting_details(db, meeting_id)
-    if not meeting:
+    """Get participants for a meeting, all at once or one page at a time"""
+    if cursor and limit is None:
+        limit = PARTICIPANT_PAGE_SIZE
+    selected = None
+    if fields:
+        selected = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in selected if f not in PARTICIPANT_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+    etag, not_modified = await _check_not_modified(db, meeting_id, "participants", if_none_match)
+    if not_modified:
+        return not_modified
+
+    try:
+        page = await meeting_service.list_participants(
+            db, meeting_id, fields=selected, sort=sort, order=order, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page is None:
         raise HTTPException(status_code=404, detail="Meeting not found")
-    return {"participants": meeting.get("participants", [])}
+    return FastJSONResponse(page, headers=_cache_headers(etag))
+
+@router.get("/{meeting_id}/sessions")
+async def get_participant_sessions(
+    meeting_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get every join-to-leave interval of a meeting's participants"""
+    sessions = await meeting_service.get_participant_sessions(db, meeting_id)
+    return FastJSONResponse({"sessions": [serialize_session(s) for s in sessions]})
 
 @router.post("/{meeting_id}/participants/sync")
 async def sync_participants(
@@ -187,59 +350,45 @@ async def sync_participants(
     """Sync participants from Zoom API"""
     try:
         participants = await meeting_service.sync_meeting_participants(db, meeting_id)
-        return {
+        return FastJSONResponse({
             "success": True,
-            "participants": [
-                {
-                    "id": p.id,
-                    "user_id": p.user_id,
-                    "user_name": p.user_name,
-                    "user_email": p.user_email,
-                    "join_time": p.join_time.isoformat() if p.join_time else None,
-                    "leave_time": p.leave_time.isoformat() if p.leave_time else None,
-                    "duration": p.duration,
-                    "device": p.device,
-                    "location": p.location
-                }
-                for p in participants
-            ]
-        }
+            "participants": [serialize_participant(p) for p in participants]
+        })
+    except (CircuitOpenError, httpx.TransportError) as e:
+        raise _zoom_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{meeting_id}/stats")
 async def get_meeting_stats(
     meeting_id: str,
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
     """Get meeting statistics"""
+    etag, not_modified = await _check_not_modified(db, meeting_id, "stats", if_none_match)
+    if not_modified:
+        return not_modified
+
     stats = await meeting_service.get_participant_stats(db, meeting_id)
-    return stats
+    return FastJSONResponse(stats, headers=_cache_headers(etag))
 
 @router.get("/{meeting_id}/recordings")
 async def get_meeting_recordings(
     meeting_id: str,
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
     """Get recordings for a meeting"""
+    etag, not_modified = await _check_not_modified(db, meeting_id, "recordings", if_none_match)
+    if not_modified:
+        return not_modified
+
     recordings = await meeting_service.get_meeting_recordings(db, meeting_id)
-    return {
-        "recordings": [
-            {
-                "id": r.id,
-                "recording_id": r.recording_id,
-                "recording_type": r.recording_type,
-                "file_size": r.file_size,
-                "file_type": r.file_type,
-                "recording_start": r.recording_start.isoformat() if r.recording_start else None,
-                "recording_end": r.recording_end.isoformat() if r.recording_end else None,
-                "file_path": r.file_path,
-                "status": r.status,
-                "play_url": r.play_url
-            }
-            for r in recordings
-        ]
-    }
+    return FastJSONResponse(
+        {"recordings": [serialize_recording(r) for r in recordings]},
+        headers=_cache_headers(etag)
+    )
 
 @router.post("/{meeting_id}/recordings/sync")
 async def sync_recordings(
@@ -249,20 +398,12 @@ async def sync_recordings(
     """Sync recordings from Zoom API"""
     try:
         recordings = await meeting_service.sync_meeting_recordings(db, meeting_id)
-        return {
+        return FastJSONResponse({
             "success": True,
-            "recordings": [
-                {
-                    "id": r.id,
-                    "recording_id": r.recording_id,
-                    "recording_type": r.recording_type,
-                    "file_size": r.file_size,
-                    "file_type": r.file_type,
-                    "status": r.status
-                }
-                for r in recordings
-            ]
-        }
+            "recordings": [serialize_recording(r) for r in recordings]
+        })
+    except (CircuitOpenError, httpx.TransportError) as e:
+        raise _zoom_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -275,11 +416,66 @@ async def download_recording(
     """Download recording file"""
     try:
         file_path = await meeting_service.download_recording(db, meeting_id, recording_id)
-        return {
+        return FastJSONResponse({
             "success": True,
             "message": "Recording downloaded successfully",
             "file_path": file_path
-        }
+        })
+    except (CircuitOpenError, httpx.TransportError) as e:
+        raise _zoom_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+
+@router.get("/{meeting_id}/transcript")
+async def get_meeting_transcript(
+    meeting_id: str,
+    q: Optional[str] = Query(None, min_length=1, max_length=200, description="Only segments containing these words (prefix match)"),
+    speaker: Optional[str] = Query(None),
+    kind: Optional[str] = Query(None, regex="^(transcript|captions|chat)$"),
+    limit: int = Query(200, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the parsed transcript and chat segments of a meeting in time order"""
+    etag, not_modified = await _check_not_modified(db, meeting_id, "transcript", if_none_match)
+    if not_modified:
+        return not_modified
+    if etag is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+
+    match = None
+    if q is not None:
+        match = build_match_query(q)
+        if match is None:
+            return FastJSONResponse({"meeting_id": meeting_id, "segments": [], "has_more": False})
+    page = await transcript_service.list_segments(
+        db, meeting_id, match=match, speaker=speaker, kind=kind, limit=limit, offset=offset
+    )
+    return FastJSONResponse(page, headers=_cache_headers(etag))
+
+@router.get("/{meeting_id}/talk-time")
+async def get_meeting_talk_time(
+    meeting_id: str,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get seconds spoken and chat messages sent per speaker, from the parsed transcripts"""
+    etag, not_modified = await _check_not_modified(db, meeting_id, "talk-time", if_none_match)
+    if not_modified:
+        return not_modified
+    if etag is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+
+    talk_time = await transcript_service.talk_time(db, meeting_id)
+    return FastJSONResponse(talk_time, headers=_cache_headers(etag))
+
+@router.post("/{meeting_id}/transcript/parse")
+async def parse_meeting_transcripts(
+    meeting_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Parse the meeting's downloaded transcript and chat files again"""
+    queued = await transcript_service.queue_downloaded(db, meeting_id, force=True)
+    return FastJSONResponse({"success": True, "queued": queued})
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from config.database import get_db
+from services.people_service import people_service, PEOPLE_SORT_FIELDS
+from services.serializers import FastJSONResponse
+
+router = APIRouter(default_response_class=FastJSONResponse)
+
+
+@router.get("/")
+async def list_people(
+    email: Optional[str] = Query(None, description="Only the person with this email"),
+    sort: str = Query("meetings_attended", description=f"One of: {', '.join(PEOPLE_SORT_FIELDS)}"),
+    order: str = Query("desc", regex="^(asc|desc)$"),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the attendee directory with per-person totals"""
+    if sort not in PEOPLE_SORT_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Invalid sort field: {sort}")
+    people = await people_service.list_people(db, email, sort, order, limit, offset)
+    return FastJSONResponse({"people": people, "limit": limit, "offset": offset})
+
+
+@router.get("/{person_id}")
+async def get_person(person_id: int, db: AsyncSession = Depends(get_db)):
+    """Get one person's attendance totals"""
+    person = await people_service.get_person(db, person_id)
+    if not person:
+        raise HTTPException(status_code=404, detail="Person not found")
+    return FastJSONResponse(person)
+
+
+@router.get("/{person_id}/meetings")
+async def get_attendance(
+    person_id: int,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get every meeting a person attended, most recent first"""
+    attendance = await people_service.get_attendance(db, person_id, limit, offset)
+    if attendance is None:
+        raise HTTPException(status_code=404, detail="Person not found")
+    return FastJSONResponse(attendance)
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from config.admin import require_admin
+from services.retention_service import retention_service
+from services.serializers import FastJSONResponse
+
+router = APIRouter(default_response_class=FastJSONResponse)
+
+
+@router.post("/run", dependencies=[Depends(require_admin)])
+async def run_retention(dry_run: bool = Query(False, description="Only report what is due")):
+    """Apply the configured retention policies now"""
+    return FastJSONResponse(await retention_service.run(dry_run=dry_run))
+
+
+@router.get("/archive/{meeting_id}")
+async def get_archived_meeting(meeting_id: str):
+    """Get an archived meeting with its participants and recordings"""
+    meeting = await retention_service.get_archived_meeting(meeting_id)
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Archived meeting not found")
+    return FastJSONResponse(meeting)
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.database import get_db
+from services.search_service import search_service
+from services.serializers import FastJSONResponse
+
+router = APIRouter(default_response_class=FastJSONResponse)
+
+SEARCH_TYPES = {
+    "all": ["meetings", "participants", "transcripts"],
+    "meetings": ["meetings"],
+    "participants": ["participants"],
+    "transcripts": ["transcripts"]
+}
+
+
+@router.get("")
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to match; each matches as a prefix"),
+    type: str = Query("all", regex="^(all|meetings|participants|transcripts)$"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db)
+):
+    """Search meeting topics and host emails, participant names and emails, and transcript text and speakers"""
+    if db.bind.dialect.name != "sqlite":
+        raise HTTPException(status_code=501, detail="Search requires the SQLite FTS5 backend")
+    results = await search_service.search(db, q, SEARCH_TYPES[type], limit, offset)
+    return FastJSONResponse(results)
@@ -1,15 +1,35 @@
-from fastapi import APIRouter, Request, HTTPException, Header, Depends
+from fastapi import APIRouter, Request, HTTPException, Header, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from config.admin import require_admin
 from config.database import get_db
 from services.meeting_service import meeting_service
 from services.zoom_service import zoom_service
+from services.event_bus import event_bus
+from services.live_state import live_state
+from services.metrics import WEBHOOK_EVENTS, WEBHOOK_LATENCY
+from services.webhook_capture import webhook_capture, capture_path, WEBHOOK_CAPTURE_PATH
+from services.structured_logging import log_context
 import hmac
 import hashlib
 import os
 import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Webhook events forwarded to /api/events subscribers
+PUBLISHED_EVENTS = {
+    "meeting.started",
+    "meeting.ended",
+    "meeting.participant_joined",
+    "meeting.participant_left",
+    "recording.completed"
+}
+
 def verify_webhook_signature(payload: bytes, signature: str, secret: str) -> bool:
     """Verify webhook signature from Zoom"""
     expected_signature = hmac.new(
@@ -27,6 +47,8 @@ async def zoom_webhook(
     db: AsyncSession = Depends(get_db)
 ):
     """Handle Zoom webhook events"""
+    started = time.perf_counter()
+    event_label = "unknown"
     try:
         body = await request.body()
         payload = await request.json()
@@ -38,25 +60,76 @@ async def zoom_webhook(
             if not verify_webhook_signature(body, signature, webhook_secret):
                 raise HTTPException(status_code=401, detail="Invalid webhook signature")
 
+        # Only verified deliveries, as replay re-signs whatever was captured
+        webhook_capture.record(body, request.headers)
+
         event = payload.get("event")
         event_data = payload.get("payload", {}).get("object", {})
+        # Only handled types get their own series; the rest is arbitrary client input
+        event_label = event if event in PUBLISHED_EVENTS else "other"
 
-        # Handle different webhook events
-        if event == "meeting.started":
-            await handle_meeting_started(event_data, db)
-        elif event == "meeting.ended":
-            await handle_meeting_ended(event_data, db)
-        elif event == "meeting.participant_joined":
-            await handle_participant_joined(event_data, db)
-        elif event == "meeting.participant_left":
-            await handle_participant_left(event_data, db)
-        elif event == "recording.completed":
-            await handle_recording_completed(event_data, db)
+        with log_context(meeting_id=event_data.get("id")):
+            # Handle different webhook events
+            if event == "meeting.started":
+                await handle_meeting_started(event_data, db)
+            elif event == "meeting.ended":
+                await handle_meeting_ended(event_data, db)
+            elif event == "meeting.participant_joined":
+                await handle_participant_joined(event_data, db)
+            elif event == "meeting.participant_left":
+                await handle_participant_left(event_data, db)
+            elif event == "recording.completed":
+                await handle_recording_completed(event_data, db)
 
+        if event in PUBLISHED_EVENTS:
+            publish_event(event, event_data)
+
+        WEBHOOK_EVENTS.inc(event=event_label, outcome="ok")
         return {"status": "success"}
     except Exception as e:
-        print(f"Webhook error: {e}")
+        WEBHOOK_EVENTS.inc(event=event_label, outcome="error")
+        logger.exception("Webhook error: %s", e, extra={"event": event_label})
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        WEBHOOK_LATENCY.observe(time.perf_counter() - started, event=event_label)
+
+@router.get("/capture", dependencies=[Depends(require_admin)])
+async def capture_status():
+    """Whether webhook deliveries are being recorded, and where"""
+    return webhook_capture.stats()
+
+@router.post("/capture", dependencies=[Depends(require_admin)])
+async def start_capture(name: Optional[str] = Query(None, description="gzip log to append to, inside WEBHOOK_CAPTURE_DIR")):
+    """Start recording webhook deliveries for benchmarks/replay_webhooks.py"""
+    try:
+        path = capture_path(name) if name else (
+            webhook_capture.requested_path or WEBHOOK_CAPTURE_PATH or capture_path("webhooks.jsonl.gz")
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    webhook_capture.start(path)
+    return webhook_capture.stats()
+
+@router.delete("/capture", dependencies=[Depends(require_admin)])
+async def stop_capture():
+    """Stop recording and close the log"""
+    webhook_capture.stop()
+    return webhook_capture.stats()
+
+def publish_event(event: str, event_data: dict):
+    """Notify live dashboard subscribers once an event is stored"""
+    meeting_id = event_data.get("id")
+    participant = event_data.get("participant") or {}
+    meeting_id = str(meeting_id) if meeting_id else None
+    event_bus.publish(event, meeting_id, {
+        "topic": event_data.get("topic"),
+        "participant": participant.get("user_name"),
+        "live_count": live_state.count(meeting_id) if meeting_id else 0,
+        "time": (
+            event_data.get("join_time") or event_data.get("leave_time")
+            or event_data.get("end_time") or event_data.get("start_time")
+        )
+    })
 
 async def handle_meeting_started(event_data: dict, db: AsyncSession):
     """Handle meeting started event"""
@@ -68,22 +141,30 @@ async def handle_meeting_started(event_data: dict, db: AsyncSession):
             "start_time": event_data.get("start_time"),
             "host_email": event_data.get("host", {}).get("email")
         }
-        await meeting_service.store_meeting(db, meeting_data)
+        meeting = await meeting_service.store_meeting(db, meeting_data)
+        live_state.meeting_started(meeting.meeting_id, meeting.topic, meeting.start_time)
 
 async def handle_meeting_ended(event_data: dict, db: AsyncSession):
     """Handle meeting ended event"""
     meeting_id = event_data.get("id")
     if meeting_id:
-        # Sync participants and recordings
-        await meeting_service.sync_meeting_participants(db, str(meeting_id))
-        await meeting_service.sync_meeting_recordings(db, str(meeting_id))
-        
+        live_state.meeting_ended(str(meeting_id))
+
         # Update meeting end time
         meeting_data = {
             "meeting_id": str(meeting_id),
             "end_time": event_data.get("end_time")
         }
-        await meeting_service.store_meeting(db, meeting_data)
+        meeting = await meeting_service.store_meeting(db, meeting_data)
+
+        # Fold the join/leave log into sessions; whoever was still in the room
+        # left when the meeting ended
+        await meeting_service.compact_participant_events(db, meeting.meeting_id, meeting.end_time)
+        await meeting_service.close_open_participants(db, meeting.meeting_id, meeting.end_time)
+
+        # Sync participants and recordings; Zoom's data supersedes the webhook-built
+        # rows. Joins a user-triggered sync already running for this meeting.
+        await meeting_service.sync_meeting(str(meeting_id), fetch_details=False, force=True)
 
 async def handle_participant_joined(event_data: dict, db: AsyncSession):
     """Handle participant joined event"""
@@ -91,16 +172,20 @@ async def handle_participant_joined(event_data: dict, db: AsyncSession):
     participant = event_data.get("participant", {})
     
     if meeting_id and participant:
-        participant_data = {
+        event = await meeting_service.record_participant_event(db, {
             "meeting_id": str(meeting_id),
+            "event_type": "joined",
+            "event_time": participant.get("join_time") or event_data.get("join_time"),
             "user_id": participant.get("user_id"),
             "user_name": participant.get("user_name"),
             "user_email": participant.get("email"),
-            "join_time": event_data.get("join_time"),
             "ip_address": participant.get("ip_address"),
             "location": participant.get("location")
-        }
-        await meeting_service.store_participant(db, participant_data)
+        })
+        live_state.participant_joined(event.meeting_id, meeting_service.person_key(participant_info(event)), {
+            **participant_info(event),
+            "join_time": event.event_time
+        })
 
 async def handle_participant_left(event_data: dict, db: AsyncSession):
     """Handle participant left event"""
@@ -108,12 +193,23 @@ async def handle_participant_left(event_data: dict, db: AsyncSession):
     participant = event_data.get("participant", {})
     
     if meeting_id and participant:
-        participant_data = {
+        event = await meeting_service.record_participant_event(db, {
             "meeting_id": str(meeting_id),
+            "event_type": "left",
+            "event_time": participant.get("leave_time") or event_data.get("leave_time"),
             "user_id": participant.get("user_id"),
-            "leave_time": event_data.get("leave_time")
-        }
-        await meeting_service.store_participant(db, participant_data)
+            "user_name": participant.get("user_name"),
+            "user_email": participant.get("email")
+        })
+        live_state.participant_left(event.meeting_id, meeting_service.person_key(participant_info(event)))
+
+def participant_info(event) -> dict:
+    """Identity fields of a participant event"""
+    return {
+        "user_id": event.user_id,
+        "user_name": event.user_name,
+        "user_email": event.user_email
+    }
 
 async def handle_recording_completed(event_data: dict, db: AsyncSession):
     """Handle recording completed event"""
@@ -20,20 +20,25 @@ async def clear_database():
     async with engine.begin() as conn:
         # Delete all records from tables (in correct order due to foreign keys)
         print("  - Clearing participants...")
+        await conn.execute(text("DELETE FROM participant_events"))
+        await conn.execute(text("DELETE FROM participant_sessions"))
         await conn.execute(text("DELETE FROM participants"))
+        await conn.execute(text("DELETE FROM people"))
         
         print("  - Clearing recordings...")
+        await conn.execute(text("DELETE FROM transcript_segments"))
         await conn.execute(text("DELETE FROM recordings"))
         
         print("  - Clearing meetings...")
         await conn.execute(text("DELETE FROM meetings"))
+        await conn.execute(text("DELETE FROM archived_meetings"))
         
         # Note: We keep oauth_tokens so user doesn't need to re-authenticate
         # Uncomment next line if you want to clear tokens too:
         # await conn.execute(text("DELETE FROM oauth_tokens"))
         
         print("  - Resetting auto-increment counters...")
-        await conn.execute(text("DELETE FROM sqlite_sequence WHERE name IN ('meetings', 'participants', 'recordings')"))
+        await conn.execute(text("DELETE FROM sqlite_sequence WHERE name IN ('meetings', 'participants', 'participant_events', 'participant_sessions', 'people', 'recordings', 'archived_meetings')"))
         
     print("✅ Database cleared successfully!")
     print("\nNote: OAuth tokens are preserved (you won't need to re-authenticate)")
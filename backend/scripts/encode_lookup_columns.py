@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Script to dictionary-encode the participant/recording attribute columns of a
+database created before lookup_values existed. The app refuses to start on
+such a database until this has run.
+
+    python scripts/encode_lookup_columns.py
+    python scripts/encode_lookup_columns.py --drop-legacy
+
+The database file is first copied to <file>.<timestamp>.bak. The values are
+then copied into lookup_values and the <name>_id columns, and the old string
+columns are left in place. Once the app shows the values correctly, run it
+again with --drop-legacy to drop them and reclaim their space.
+"""
+import argparse
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+from config.database import engine, encode_legacy_lookup_columns
+
+def back_up(database: str) -> str:
+    """Copy the database with SQLite's online backup, safe while the app runs"""
+    backup = f"{database}.{time.strftime('%Y%m%d-%H%M%S')}.bak"
+    source = sqlite3.connect(database)
+    target = sqlite3.connect(backup)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+    return backup
+
+async def encode(drop_legacy: bool):
+    database = engine.url.database
+    if not database or database == ":memory:" or not Path(database).exists():
+        print(f"❌ No database file at {database!r} (set DATABASE_URL)")
+        sys.exit(1)
+
+    print(f"💾 Backing up {database}...")
+    print(f"  - {back_up(database)}")
+
+    print(f"🔤 Encoding attribute columns{' and dropping the legacy ones' if drop_legacy else ''}...")
+    encoded = await encode_legacy_lookup_columns(drop=drop_legacy)
+    await engine.dispose()
+    if not encoded:
+        print("  - No legacy columns left; nothing to do")
+        return
+    for column, rows in encoded.items():
+        print(f"  - {column}: {rows} rows encoded{', column dropped' if drop_legacy else ''}")
+    if not drop_legacy:
+        print("\nThe legacy columns are kept. Once the app shows the values, run again with --drop-legacy.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dictionary-encode pre-lookup_values attribute columns")
+    parser.add_argument("--drop-legacy", action="store_true",
+                        help="Also drop the old string columns (after another backup)")
+    args = parser.parse_args()
+    asyncio.run(encode(args.drop_legacy))
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Report what dictionary-encoding the participant/recording attribute columns
+saves: builds a database with the legacy free-string columns, copies it,
+encodes the copy as scripts/encode_lookup_columns.py --drop-legacy does and
+compares file size and query speed.
+
+    python scripts/report_lookup_encoding.py --participants 500000
+    python scripts/report_lookup_encoding.py --database ./data/meetings.db
+
+With --database the report runs on a copy of an existing pre-migration
+database; the original is left untouched.
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DEVICES = ["Mac", "Windows", "iOS", "Android", "Linux", "Web Browser Chrome", "Zoom Rooms"]
+LOCATIONS = ["New York, US", "London, GB", "Berlin, DE", "Sao Paulo, BR", "Mumbai, IN", "Tokyo, JP", "Sydney, AU"]
+
+LEGACY_SCHEMA = """
+CREATE TABLE meetings (
+    id INTEGER PRIMARY KEY, meeting_id VARCHAR NOT NULL UNIQUE, topic VARCHAR,
+    start_time DATETIME, end_time DATETIME, duration INTEGER, participant_count INTEGER,
+    host_email VARCHAR, created_at DATETIME
+);
+CREATE TABLE participants (
+    id INTEGER PRIMARY KEY, meeting_id VARCHAR NOT NULL REFERENCES meetings (meeting_id),
+    user_id VARCHAR, user_name VARCHAR, user_email VARCHAR, join_time DATETIME,
+    leave_time DATETIME, duration INTEGER, device VARCHAR, ip_address VARCHAR,
+    location VARCHAR, created_at DATETIME
+);
+CREATE TABLE recordings (
+    id INTEGER PRIMARY KEY, meeting_id VARCHAR NOT NULL REFERENCES meetings (meeting_id),
+    recording_id VARCHAR NOT NULL UNIQUE, recording_type VARCHAR, file_size INTEGER,
+    file_type VARCHAR, download_url TEXT, play_url TEXT, recording_start DATETIME,
+    recording_end DATETIME, file_path VARCHAR, status VARCHAR, created_at DATETIME
+);
+CREATE INDEX ix_participants_meeting_join_time ON participants (meeting_id, join_time);
+"""
+
+def build_legacy(db_file: str, participants: int, per_meeting: int):
+    """Create and fill a database with the pre-migration schema"""
+    rng = random.Random(7)
+    start = datetime(2025, 1, 1, 9, 0, 0)
+    meetings = max(1, participants // per_meeting)
+    conn = sqlite3.connect(db_file)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.executemany(
+        "INSERT INTO meetings (meeting_id, topic, start_time, participant_count, created_at) VALUES (?, ?, ?, ?, ?)",
+        (
+            (str(100000000 + m), f"Meeting {m}", (start + timedelta(hours=m)).isoformat(" "), per_meeting,
+             start.isoformat(" "))
+            for m in range(meetings)
+        )
+    )
+    conn.executemany(
+        "INSERT INTO participants (meeting_id, user_id, user_name, user_email, join_time, leave_time, "
+        "duration, device, ip_address, location, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            (
+                str(100000000 + i // per_meeting), f"user{i % 5000}", f"User {i % 5000}",
+                f"user{i % 5000}@example.com",
+                (start + timedelta(hours=i // per_meeting)).isoformat(" "),
+                (start + timedelta(hours=i // per_meeting, minutes=45)).isoformat(" "),
+                2700, rng.choice(DEVICES), f"10.0.{rng.randrange(8)}.{rng.randrange(256)}",
+                rng.choice(LOCATIONS), start.isoformat(" ")
+            )
+            for i in range(participants)
+        )
+    )
+    conn.executemany(
+        "INSERT INTO recordings (meeting_id, recording_id, recording_type, file_size, file_type, status, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            (str(100000000 + m), f"rec-{m}-{kind}", kind, 1000000, file_type, "completed", start.isoformat(" "))
+            for m in range(meetings)
+            for kind, file_type in (("shared_screen_with_speaker_view", "MP4"), ("audio_only", "M4A"))
+        )
+    )
+    conn.commit()
+    conn.close()
+
+def table_bytes(db_file: str) -> int:
+    """Bytes used by the participant/recording tables and the lookup table.
+
+    The migrated copy also gains search and people indexes, so whole-file
+    size alone would not isolate the encoding.
+    """
+    conn = sqlite3.connect(db_file)
+    conn.execute("VACUUM")
+    size = conn.execute(
+        "SELECT coalesce(sum(pgsize), 0) FROM dbstat WHERE name IN "
+        "('participants', 'recordings', 'lookup_values', 'sqlite_autoindex_lookup_values_1')"
+    ).fetchone()[0]
+    conn.close()
+    return size
+
+def best_ms(db_file: str, sql: str, params=(), decode=None, repeat: int = 5) -> float:
+    """Best wall-clock time of a query on a fresh connection, including decoding"""
+    timings = []
+    for _ in range(repeat):
+        conn = sqlite3.connect(db_file)
+        started = time.perf_counter()
+        rows = conn.execute(sql, params).fetchall()
+        if decode:
+            rows = [decode(row) for row in rows]
+        timings.append((time.perf_counter() - started) * 1000)
+        conn.close()
+    return min(timings)
+
+async def migrate(db_file: str) -> float:
+    from config.database import init_db, engine, encode_legacy_lookup_columns
+    engine.echo = False
+    started = time.perf_counter()
+    await encode_legacy_lookup_columns(drop=True)
+    await init_db()
+    await engine.dispose()
+    return time.perf_counter() - started
+
+def report(legacy_file: str, encoded_file: str, repeat: int):
+    from config.database import lookup_cache
+
+    conn = sqlite3.connect(legacy_file)
+    meeting_id = conn.execute("SELECT meeting_id FROM participants LIMIT 1").fetchone()[0]
+    conn.close()
+    # Decoding goes through the same in-process cache LookupType reads from
+    conn = sqlite3.connect(encoded_file)
+    lookup_cache.load(conn.execute("SELECT id, kind, value FROM lookup_values"), complete=True)
+    conn.close()
+    value_for = lookup_cache.value_for
+
+    queries = {
+        "one meeting's participants": (
+            "SELECT id, user_name, device, ip_address, location FROM participants WHERE meeting_id = ?",
+            "SELECT id, user_name, device_id, ip_address_id, location_id FROM participants WHERE meeting_id = ?",
+            (meeting_id,),
+            lambda row: (row[0], row[1], value_for(row[2]), value_for(row[3]), value_for(row[4]))
+        ),
+        "full scan of attributes": (
+            "SELECT device, ip_address, location FROM participants",
+            "SELECT device_id, ip_address_id, location_id FROM participants",
+            (),
+            lambda row: (value_for(row[0]), value_for(row[1]), value_for(row[2]))
+        ),
+        "count by device": (
+            "SELECT device, count(*) FROM participants GROUP BY device",
+            "SELECT device_id, count(*) FROM participants GROUP BY device_id",
+            (),
+            lambda row: (value_for(row[0]), row[1])
+        ),
+    }
+
+    legacy_size = table_bytes(legacy_file)
+    encoded_size = table_bytes(encoded_file)
+    print(f"Participant/recording tables (after VACUUM): legacy {legacy_size / 1e6:.1f} MB, "
+          f"encoded {encoded_size / 1e6:.1f} MB ({(encoded_size - legacy_size) / legacy_size:+.1%})")
+    print(f"Whole file: legacy {os.path.getsize(legacy_file) / 1e6:.1f} MB, "
+          f"migrated {os.path.getsize(encoded_file) / 1e6:.1f} MB (includes search and people indexes)")
+    print(f"{'query':<30}{'legacy ms':>12}{'encoded ms':>12}{'delta':>9}")
+    for name, (legacy_sql, encoded_sql, params, decode) in queries.items():
+        legacy_ms = best_ms(legacy_file, legacy_sql, params, repeat=repeat)
+        encoded_ms = best_ms(encoded_file, encoded_sql, params, decode, repeat)
+        print(f"{name:<30}{legacy_ms:>12.2f}{encoded_ms:>12.2f}{(encoded_ms - legacy_ms) / legacy_ms:>+9.0%}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report size and speed of dictionary-encoded columns")
+    parser.add_argument("--participants", type=int, default=500000)
+    parser.add_argument("--per-meeting", type=int, default=25)
+    parser.add_argument("--database", help="Existing pre-migration database to measure (a copy is migrated)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        legacy_file = os.path.join(scratch, "legacy.db")
+        encoded_file = os.path.join(scratch, "encoded.db")
+        if args.database:
+            shutil.copyfile(args.database, legacy_file)
+        else:
+            build_legacy(legacy_file, args.participants, args.per_meeting)
+        shutil.copyfile(legacy_file, encoded_file)
+
+        # Must be set before config.database creates the engine
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{encoded_file}"
+        seconds = asyncio.run(migrate(encoded_file))
+        print(f"Migrated in {seconds:.1f}s")
+        report(legacy_file, encoded_file, args.repeat)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Script to apply the data retention policies: archive old meetings to monthly
+SQLite files, delete expired detail rows and reclaim free pages
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+from config.database import init_db
+from services.retention_service import retention_service, RETENTION_POLICIES
+
+async def retention(dry_run: bool, vacuum: bool, enable_incremental: bool, policies: dict):
+    """Run the retention job once and print what it did"""
+    await init_db()
+
+    if enable_incremental:
+        print("🧹 Switching to incremental auto-vacuum (full VACUUM, may take a while)...")
+        await retention_service.enable_incremental_vacuum()
+
+    active = {table: days for table, days in policies.items() if days > 0}
+    if not active:
+        print("No retention policies configured (RETENTION_*_DAYS or --*-days)")
+    else:
+        print(f"🗄️  Applying retention{' (dry run)' if dry_run else ''}: " +
+              ", ".join(f"{table} > {days} days" for table, days in active.items()))
+
+    report = await retention_service.run(dry_run=dry_run, vacuum=vacuum, policies=policies)
+    for table, stats in report["tables"].items():
+        if table == "meetings":
+            months = ", ".join(f"{month}: {count}" for month, count in stats["months"].items())
+            print(f"  - meetings: {stats['archived']} archived ({months or 'none due'})")
+        else:
+            count = stats.get("matching", stats["deleted"])
+            print(f"  - {table}: {count} {'due' if dry_run else 'deleted'}")
+    if "vacuum" in report:
+        stats = report["vacuum"]
+        if stats["enabled"]:
+            print(f"  - vacuum: {stats['freed_pages']} pages freed, {stats['free_pages']} still free")
+        else:
+            print(f"  - vacuum: incremental auto-vacuum is off ({stats['hint']})")
+
+    print("✅ Retention complete")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive and purge old data")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what is due")
+    parser.add_argument("--no-vacuum", action="store_true", help="Skip the incremental vacuum")
+    parser.add_argument("--enable-incremental-vacuum", action="store_true",
+                        help="Convert an existing database to incremental auto-vacuum first")
+    parser.add_argument("--meetings-days", type=int, default=RETENTION_POLICIES["meetings"])
+    parser.add_argument("--sessions-days", type=int, default=RETENTION_POLICIES["participant_sessions"])
+    parser.add_argument("--events-days", type=int, default=RETENTION_POLICIES["participant_events"])
+    args = parser.parse_args()
+
+    asyncio.run(retention(args.dry_run, not args.no_vacuum, args.enable_incremental_vacuum, {
+        "meetings": args.meetings_days,
+        "participant_sessions": args.sessions_days,
+        "participant_events": args.events_days
+    }))
@@ -0,0 +1,122 @@
+from typing import Dict
+import logging
+import os
+import time
+from services.metrics import ZOOM_CIRCUIT_TRANSITIONS, ZOOM_CIRCUIT_REJECTED
+
+logger = logging.getLogger(__name__)
+
+# Consecutive failures (timeouts, connection errors, 5xx) that open an endpoint class's circuit
+ZOOM_CIRCUIT_FAILURES = int(os.getenv("ZOOM_CIRCUIT_FAILURES", "5"))
+# Seconds an open circuit fails calls fast before letting one probe through
+ZOOM_CIRCUIT_OPEN_SECONDS = float(os.getenv("ZOOM_CIRCUIT_OPEN_SECONDS", "30"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """A call refused without being made because its circuit is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Zoom API {name} is unavailable; retry in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Fails calls fast once a dependency keeps failing, then probes for recovery.
+
+    Closed: calls go through; failure_threshold consecutive failures open
+    the circuit. Open: calls raise CircuitOpenError for open_seconds. Half
+    open: one probe call goes through while the rest keep failing fast;
+    its success closes the circuit and its failure opens it again.
+
+    Callers report each call's outcome with success(), failure() or, for a
+    call that ended without an answer either way (cancelled), release().
+    """
+
+    def __init__(self, name: str, failure_threshold: int = ZOOM_CIRCUIT_FAILURES,
+                 open_seconds: float = ZOOM_CIRCUIT_OPEN_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probing = False
+
+    def before_call(self):
+        """Raise CircuitOpenError unless this call may go through"""
+        if self.state == OPEN:
+            remaining = self.opened_at + self.open_seconds - time.monotonic()
+            if remaining > 0:
+                self._reject(remaining)
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probing:
+                self._reject(self.open_seconds)
+            self._probing = True
+
+    def success(self):
+        self.failures = 0
+        self._probing = False
+        if self.state != CLOSED:
+            self._transition(CLOSED)
+
+    def failure(self):
+        self.failures += 1
+        self._probing = False
+        if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+            self.opened_at = time.monotonic()
+            self._transition(OPEN)
+
+    def release(self):
+        self._probing = False
+
+    def _reject(self, retry_after: float):
+        self.rejected += 1
+        ZOOM_CIRCUIT_REJECTED.inc(endpoint=self.name)
+        raise CircuitOpenError(self.name, retry_after)
+
+    def _transition(self, state: str):
+        previous, self.state = self.state, state
+        ZOOM_CIRCUIT_TRANSITIONS.inc(endpoint=self.name, state=state)
+        log = logger.warning if state == OPEN else logger.info
+        log("Circuit for %s %s -> %s", self.name, previous, state, extra={"failures": self.failures})
+
+    def stats(self) -> Dict:
+        retry_after = None
+        if self.state == OPEN:
+            retry_after = round(max(self.opened_at + self.open_seconds - time.monotonic(), 0), 1)
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "retry_after": retry_after
+        }
+
+
+class CircuitBreakers:
+    """One breaker per name (a Zoom endpoint class), created on first use.
+
+    State is per process: with several workers each opens its own circuits.
+    """
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers[name] = CircuitBreaker(name)
+        return breaker
+
+    def stats(self) -> Dict:
+        return {name: breaker.stats() for name, breaker in sorted(self._breakers.items())}
+
+
+# Singleton instance
+zoom_circuits = CircuitBreakers()
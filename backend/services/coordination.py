@@ -0,0 +1,333 @@
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+import asyncio
+import json
+import logging
+import os
+import random
+import socket
+import time
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.schema import CreateTable
+from config.database import engine, lookup_cache, Lease, RateLimit, WorkerBroadcast
+
+logger = logging.getLogger(__name__)
+
+# Processes serving the app; main.py starts this many uvicorn workers
+WORKERS = int(os.getenv("WORKERS", "1"))
+# Seconds a leader holds its role without renewing; renewed every third of it
+LEADER_LEASE_SECONDS = float(os.getenv("LEADER_LEASE_SECONDS", "30"))
+# How often workers exchange cache invalidations, live state and events
+WORKER_SYNC_INTERVAL_MS = int(os.getenv("WORKER_SYNC_INTERVAL_MS", "200"))
+# Broadcasts older than this are deleted; a worker stalled longer misses them
+BROADCAST_RETENTION_SECONDS = 300
+# Zoom API calls per second across all workers (0 = no budget, only shared 429 back-off)
+ZOOM_RATE_LIMIT_PER_SECOND = int(os.getenv("ZOOM_RATE_LIMIT_PER_SECOND", "0"))
+
+ZOOM_BUDGET = "zoom"
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _decode(value: Dict):
+    if len(value) == 1 and "$datetime" in value:
+        return datetime.fromisoformat(value["$datetime"])
+    return value
+
+
+class Coordinator:
+    """Keeps worker processes that share one SQLite database from stepping on each other.
+
+    - Leases: a row in `leases` names the worker holding a lock until it
+      expires, so a crashed holder never blocks the others for long.
+    - Leader election: background jobs run only in the worker holding the
+      job's lease.
+    - Shared state: in-memory structures (response cache, live state, event
+      stream) publish each change, which the other workers apply through
+      `worker_broadcasts` within a couple of WORKER_SYNC_INTERVAL_MS.
+    - Rate limits: Zoom calls are counted, and a 429 backs off every worker,
+      through `rate_limits`.
+
+    With a single worker leases and leadership are granted without touching
+    the database and nothing is broadcast.
+    """
+
+    def __init__(self, workers: int = WORKERS):
+        self.multi_worker = workers > 1
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.leading: Set[str] = set()
+        self._handlers: Dict[str, Callable] = {}
+        self._outbox: List[tuple] = []
+        self._last_seen = 0
+        self._sync_task: Optional[asyncio.Task] = None
+        # Set while replaying another worker's calls, which must not be sent back
+        self._applying = False
+        self.received = 0
+        self.sent = 0
+
+    async def setup(self):
+        """Create the coordination tables; runs before init_db, which workers take turns at"""
+        if not self.multi_worker:
+            return
+        # Forked workers inherit the pid of the parent's import
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        async with engine.connect() as conn:
+            # Readers stop waiting for writers, and writers for readers
+            await conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+        async with engine.begin() as conn:
+            for model in (Lease, RateLimit, WorkerBroadcast):
+                await conn.execute(CreateTable(model.__table__, if_not_exists=True))
+            # Only what other workers do from now on is replayed
+            self._last_seen = (await conn.execute(select(func.max(WorkerBroadcast.id)))).scalar() or 0
+
+    # Leases
+
+    async def try_acquire(self, name: str, ttl: float) -> bool:
+        """Take or renew a lease; False while another worker holds it"""
+        if not self.multi_worker:
+            return True
+        now = time.time()
+        async with engine.begin() as conn:
+            await conn.execute(
+                sqlite_insert(Lease)
+                .values(name=name, holder=self.worker_id, expires_at=now + ttl)
+                .on_conflict_do_update(
+                    index_elements=[Lease.name],
+                    set_={"holder": self.worker_id, "expires_at": now + ttl},
+                    where=or_(Lease.holder == self.worker_id, Lease.expires_at < now)
+                )
+            )
+            holder = (await conn.execute(select(Lease.holder).where(Lease.name == name))).scalar()
+        return holder == self.worker_id
+
+    async def release(self, name: str):
+        if not self.multi_worker:
+            return
+        async with engine.begin() as conn:
+            await conn.execute(delete(Lease).where(Lease.name == name, Lease.holder == self.worker_id))
+
+    @asynccontextmanager
+    async def exclusive(self, name: str, ttl: float, poll: float = 0.1):
+        """Hold a lease for the duration of the block, waiting for it if taken.
+
+        ttl bounds how long a crashed holder keeps the others waiting, so it
+        must exceed the time the block takes.
+        """
+        while not await self.try_acquire(name, ttl):
+            await asyncio.sleep(poll)
+        try:
+            yield
+        finally:
+            await self.release(name)
+
+    async def run_as_leader(self, role: str, job: Callable[[], Awaitable]):
+        """Run job only while this worker leads role; another worker takes over if this one dies.
+
+        Leadership is renewed every third of LEADER_LEASE_SECONDS. A leader
+        that cannot renew in time stops the job before the lease lapses.
+        """
+        if not self.multi_worker:
+            await job()
+            return
+
+        lease = f"leader:{role}"
+        task: Optional[asyncio.Task] = None
+        renewed = 0.0
+        try:
+            while True:
+                try:
+                    leading = await self.try_acquire(lease, LEADER_LEASE_SECONDS)
+                    if leading:
+                        renewed = time.monotonic()
+                except OperationalError as e:
+                    logger.warning("Could not renew %s: %s", lease, e)
+                    leading = task is not None and time.monotonic() - renewed < LEADER_LEASE_SECONDS * 2 / 3
+
+                if task is not None and task.done():
+                    if not task.cancelled() and task.exception():
+                        logger.error("Leader job %s failed", role, exc_info=task.exception())
+                    task = None
+                    self.leading.discard(role)
+                if leading and task is None:
+                    logger.info("Leading %s", role)
+                    task = asyncio.create_task(job())
+                    self.leading.add(role)
+                elif not leading and task is not None:
+                    logger.info("Lost leadership of %s", role)
+                    task.cancel()
+                    task = None
+                    self.leading.discard(role)
+                await asyncio.sleep(LEADER_LEASE_SECONDS / 3)
+        finally:
+            self.leading.discard(role)
+            if task is not None:
+                task.cancel()
+            try:
+                await asyncio.shield(self.release(lease))
+            except OperationalError:
+                pass
+
+    # Shared in-memory state
+
+    def subscribe(self, topic: str, handler: Callable):
+        """Have handler apply what other workers publish on topic"""
+        self._handlers[topic] = handler
+
+    def publish(self, topic: str, *args):
+        """Call topic's handler with args in every other worker.
+
+        Arguments must be JSON-serializable (datetimes are). Nothing is sent
+        with a single worker, or while applying another worker's broadcast.
+        """
+        if self.multi_worker and not self._applying:
+            self._outbox.append((topic, args))
+
+    async def start(self):
+        if self.multi_worker and self._sync_task is None:
+            self._sync_task = asyncio.create_task(self._sync_loop())
+
+    async def stop(self):
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            self._sync_task = None
+            try:
+                await self._flush()
+            except OperationalError:
+                pass
+
+    async def _sync_loop(self):
+        cleaned = time.monotonic()
+        while True:
+            await asyncio.sleep(WORKER_SYNC_INTERVAL_MS / 1000)
+            try:
+                await self._flush()
+                await self._receive()
+                if time.monotonic() - cleaned > 60:
+                    cleaned = time.monotonic()
+                    async with engine.begin() as conn:
+                        await conn.execute(delete(WorkerBroadcast).where(
+                            WorkerBroadcast.created_at < time.time() - BROADCAST_RETENTION_SECONDS
+                        ))
+            except OperationalError as e:
+                logger.warning("Worker sync failed: %s", e, extra={"throttle": True})
+
+    async def _flush(self):
+        if not self._outbox:
+            return
+        pending, self._outbox = self._outbox, []
+        now = time.time()
+        async with engine.begin() as conn:
+            await conn.execute(WorkerBroadcast.__table__.insert(), [
+                {"origin": self.worker_id, "topic": topic, "payload": json.dumps(args, default=_encode), "created_at": now}
+                for topic, args in pending
+            ])
+        self.sent += len(pending)
+
+    async def _receive(self):
+        async with engine.connect() as conn:
+            newest = (await conn.execute(select(func.max(WorkerBroadcast.id)))).scalar()
+            if newest is not None and newest < self._last_seen:
+                # Ids started over (the table was rebuilt or replaced): everything there is new
+                logger.warning("Broadcast ids restarted below %d; reading from the start", self._last_seen)
+                self._last_seen = 0
+            rows = (await conn.execute(
+                select(WorkerBroadcast.id, WorkerBroadcast.origin, WorkerBroadcast.topic, WorkerBroadcast.payload)
+                .where(WorkerBroadcast.id > self._last_seen)
+                .order_by(WorkerBroadcast.id)
+            )).all()
+        for row in rows:
+            self._last_seen = row.id
+            if row.origin == self.worker_id:
+                continue
+            handler = self._handlers.get(row.topic)
+            if handler is None:
+                continue
+            self._applying = True
+            try:
+                handler(*json.loads(row.payload, object_hook=_decode))
+                self.received += 1
+            except Exception:
+                logger.exception("Could not apply %s from %s", row.topic, row.origin)
+            finally:
+                self._applying = False
+
+    # Rate limits
+
+    @property
+    def shares_rate_limits(self) -> bool:
+        return self.multi_worker or ZOOM_RATE_LIMIT_PER_SECOND > 0
+
+    async def acquire_call(self, label: str, max_wait: float):
+        """Wait for the per-second budget and for any 429 back-off on label to pass"""
+        if not self.shares_rate_limits:
+            return
+        deadline = time.monotonic() + max_wait
+        while True:
+            now = time.time()
+            second = int(now)
+            async with engine.begin() as conn:
+                used = 0
+                if ZOOM_RATE_LIMIT_PER_SECOND > 0:
+                    used = (await conn.execute(
+                        sqlite_insert(RateLimit)
+                        .values(name=ZOOM_BUDGET, window=second, used=1, blocked_until=0)
+                        .on_conflict_do_update(
+                            index_elements=[RateLimit.name],
+                            set_={
+                                "used": func.iif(RateLimit.window == second, RateLimit.used + 1, 1),
+                                "window": second
+                            }
+                        )
+                        .returning(RateLimit.used)
+                    )).scalar()
+                blocked_until = (await conn.execute(
+                    select(RateLimit.blocked_until).where(RateLimit.name == label)
+                )).scalar() or 0
+            if blocked_until > now:
+                wait = blocked_until - now
+            elif used > ZOOM_RATE_LIMIT_PER_SECOND > 0:
+                # Spread the workers over the next second
+                wait = second + 1 - now + random.random() * 0.05
+            else:
+                return
+            if time.monotonic() + wait > deadline:
+                # Let Zoom decide rather than queueing forever
+                return
+            await asyncio.sleep(wait)
+
+    async def block_calls(self, label: str, seconds: float):
+        """Make every worker hold off calls to label for seconds after a 429"""
+        if not self.shares_rate_limits:
+            return
+        until = time.time() + seconds
+        async with engine.begin() as conn:
+            await conn.execute(
+                sqlite_insert(RateLimit)
+                .values(name=label, window=0, used=0, blocked_until=until)
+                .on_conflict_do_update(
+                    index_elements=[RateLimit.name],
+                    set_={"blocked_until": func.max(RateLimit.blocked_until, until)}
+                )
+            )
+
+    def stats(self) -> Dict:
+        return {
+            "worker_id": self.worker_id,
+            "workers": WORKERS,
+            "leading": sorted(self.leading),
+            "broadcasts_sent": self.sent,
+            "broadcasts_received": self.received
+        }
+
+
+# Singleton instance
+coordinator = Coordinator()
+# Lookup ids another worker interned; config.database can't import this module to subscribe
+coordinator.subscribe("lookups.learned", lookup_cache.learned)
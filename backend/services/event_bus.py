@@ -0,0 +1,106 @@
+from typing import Dict, Iterable, Optional, Set
+import asyncio
+import itertools
+import os
+from services.coordination import coordinator
+from services.serializers import dumps
+
+EVENT_BUFFER_SIZE = int(os.getenv("EVENT_BUFFER_SIZE", "100"))
+
+
+class Subscription:
+    """One subscriber's bounded event buffer"""
+
+    def __init__(self, topics: Optional[Set[str]], buffer_size: int):
+        self.topics = topics
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self.dropped = False
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Next encoded event, or None on timeout or once a dropped buffer is drained"""
+        if self.dropped and self.queue.empty():
+            return None
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBus:
+    """In-process pub/sub fanning webhook events out to live subscribers.
+
+    Publishing never blocks: a subscriber whose buffer is full is dropped so
+    one slow client cannot hold up the webhook handlers or other clients.
+    """
+
+    def __init__(self, buffer_size: int = EVENT_BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self._all: Set[Subscription] = set()
+        self._by_topic: Dict[str, Set[Subscription]] = {}
+        self._sequence = itertools.count(1)
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, topics: Optional[Iterable[str]] = None) -> Subscription:
+        """Subscribe to every event, or only to the given meeting ids"""
+        topics = set(topics) if topics else None
+        subscription = Subscription(topics, self.buffer_size)
+        if topics is None:
+            self._all.add(subscription)
+        else:
+            for topic in topics:
+                self._by_topic.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a subscriber; safe to call more than once"""
+        if subscription.topics is None:
+            self._all.discard(subscription)
+            return
+        for topic in subscription.topics:
+            subscribers = self._by_topic.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._by_topic[topic]
+
+    def publish(self, event: str, meeting_id: Optional[str], data: Dict) -> int:
+        """Queue an event for matching subscribers of every worker; returns this worker's count"""
+        coordinator.publish("events.publish", event, meeting_id, data)
+        return self._deliver(event, meeting_id, data)
+
+    def _deliver(self, event: str, meeting_id: Optional[str], data: Dict) -> int:
+        """Encode an event once and queue it for matching subscribers"""
+        event_id = next(self._sequence)
+        payload = dumps({"event": event, "meeting_id": meeting_id, **data}).decode()
+        message = f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n".encode()
+
+        targets = list(self._all)
+        if meeting_id is not None:
+            targets.extend(self._by_topic.get(meeting_id, ()))
+
+        for subscription in targets:
+            try:
+                subscription.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                subscription.dropped = True
+                self.unsubscribe(subscription)
+                self.dropped += 1
+
+        self.published += 1
+        return len(targets)
+
+    def stats(self) -> Dict:
+        """Subscriber and delivery counters"""
+        return {
+            "subscribers": len(self._all) + len(
+                {s for subscribers in self._by_topic.values() for s in subscribers}
+            ),
+            "published": self.published,
+            "dropped_subscribers": self.dropped
+        }
+
+
+# Singleton instance
+event_bus = EventBus()
+coordinator.subscribe("events.publish", event_bus._deliver)
@@ -0,0 +1,122 @@
+from sqlalchemy import select
+from typing import AsyncIterator, Dict, List, Optional
+from datetime import datetime
+import csv
+import io
+import zlib
+from config.database import AsyncSessionLocal, Meeting, Participant
+from services.serializers import dumps
+
+# Columns written for each exported entity, in output order
+MEETING_EXPORT_FIELDS = [
+    "id", "meeting_id", "topic", "start_time", "end_time", "duration",
+    "participant_count", "host_email", "created_at", "updated_at"
+]
+PARTICIPANT_EXPORT_FIELDS = [
+    "id", "meeting_id", "user_id", "user_name", "user_email", "join_time",
+    "leave_time", "duration", "device", "ip_address", "location", "created_at",
+    "updated_at"
+]
+RECORDING_EXPORT_FIELDS = [
+    "id", "meeting_id", "recording_id", "recording_type", "file_size", "file_type",
+    "download_url", "play_url", "recording_start", "recording_end", "file_path",
+    "status", "created_at", "updated_at"
+]
+
+# Rows fetched per round-trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+
+class ExportService:
+    def meetings_query(self, start: Optional[datetime] = None, end: Optional[datetime] = None):
+        """Build the meetings export query for a start_time range"""
+        query = select(Meeting).order_by(Meeting.id)
+        if start:
+            query = query.where(Meeting.start_time >= start)
+        if end:
+            query = query.where(Meeting.start_time < end)
+        return query
+
+    def participants_query(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        meeting_id: Optional[str] = None
+    ):
+        """Build the participants export query for a join_time range"""
+        query = select(Participant).order_by(Participant.id)
+        if start:
+            query = query.where(Participant.join_time >= start)
+        if end:
+            query = query.where(Participant.join_time < end)
+        if meeting_id:
+            query = query.where(Participant.meeting_id == meeting_id)
+        return query
+
+    async def stream_rows(self, query, fields: List[str]) -> AsyncIterator[List[Dict]]:
+        """Yield batches of row dicts from a server-side cursor"""
+        async with AsyncSessionLocal() as session:
+            result = await session.stream_scalars(
+                query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+            )
+            async for partition in result.partitions():
+                yield [self._row_to_dict(row, fields) for row in partition]
+
+    async def stream_export(
+        self,
+        query,
+        fields: List[str],
+        fmt: str = "ndjson",
+        compress: bool = False
+    ) -> AsyncIterator[bytes]:
+        """Encode exported rows as NDJSON or CSV, optionally gzip-compressed on the fly"""
+        compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16) if compress else None
+        header_pending = fmt == "csv"
+
+        async for batch in self.stream_rows(query, fields):
+            if fmt == "csv":
+                data = self._encode_csv(batch, fields, header_pending).encode("utf-8")
+                header_pending = False
+            else:
+                data = self._encode_ndjson(batch)
+
+            if compressor:
+                data = compressor.compress(data)
+            if data:
+                yield data
+
+        tail = b""
+        if header_pending:
+            # Empty result: still emit the CSV header row
+            tail = self._encode_csv([], fields, True).encode("utf-8")
+        if compressor:
+            tail = compressor.compress(tail) + compressor.flush()
+        if tail:
+            yield tail
+
+    def _encode_ndjson(self, rows: List[Dict]) -> bytes:
+        """Encode rows as newline-delimited JSON"""
+        return b"".join(dumps(row) + b"\n" for row in rows)
+
+    def _encode_csv(self, rows: List[Dict], fields: List[str], with_header: bool) -> str:
+        """Encode rows as CSV text"""
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fields)
+        if with_header:
+            writer.writeheader()
+        writer.writerows(rows)
+        return buffer.getvalue()
+
+    def _row_to_dict(self, row, fields: List[str]) -> Dict:
+        """Convert an ORM row to a JSON-safe dict"""
+        data = {}
+        for field in fields:
+            value = getattr(row, field)
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            data[field] = value
+        return data
+
+
+# Singleton instance
+export_service = ExportService()
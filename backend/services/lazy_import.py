@@ -0,0 +1,21 @@
+from types import ModuleType
+import importlib.util
+import sys
+
+
+def lazy_import(name: str) -> ModuleType:
+    """A module that is only executed when one of its attributes is first used.
+
+    For heavy dependencies that most requests (and every startup) can do
+    without, such as httpx until the first Zoom call. `except module.Error`
+    clauses are fine; annotations evaluated at def time are not, so quote them.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
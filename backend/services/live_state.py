@@ -0,0 +1,149 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta
+import os
+from config.database import Meeting, ParticipantEvent
+from services.coordination import coordinator
+from services.meeting_service import meeting_service
+
+# Meetings without an end time older than this are not considered live on rebuild
+LIVE_STATE_MAX_AGE_HOURS = int(os.getenv("LIVE_STATE_MAX_AGE_HOURS", "24"))
+
+
+class LiveMeeting:
+    __slots__ = ("meeting_id", "topic", "started_at", "roster")
+
+    def __init__(self, meeting_id: str, topic: Optional[str], started_at: Optional[datetime]):
+        self.meeting_id = meeting_id
+        self.topic = topic
+        self.started_at = started_at
+        # participant key -> attendee info, in join order
+        self.roster: Dict[str, Dict] = {}
+
+    def summary(self) -> Dict:
+        return {
+            "meeting_id": self.meeting_id,
+            "topic": self.topic,
+            "started_at": self.started_at,
+            "live_count": len(self.roster)
+        }
+
+
+class LiveStateStore:
+    """Who is in each in-progress meeting right now.
+
+    Maintained by the meeting/participant webhook handlers; every lookup is a
+    dict access, so roster and live-count queries never touch the database.
+    """
+
+    def __init__(self):
+        self._meetings: Dict[str, LiveMeeting] = {}
+
+    def meeting_started(self, meeting_id: str, topic: Optional[str] = None,
+                        started_at: Optional[datetime] = None) -> LiveMeeting:
+        """Start tracking a meeting (idempotent)"""
+        coordinator.publish("live.meeting_started", meeting_id, topic, started_at)
+        return self._meeting_started(meeting_id, topic, started_at)
+
+    def participant_joined(self, meeting_id: str, key: str, info: Dict):
+        """Add a participant to the room; a join for an unknown meeting starts it"""
+        coordinator.publish("live.participant_joined", meeting_id, key, info)
+        self._participant_joined(meeting_id, key, info)
+
+    def participant_left(self, meeting_id: str, key: str) -> Optional[Dict]:
+        """Remove a participant from the room"""
+        coordinator.publish("live.participant_left", meeting_id, key)
+        return self._participant_left(meeting_id, key)
+
+    def meeting_ended(self, meeting_id: str) -> Optional[LiveMeeting]:
+        """Stop tracking a meeting and return its final state"""
+        coordinator.publish("live.meeting_ended", meeting_id)
+        return self._meeting_ended(meeting_id)
+
+    # Each change is published once by the method above, and applied in this
+    # worker (and the others) by the one below
+
+    def _meeting_started(self, meeting_id: str, topic: Optional[str] = None,
+                         started_at: Optional[datetime] = None) -> LiveMeeting:
+        meeting = self._meetings.get(meeting_id)
+        if meeting is None:
+            meeting = LiveMeeting(meeting_id, topic, started_at)
+            self._meetings[meeting_id] = meeting
+        else:
+            meeting.topic = topic or meeting.topic
+            meeting.started_at = meeting.started_at or started_at
+        return meeting
+
+    def _participant_joined(self, meeting_id: str, key: str, info: Dict):
+        meeting = self._meetings.get(meeting_id) or self._meeting_started(meeting_id)
+        meeting.roster[key] = info
+
+    def _participant_left(self, meeting_id: str, key: str) -> Optional[Dict]:
+        meeting = self._meetings.get(meeting_id)
+        if meeting is None:
+            return None
+        return meeting.roster.pop(key, None)
+
+    def _meeting_ended(self, meeting_id: str) -> Optional[LiveMeeting]:
+        return self._meetings.pop(meeting_id, None)
+
+    def is_live(self, meeting_id: str) -> bool:
+        return meeting_id in self._meetings
+
+    def count(self, meeting_id: str) -> int:
+        """Number of participants currently in the meeting"""
+        meeting = self._meetings.get(meeting_id)
+        return len(meeting.roster) if meeting else 0
+
+    def roster(self, meeting_id: str) -> List[Dict]:
+        """Participants currently in the meeting"""
+        meeting = self._meetings.get(meeting_id)
+        return list(meeting.roster.values()) if meeting else []
+
+    def live_meetings(self) -> List[Dict]:
+        """Summaries of all in-progress meetings"""
+        return [meeting.summary() for meeting in self._meetings.values()]
+
+    async def rebuild(self, db: AsyncSession):
+        """Reload in-progress meetings and their rosters from the database, in this worker only"""
+        self._meetings.clear()
+        cutoff = datetime.utcnow() - timedelta(hours=LIVE_STATE_MAX_AGE_HOURS)
+
+        result = await db.execute(
+            select(Meeting.meeting_id, Meeting.topic, Meeting.start_time).where(
+                Meeting.start_time.isnot(None),
+                Meeting.start_time >= cutoff,
+                Meeting.end_time.is_(None)
+            )
+        )
+        for row in result.all():
+            self._meeting_started(row.meeting_id, row.topic, row.start_time)
+        if not self._meetings:
+            return
+
+        # Replay the not-yet-compacted join/leave log of those meetings
+        result = await db.execute(
+            select(ParticipantEvent)
+            .where(ParticipantEvent.meeting_id.in_(list(self._meetings)))
+            .order_by(ParticipantEvent.event_time, ParticipantEvent.id)
+        )
+        for event in result.scalars().all():
+            info = {
+                "user_id": event.user_id,
+                "user_name": event.user_name,
+                "user_email": event.user_email
+            }
+            key = meeting_service.person_key(info)
+            if event.event_type == "joined":
+                self._participant_joined(event.meeting_id, key, {**info, "join_time": event.event_time})
+            else:
+                self._participant_left(event.meeting_id, key)
+
+
+# Singleton instance
+live_state = LiveStateStore()
+coordinator.subscribe("live.meeting_started", live_state._meeting_started)
+coordinator.subscribe("live.participant_joined", live_state._participant_joined)
+coordinator.subscribe("live.participant_left", live_state._participant_left)
+coordinator.subscribe("live.meeting_ended", live_state._meeting_ended)
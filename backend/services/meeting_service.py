@@ -1,15 +1,58 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, update, delete, func, and_, or_
 from typing import List, Dict, Optional
-from datetime import datetime
-import httpx
-from config.database import Meeting, Participant, Recording
+from datetime import datetime, timezone
+import asyncio
+import base64
+import json
+import time
+from config.database import AsyncSessionLocal, Meeting, Participant, ParticipantEvent, ParticipantSession, Recording
 from services.zoom_service import zoom_service
+from services.people_service import people_service
+from services.transcript_service import transcript_service
+from services.response_cache import response_cache, meeting_tag, MEETINGS_LIST_TAG
+from services.metrics import SYNC_LATENCY, SYNC_COALESCED
+from services.serializers import (
+    PARTICIPANT_FIELDS,
+    serialize_meeting,
+    serialize_participant,
+    serialize_recording
+)
+from services.structured_logging import log_context, new_job_id
+from services.lazy_import import lazy_import
+import logging
 import os
 
+httpx = lazy_import("httpx")
+
+logger = logging.getLogger(__name__)
+
+PARTICIPANT_SORT_FIELDS = ["join_time", "leave_time", "duration", "user_name", "id"]
+
+# Saved file extension per Zoom recording file_type; others keep their type, lowercased
+RECORDING_FILE_EXTENSIONS = {
+    "MP4": "mp4",
+    "M4A": "m4a",
+    "TRANSCRIPT": "vtt",
+    "CC": "vtt",
+    "CHAT": "txt",
+    "TIMELINE": "json"
+}
+
+# A meeting synced this recently is served from the last sync result
+SYNC_RECENT_WINDOW_SECONDS = float(os.getenv("SYNC_RECENT_WINDOW_SECONDS", "10"))
+
 class MeetingService:
+    def __init__(self):
+        # meeting_id -> task of the sync currently running for it
+        self._inflight_syncs: Dict[str, asyncio.Task] = {}
+        # meeting_id -> (monotonic finish time, result) of the last sync
+        self._recent_syncs: Dict[str, tuple] = {}
+
     async def store_meeting(self, db: AsyncSession, meeting_data: Dict) -> Meeting:
         """Store or update meeting data"""
+        # Webhook and API payloads carry ISO-8601 strings
+        self._coerce_datetimes(meeting_data, ("start_time", "end_time"))
         result = await db.execute(
             select(Meeting).where(Meeting.meeting_id == meeting_data["meeting_id"])
         )
@@ -27,22 +70,13 @@ class MeetingService:
             db.add(meeting)
 
         await db.commit()
+        response_cache.invalidate(meeting_tag(meeting.meeting_id), MEETINGS_LIST_TAG)
         await db.refresh(meeting)
         return meeting
 
     async def store_participant(self, db: AsyncSession, participant_data: Dict) -> Participant:
         """Store or update participant data"""
-        # Calculate duration if both join and leave times are available
-        if participant_data.get("join_time") and participant_data.get("leave_time"):
-            join = participant_data["join_time"]
-            leave = participant_data["leave_time"]
-            if isinstance(join, str):
-                join = datetime.fromisoformat(join.replace("Z", "+00:00"))
-            if isinstance(leave, str):
-                leave = datetime.fromisoformat(leave.replace("Z", "+00:00"))
-            duration = int((leave - join).total_seconds())
-            participant_data["duration"] = duration
-
+        self._coerce_datetimes(participant_data, ("join_time", "leave_time"))
         result = await db.execute(
             select(Participant).where(
                 Participant.meeting_id == participant_data["meeting_id"],
@@ -61,7 +95,20 @@ class MeetingService:
             participant = Participant(**participant_data)
             db.add(participant)
 
+        # Link to the directory before the row is flushed, so it's inserted once
+        info = self._participant_info(participant)
+        with db.no_autoflush:
+            person_ids = await people_service.resolve_people(db, [info])
+        participant.person_id = person_ids.get(people_service.directory_key(info), participant.person_id)
+
+        # Calculate duration once both join and leave times are known; a leave
+        # event only carries leave_time, so use the stored join_time
+        if participant.join_time and participant.leave_time and "duration" not in participant_data:
+            participant.duration = max(0, int((participant.leave_time - participant.join_time).total_seconds()))
+
+        await self._bump_version(db, participant_data["meeting_id"], Meeting.participants_version)
         await db.commit()
+        response_cache.invalidate(meeting_tag(participant_data["meeting_id"]))
         await db.refresh(participant)
         return participant
 
@@ -76,23 +123,33 @@ class MeetingService:
             participants = []
 
             if not participants_data:
-                print(f"Note: No participant data available for meeting {meeting_id}. This may require a paid Zoom account.")
+                logger.info("No participant data available for meeting %s; this may require a paid Zoom account", meeting_id,
+                            extra={"throttle": True})
                 return []
 
+            # Zoom lists each join-to-leave interval as its own entry
+            people = {}
             for p_data in participants_data:
-                participant_data = {
-                    "meeting_id": meeting_id,
+                info = {
                     "user_id": p_data.get("user_id") or p_data.get("id"),
                     "user_name": p_data.get("name") or p_data.get("user_name"),
                     "user_email": p_data.get("user_email") or p_data.get("email"),
-                    "join_time": self._parse_datetime(p_data.get("join_time")),
-                    "leave_time": self._parse_datetime(p_data.get("leave_time")),
                     "device": p_data.get("device") or (", ".join(p_data.get("devices", [])) if isinstance(p_data.get("devices"), list) else None),
                     "ip_address": p_data.get("ip_address"),
                     "location": p_data.get("location")
                 }
-                participant = await self.store_participant(db, participant_data)
-                participants.append(participant)
+                session = {
+                    "join_time": self._parse_datetime(p_data.get("join_time")),
+                    "leave_time": self._parse_datetime(p_data.get("leave_time"))
+                }
+                self._coerce_datetimes(session, ("join_time", "leave_time"))
+                person = people.setdefault(self.person_key(info), {"info": {}, "sessions": []})
+                person["info"].update({k: v for k, v in info.items() if v is not None})
+                person["sessions"].append((session["join_time"], session["leave_time"]))
+
+            participants = await self._store_sessions(db, meeting_id, people)
+            await db.commit()
+            response_cache.invalidate(meeting_tag(meeting_id))
 
             # Update participant count
             await self.update_participant_count(db, meeting_id)
@@ -100,16 +157,320 @@ class MeetingService:
             return participants
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
-                print(f"Meeting {meeting_id} not found or not accessible. It might be an instant meeting or you may not have permission.")
+                logger.info("Meeting %s not found or not accessible; it might be an instant meeting or you may not have permission",
+                            meeting_id, extra={"throttle": True})
                 return []  # Return empty list instead of raising error
             elif e.response.status_code == 403 or "Paid" in str(e.response.text) or "ZMP" in str(e.response.text):
-                print(f"Free account limitation: Past meeting participants require a paid Zoom account.")
+                logger.info("Free account limitation: past meeting participants require a paid Zoom account",
+                            extra={"throttle": True})
                 return []  # Return empty list for free accounts
             raise
         except Exception as e:
-            print(f"Error syncing participants: {e}")
+            logger.error("Error syncing participants of meeting %s: %s", meeting_id, e)
             raise
 
+    async def sync_meeting(
+        self,
+        meeting_id: str,
+        fetch_details: bool = True,
+        force: bool = False
+    ) -> Dict:
+        """Sync a meeting, its participants and recordings from Zoom.
+
+        Concurrent calls for the same meeting share one in-flight run and its
+        result. The run is a task with its own session, so a caller that goes
+        away (a disconnected client) doesn't cancel it for the others. A
+        result younger than SYNC_RECENT_WINDOW_SECONDS is returned as-is
+        unless force is set.
+        """
+        if not force:
+            recent = self._recent_syncs.get(meeting_id)
+            if recent and time.monotonic() - recent[0] < SYNC_RECENT_WINDOW_SECONDS:
+                SYNC_COALESCED.inc(reason="recent")
+                return {**recent[1], "cached": True}
+
+        inflight = self._inflight_syncs.get(meeting_id)
+        if inflight is not None:
+            SYNC_COALESCED.inc(reason="inflight")
+            return {**await asyncio.shield(inflight), "cached": True}
+
+        task = asyncio.create_task(self._sync_detached(meeting_id, fetch_details))
+        self._inflight_syncs[meeting_id] = task
+        # Retrieved here in case every caller went away before it failed
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        return await asyncio.shield(task)
+
+    async def _sync_detached(self, meeting_id: str, fetch_details: bool) -> Dict:
+        started = time.perf_counter()
+        try:
+            with log_context(meeting_id=meeting_id, job_id=new_job_id("sync")):
+                async with AsyncSessionLocal() as db:
+                    result = await self._run_sync(db, meeting_id, fetch_details)
+        except Exception:
+            SYNC_LATENCY.observe(time.perf_counter() - started, outcome="error")
+            raise
+        else:
+            SYNC_LATENCY.observe(time.perf_counter() - started, outcome="ok")
+            self._remember_sync(meeting_id, result)
+            return result
+        finally:
+            self._inflight_syncs.pop(meeting_id, None)
+
+    async def _run_sync(self, db: AsyncSession, meeting_id: str, fetch_details: bool) -> Dict:
+        """One full sync of a meeting from Zoom"""
+        if fetch_details:
+            meeting_data = await zoom_service.get_meeting_details(meeting_id, db)
+            meeting = await self.store_meeting(db, {
+                "meeting_id": meeting_id,
+                "topic": meeting_data.get("topic"),
+                "start_time": meeting_data.get("start_time"),
+                "host_email": meeting_data.get("host_email")
+            })
+        else:
+            result = await db.execute(select(Meeting).where(Meeting.meeting_id == meeting_id))
+            meeting = result.scalar_one_or_none()
+
+        participants = await self.sync_meeting_participants(db, meeting_id)
+        recordings = await self.sync_meeting_recordings(db, meeting_id)
+        return {
+            "meeting": meeting,
+            "participants": participants,
+            "recordings": recordings,
+            "cached": False
+        }
+
+    def _remember_sync(self, meeting_id: str, result: Dict):
+        """Keep a sync result for the recent-sync window, pruning expired ones"""
+        now = time.monotonic()
+        expired = [
+            key for key, (finished, _) in self._recent_syncs.items()
+            if now - finished >= SYNC_RECENT_WINDOW_SECONDS
+        ]
+        for key in expired:
+            del self._recent_syncs[key]
+        self._recent_syncs[meeting_id] = (now, result)
+
+    async def record_participant_event(self, db: AsyncSession, event_data: Dict) -> ParticipantEvent:
+        """Append a join/leave event and fold the person's log into their
+        sessions and participant row, so a running meeting shows who attended.
+
+        The person's whole log is folded again rather than patching the open
+        session, so a rejoin or a leave delivered before its join comes out
+        the same as when the meeting ends.
+        """
+        self._coerce_datetimes(event_data, ("event_time",))
+        event = ParticipantEvent(**event_data)
+        db.add(event)
+        await db.flush()
+
+        key = self.person_key(self._participant_info(event))
+        result = await db.execute(
+            select(ParticipantEvent)
+            .where(ParticipantEvent.meeting_id == event.meeting_id, self._matches_person(ParticipantEvent, key))
+            .order_by(ParticipantEvent.event_time, ParticipantEvent.id)
+        )
+        people = self._fold_events(result.scalars().all(), None)
+        await self._store_sessions(db, event.meeting_id, people, replace_all=False)
+        await db.commit()
+        response_cache.invalidate(meeting_tag(event.meeting_id))
+        await self.update_participant_count(db, event.meeting_id)
+        return event
+
+    async def compact_participant_events(
+        self,
+        db: AsyncSession,
+        meeting_id: str,
+        end_time: Optional[datetime] = None
+    ) -> List[Participant]:
+        """Fold a meeting's event log into sessions and per-person participant rows.
+
+        Sessions still open are closed at end_time. Compacted events are deleted
+        in the same transaction.
+        """
+        result = await db.execute(
+            select(ParticipantEvent)
+            .where(ParticipantEvent.meeting_id == meeting_id)
+            .order_by(ParticipantEvent.event_time, ParticipantEvent.id)
+        )
+        events = result.scalars().all()
+        if not events:
+            return []
+
+        people = self._fold_events(events, end_time)
+        participants = await self._store_sessions(db, meeting_id, people)
+        await db.execute(
+            delete(ParticipantEvent).where(
+                ParticipantEvent.meeting_id == meeting_id,
+                ParticipantEvent.id.in_([e.id for e in events])
+            )
+        )
+        await db.commit()
+        response_cache.invalidate(meeting_tag(meeting_id))
+        await self.update_participant_count(db, meeting_id)
+        return participants
+
+    async def get_participant_sessions(self, db: AsyncSession, meeting_id: str) -> List[ParticipantSession]:
+        """Get every join-to-leave interval recorded for a meeting"""
+        result = await db.execute(
+            select(ParticipantSession)
+            .where(ParticipantSession.meeting_id == meeting_id)
+            .order_by(ParticipantSession.join_time, ParticipantSession.id)
+        )
+        return result.scalars().all()
+
+    def _fold_events(self, events: List[ParticipantEvent], end_time: Optional[datetime]) -> Dict:
+        """Pair joins with leaves per person, in event-time order"""
+        if isinstance(end_time, datetime) and end_time.tzinfo is not None:
+            end_time = end_time.astimezone(timezone.utc).replace(tzinfo=None)
+
+        people = {}
+        open_joins = {}
+        for event in events:
+            info = {
+                "user_id": event.user_id,
+                "user_name": event.user_name,
+                "user_email": event.user_email,
+                "ip_address": event.ip_address,
+                "location": event.location
+            }
+            key = self.person_key(info)
+            person = people.setdefault(key, {"info": {}, "sessions": []})
+            person["info"].update({k: v for k, v in info.items() if v is not None})
+
+            if event.event_type == "joined":
+                # A repeated join without a leave continues the open session
+                open_joins.setdefault(key, event.event_time)
+            elif key in open_joins:
+                person["sessions"].append((open_joins.pop(key), event.event_time))
+            else:
+                # Leave without a recorded join (e.g. joined before webhooks were set up)
+                person["sessions"].append((None, event.event_time))
+
+        for key, join_time in open_joins.items():
+            people[key]["sessions"].append((join_time, end_time))
+        return people
+
+    async def _store_sessions(
+        self,
+        db: AsyncSession,
+        meeting_id: str,
+        people: Dict,
+        replace_all: bool = True
+    ) -> List[Participant]:
+        """Replace a meeting's sessions and upsert one participant row per person.
+
+        The participant row spans first join to last leave and its duration is
+        the sum of the session durations. Without replace_all only the sessions
+        of the people given are replaced. The caller commits.
+        """
+        replaced = delete(ParticipantSession).where(ParticipantSession.meeting_id == meeting_id)
+        if not replace_all:
+            replaced = replaced.where(or_(*[self._matches_person(ParticipantSession, key) for key in people]))
+        await db.execute(replaced)
+
+        result = await db.execute(
+            select(Participant).where(
+                Participant.meeting_id == meeting_id,
+                or_(*[self._matches_person(Participant, key) for key in people])
+            )
+        )
+        existing = {self.person_key(self._participant_info(p)): p for p in result.scalars().all()}
+        person_ids = await people_service.resolve_people(db, [person["info"] for person in people.values()])
+
+        participants = []
+        for key, person in people.items():
+            info = person["info"]
+            total = 0
+            for join_time, leave_time in person["sessions"]:
+                duration = None
+                if join_time and leave_time:
+                    duration = max(0, int((leave_time - join_time).total_seconds()))
+                    total += duration
+                db.add(ParticipantSession(
+                    meeting_id=meeting_id,
+                    user_id=info.get("user_id"),
+                    user_name=info.get("user_name"),
+                    user_email=info.get("user_email"),
+                    join_time=join_time,
+                    leave_time=leave_time,
+                    duration=duration
+                ))
+
+            joins = [j for j, _ in person["sessions"] if j]
+            leaves = [l for _, l in person["sessions"] if l]
+            still_open = any(l is None for _, l in person["sessions"])
+            values = {
+                **info,
+                "join_time": min(joins) if joins else None,
+                "leave_time": None if still_open or not leaves else max(leaves),
+                "duration": total if leaves else None,
+                "person_id": person_ids.get(people_service.directory_key(info))
+            }
+
+            participant = existing.get(key)
+            if participant:
+                for field, value in values.items():
+                    setattr(participant, field, value)
+            else:
+                participant = Participant(meeting_id=meeting_id, **values)
+                db.add(participant)
+            participants.append(participant)
+
+        await self._bump_version(db, meeting_id, Meeting.participants_version)
+        return participants
+
+    def person_key(self, info: Dict) -> Optional[str]:
+        """Identity used to group a person's sessions within one meeting"""
+        return info.get("user_id") or info.get("user_email") or info.get("user_name")
+
+    def _matches_person(self, model, key: Optional[str]):
+        """SQL condition for rows of model whose person_key is key"""
+        column = func.coalesce(
+            func.nullif(model.user_id, ""), func.nullif(model.user_email, ""), func.nullif(model.user_name, "")
+        )
+        return column.is_(None) if key is None else column == key
+
+    def _participant_info(self, participant: Participant) -> Dict:
+        return {
+            "user_id": participant.user_id,
+            "user_name": participant.user_name,
+            "user_email": participant.user_email
+        }
+
+    async def close_open_participants(
+        self,
+        db: AsyncSession,
+        meeting_id: str,
+        end_time: Optional[datetime]
+    ) -> int:
+        """Set leave time and duration on sessions still open when a meeting ends"""
+        if isinstance(end_time, str):
+            end_time = self._parse_datetime(end_time)
+        end_time = end_time or datetime.utcnow()
+        # Stored datetimes are naive UTC
+        if end_time.tzinfo is not None:
+            end_time = end_time.replace(tzinfo=None)
+
+        result = await db.execute(
+            select(Participant).where(
+                Participant.meeting_id == meeting_id,
+                Participant.leave_time.is_(None)
+            )
+        )
+        participants = result.scalars().all()
+        if not participants:
+            return 0
+
+        for participant in participants:
+            participant.leave_time = end_time
+            if participant.join_time:
+                participant.duration = max(0, int((end_time - participant.join_time).total_seconds()))
+
+        await self._bump_version(db, meeting_id, Meeting.participants_version)
+        await db.commit()
+        response_cache.invalidate(meeting_tag(meeting_id))
+        return len(participants)
+
     async def update_participant_count(self, db: AsyncSession, meeting_id: str) -> int:
         """Update participant count for a meeting"""
         result = await db.execute(
@@ -126,6 +487,7 @@ class MeetingService:
             meeting.participant_count = count
             meeting.updated_at = datetime.utcnow()
             await db.commit()
+            response_cache.invalidate(meeting_tag(meeting_id), MEETINGS_LIST_TAG)
 
         return count
 
@@ -143,41 +505,196 @@ class MeetingService:
         if not meeting:
             return None
 
-        # Get participants
+        # Get participants as plain column rows; hydrating ORM objects is the
+        # dominant cost for large meetings
         result = await db.execute(
-            select(Participant)
+            select(*self._participant_columns())
             .where(Participant.meeting_id == meeting_id)
             .order_by(Participant.join_time)
         )
-        participants = result.scalars().all()
+
+        details = serialize_meeting(meeting)
+        details["participants"] = [serialize_participant(p) for p in result.all()]
+        return details
+
+    async def get_meetings_batch(
+        self,
+        db: AsyncSession,
+        meeting_ids: List[str],
+        include: Optional[List[str]] = None
+    ) -> Dict:
+        """Get several meetings and their related data with one query per relation"""
+        include = set(include or [])
+        meeting_ids = list(dict.fromkeys(meeting_ids))
+
+        result = await db.execute(
+            select(Meeting).where(Meeting.meeting_id.in_(meeting_ids))
+        )
+        meetings = {m.meeting_id: serialize_meeting(m) for m in result.scalars().all()}
+        found_ids = list(meetings)
+
+        if "participants" in include:
+            for details in meetings.values():
+                details["participants"] = []
+            if found_ids:
+                result = await db.execute(
+                    select(Participant.meeting_id, *self._participant_columns())
+                    .where(Participant.meeting_id.in_(found_ids))
+                    .order_by(Participant.meeting_id, Participant.join_time)
+                )
+                for p in result.all():
+                    meetings[p.meeting_id]["participants"].append(serialize_participant(p))
+
+        if "stats" in include:
+            for details in meetings.values():
+                details["stats"] = self._stats_to_dict(None)
+            if found_ids:
+                result = await db.execute(
+                    self._stats_query()
+                    .add_columns(Participant.meeting_id)
+                    .where(Participant.meeting_id.in_(found_ids))
+                    .group_by(Participant.meeting_id)
+                )
+                for stats in result.all():
+                    meetings[stats.meeting_id]["stats"] = self._stats_to_dict(stats)
+
+        if "recordings" in include:
+            for details in meetings.values():
+                details["recordings"] = []
+            if found_ids:
+                result = await db.execute(
+                    select(Recording)
+                    .where(Recording.meeting_id.in_(found_ids))
+                    .order_by(Recording.meeting_id, Recording.recording_start)
+                )
+                for r in result.scalars().all():
+                    meetings[r.meeting_id]["recordings"].append(serialize_recording(r))
 
         return {
-            "id": meeting.id,
-            "meeting_id": meeting.meeting_id,
-            "topic": meeting.topic,
-            "start_time": meeting.start_time.isoformat() if meeting.start_time else None,
-            "end_time": meeting.end_time.isoformat() if meeting.end_time else None,
-            "duration": meeting.duration,
-            "participant_count": meeting.participant_count,
-            "host_email": meeting.host_email,
-            "created_at": meeting.created_at.isoformat() if meeting.created_at else None,
-            "participants": [
-                {
-                    "id": p.id,
-                    "user_id": p.user_id,
-                    "user_name": p.user_name,
-                    "user_email": p.user_email,
-                    "join_time": p.join_time.isoformat() if p.join_time else None,
-                    "leave_time": p.leave_time.isoformat() if p.leave_time else None,
-                    "duration": p.duration,
-                    "device": p.device,
-                    "ip_address": p.ip_address,
-                    "location": p.location
-                }
-                for p in participants
-            ]
+            "meetings": [meetings[m] for m in meeting_ids if m in meetings],
+            "not_found": [m for m in meeting_ids if m not in meetings]
         }
 
+    async def list_participants(
+        self,
+        db: AsyncSession,
+        meeting_id: str,
+        fields: Optional[List[str]] = None,
+        sort: str = "join_time",
+        order: str = "asc",
+        limit: Optional[int] = 100,
+        cursor: Optional[str] = None
+    ) -> Optional[Dict]:
+        """Get one keyset-paginated page of a meeting's participants, or all of them when limit is None"""
+        # The rollup on the meeting row doubles as the existence check
+        result = await db.execute(
+            select(Meeting.id, Meeting.participant_count).where(Meeting.meeting_id == meeting_id)
+        )
+        meeting = result.first()
+        if not meeting:
+            return None
+
+        fields = fields or PARTICIPANT_FIELDS
+        sort_column = getattr(Participant, sort)
+        descending = order == "desc"
+        selected = list(dict.fromkeys(fields + [sort, "id"]))
+
+        query = select(*[getattr(Participant, f) for f in selected]).where(
+            Participant.meeting_id == meeting_id
+        )
+        if cursor:
+            after_value, after_id = self._decode_cursor(cursor, sort)
+            query = query.where(
+                self._keyset_condition(sort_column, after_value, after_id, descending)
+            )
+        if descending:
+            query = query.order_by(sort_column.desc(), Participant.id.desc())
+        else:
+            query = query.order_by(sort_column.asc(), Participant.id.asc())
+
+        if limit is None:
+            rows = (await db.execute(query)).mappings().all()
+            has_more = False
+        else:
+            # Fetch one extra row to learn whether another page exists
+            result = await db.execute(query.limit(limit + 1))
+            rows = result.mappings().all()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+
+        next_cursor = None
+        if has_more and rows:
+            last = rows[-1]
+            next_cursor = self._encode_cursor(last[sort], last["id"])
+
+        return {
+            "participants": [{field: row[field] for field in fields} for row in rows],
+            "total": meeting.participant_count or 0,
+            "limit": limit,
+            "next_cursor": next_cursor
+        }
+
+    def _keyset_condition(self, column, after_value, after_id: int, descending: bool):
+        """Rows strictly after (after_value, after_id) in the listing order.
+
+        SQLite sorts NULLs first ascending and last descending.
+        """
+        if descending:
+            if after_value is None:
+                return and_(column.is_(None), Participant.id < after_id)
+            return or_(
+                column < after_value,
+                and_(column == after_value, Participant.id < after_id),
+                column.is_(None)
+            )
+        if after_value is None:
+            return or_(
+                and_(column.is_(None), Participant.id > after_id),
+                column.isnot(None)
+            )
+        return or_(
+            column > after_value,
+            and_(column == after_value, Participant.id > after_id)
+        )
+
+    def _encode_cursor(self, value, row_id: int) -> str:
+        """Encode the last row's sort key as an opaque cursor"""
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        raw = json.dumps([value, row_id]).encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    def _decode_cursor(self, cursor: str, sort: str):
+        """Decode a cursor produced by _encode_cursor"""
+        try:
+            value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            # A well-formed cursor can still hold the wrong types, e.g. [5, 1] for join_time
+            if value is not None and sort in ("join_time", "leave_time"):
+                value = datetime.fromisoformat(value)
+            return value, int(row_id)
+        except Exception:
+            raise ValueError("Invalid cursor")
+
+    async def get_meeting_versions(self, db: AsyncSession, meeting_id: str):
+        """Get the columns that identify the current state of a meeting's resources"""
+        result = await db.execute(
+            select(
+                Meeting.id,
+                Meeting.updated_at,
+                Meeting.participants_version,
+                Meeting.recordings_version
+            ).where(Meeting.meeting_id == meeting_id)
+        )
+        return result.first()
+
+    async def _bump_version(self, db: AsyncSession, meeting_id: str, column):
+        """Increment a meeting version counter without touching updated_at"""
+        await db.execute(
+            update(Meeting)
+            .where(Meeting.meeting_id == meeting_id)
+            .values({column: func.coalesce(column, 0) + 1, Meeting.updated_at: Meeting.updated_at})
+        )
+
     async def get_all_meetings(
         self, 
         db: AsyncSession, 
@@ -200,18 +717,30 @@ class MeetingService:
     ) -> Dict:
         """Get participant statistics"""
         result = await db.execute(
-            select(
-                func.count(Participant.id).label("total_participants"),
-                func.avg(Participant.duration).label("avg_duration"),
-                func.min(Participant.duration).label("min_duration"),
-                func.max(Participant.duration).label("max_duration"),
-                func.sum(Participant.duration).label("total_duration")
-            ).where(
-                Participant.meeting_id == meeting_id,
-                Participant.duration.isnot(None)
-            )
+            self._stats_query().where(Participant.meeting_id == meeting_id)
         )
-        stats = result.first()
+        return self._stats_to_dict(result.first())
+
+    def _stats_query(self):
+        """Aggregate participant durations; callers add the meeting filter"""
+        return select(
+            func.count(Participant.id).label("total_participants"),
+            func.avg(Participant.duration).label("avg_duration"),
+            func.min(Participant.duration).label("min_duration"),
+            func.max(Participant.duration).label("max_duration"),
+            func.sum(Participant.duration).label("total_duration")
+        ).where(Participant.duration.isnot(None))
+
+    def _stats_to_dict(self, stats) -> Dict:
+        """Format an aggregate row from _stats_query"""
+        if stats is None:
+            return {
+                "total_participants": 0,
+                "avg_duration": 0,
+                "min_duration": 0,
+                "max_duration": 0,
+                "total_duration": 0
+            }
         return {
             "total_participants": stats.total_participants or 0,
             "avg_duration": float(stats.avg_duration) if stats.avg_duration else 0,
@@ -237,6 +766,7 @@ class MeetingService:
             recording = Recording(**recording_data)
             db.add(recording)
 
+        await self._bump_version(db, recording_data["meeting_id"], Meeting.recordings_version)
         await db.commit()
         await db.refresh(recording)
         return recording
@@ -291,10 +821,8 @@ class MeetingService:
         recordings_dir = os.path.join("recordings", meeting_id)
         os.makedirs(recordings_dir, exist_ok=True)
 
-        file_extension = {
-            "MP4": "mp4",
-            "M4A": "m4a"
-        }.get(recording.file_type, "txt")
+        file_type = recording.file_type or "bin"
+        file_extension = RECORDING_FILE_EXTENSIONS.get(file_type, file_type.lower())
 
         file_path = os.path.join(recordings_dir, f"{recording_id}.{file_extension}")
 
@@ -304,7 +832,12 @@ class MeetingService:
         # Update database
         recording.file_path = file_path
         recording.status = "downloaded"
+        # Transcripts and chat logs are parsed in the background
+        queued = transcript_service.queue(recording)
+        await self._bump_version(db, meeting_id, Meeting.recordings_version)
         await db.commit()
+        if queued:
+            transcript_service.wake()
 
         return file_path
 
@@ -321,6 +854,22 @@ class MeetingService:
         )
         return result.scalars().all()
 
+    def _participant_columns(self):
+        """Participant columns read for API responses"""
+        return [getattr(Participant, field) for field in PARTICIPANT_FIELDS]
+
+    def _coerce_datetimes(self, data: Dict, fields):
+        """Parse ISO-8601 string values of the given fields in place as naive UTC,
+        the form SQLite hands back"""
+        for field in fields:
+            value = data.get(field)
+            if isinstance(value, str):
+                value = self._parse_datetime(value)
+            if isinstance(value, datetime) and value.tzinfo is not None:
+                value = value.astimezone(timezone.utc).replace(tzinfo=None)
+            if field in data:
+                data[field] = value
+
     def _parse_datetime(self, dt_string: Optional[str]) -> Optional[datetime]:
         """Parse datetime string to datetime object"""
         if not dt_string:
@@ -0,0 +1,253 @@
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+import threading
+import time
+from sqlalchemy import event
+
+# Prometheus text exposition format served by GET /metrics
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+DOWNLOAD_SECONDS_BUCKETS = (1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0)
+THROUGHPUT_BUCKETS = (1e5, 5e5, 1e6, 5e6, 1e7, 5e7, 1e8)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic count per label set"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        # Unlabelled metrics report zero before their first increment
+        self._values: Dict[Tuple[str, ...], float] = {} if self.labelnames else {(): 0}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(str(labels[name]) for name in self.labelnames), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(values)
+        ]
+
+
+class Histogram:
+    """Bucketed observations per label set, exposed cumulatively with _sum and _count"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (+Inf last), sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+        if not self.labelnames:
+            self._values[()] = [[0] * (len(self.buckets) + 1), 0.0]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def count(self, **labels) -> int:
+        state = self._values.get(tuple(str(labels[name]) for name in self.labelnames))
+        return sum(state[0]) if state else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        lines = []
+        for key, counts, total in sorted(values):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide metrics, rendered in the Prometheus text format.
+
+    Values live in memory and reset on restart; with several workers each
+    process reports its own series.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> bytes:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return ("\n".join(lines) + "\n").encode()
+
+
+# Singleton instance
+metrics = MetricsRegistry()
+
+HTTP_REQUESTS = metrics.counter(
+    "http_requests_total", "HTTP requests by route template, method and status", ("route", "method", "status")
+)
+HTTP_LATENCY = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency until the response is complete", ("route", "method")
+)
+SQL_LATENCY = metrics.histogram(
+    "sql_statement_duration_seconds", "SQL statement execution time by statement type", ("statement",), SQL_BUCKETS
+)
+ZOOM_LATENCY = metrics.histogram(
+    "zoom_api_request_duration_seconds", "Zoom API call latency by endpoint class and status", ("endpoint", "status")
+)
+ZOOM_RATE_LIMITED = metrics.counter(
+    "zoom_api_rate_limited_total", "Zoom API responses with status 429 by endpoint class", ("endpoint",)
+)
+ZOOM_RETRIES = metrics.counter(
+    "zoom_api_retries_total", "Zoom API calls retried after a 429 by endpoint class", ("endpoint",)
+)
+ZOOM_CIRCUIT_TRANSITIONS = metrics.counter(
+    "zoom_circuit_transitions_total", "Circuit breaker state changes by endpoint class and new state", ("endpoint", "state")
+)
+ZOOM_CIRCUIT_REJECTED = metrics.counter(
+    "zoom_circuit_rejected_total", "Zoom API calls failed fast by an open circuit, by endpoint class", ("endpoint",)
+)
+ZOOM_STALE_RESPONSES = metrics.counter(
+    "zoom_stale_responses_total", "Reads answered with the last good Zoom response, by endpoint class and reason",
+    ("endpoint", "reason")
+)
+SYNC_LATENCY = metrics.histogram(
+    "meeting_sync_duration_seconds", "Full meeting syncs from Zoom by outcome", ("outcome",)
+)
+SYNC_COALESCED = metrics.counter(
+    "meeting_sync_coalesced_total", "Sync requests served by a running or recent sync", ("reason",)
+)
+WEBHOOK_EVENTS = metrics.counter(
+    "webhook_events_total", "Zoom webhook events received by type and outcome", ("event", "outcome")
+)
+WEBHOOK_LATENCY = metrics.histogram(
+    "webhook_event_duration_seconds", "Webhook handling time by event type", ("event",)
+)
+DOWNLOAD_BYTES = metrics.counter(
+    "recording_download_bytes_total", "Recording bytes downloaded from Zoom"
+)
+DOWNLOAD_LATENCY = metrics.histogram(
+    "recording_download_duration_seconds", "Recording download time", (), DOWNLOAD_SECONDS_BUCKETS
+)
+DOWNLOAD_THROUGHPUT = metrics.histogram(
+    "recording_download_bytes_per_second", "Average throughput of each recording download", (), THROUGHPUT_BUCKETS
+)
+TRANSCRIPT_PARSE_LATENCY = metrics.histogram(
+    "transcript_parse_duration_seconds", "Parsing one transcript or chat file in the pool, by kind and outcome",
+    ("kind", "outcome")
+)
+TRANSCRIPT_SEGMENTS = metrics.counter(
+    "transcript_segments_total", "Transcript cues and chat messages stored, by kind", ("kind",)
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording HTTP_REQUESTS and HTTP_LATENCY.
+
+    Requests are labelled with the matched route template ("/api/meetings/{meeting_id}")
+    so meeting ids don't create a series each; unmatched paths share one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            route = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUESTS.inc(route=route, method=scope["method"], status=status)
+            HTTP_LATENCY.observe(time.perf_counter() - started, route=route, method=scope["method"])
+
+
+def instrument_engine(engine):
+    """Time every statement run through an (async) engine into SQL_LATENCY"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["metrics_started"].pop()
+        verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+        SQL_LATENCY.observe(time.perf_counter() - started, statement=verb)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(context):
+        # after_cursor_execute is skipped for failed statements
+        started = context.connection.info.get("metrics_started") if context.connection is not None else None
+        if started:
+            started.pop()
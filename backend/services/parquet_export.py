@@ -0,0 +1,215 @@
+from sqlalchemy import select, func, DateTime, Integer
+from typing import Dict, Optional
+from datetime import datetime
+from pathlib import Path
+import asyncio
+import json
+import os
+import time
+from config.database import AsyncSessionLocal, Meeting, Participant, Recording
+from services.export_service import (
+    MEETING_EXPORT_FIELDS,
+    PARTICIPANT_EXPORT_FIELDS,
+    RECORDING_EXPORT_FIELDS
+)
+
+PARQUET_EXPORT_DIR = os.getenv("PARQUET_EXPORT_DIR", "./data/parquet")
+PARQUET_CHUNK_SIZE = int(os.getenv("PARQUET_CHUNK_SIZE", "5000"))
+WATERMARK_FILE = "_watermark.json"
+
+# table name -> (model, exported fields, column used for month partitioning)
+EXPORT_TABLES = {
+    "meetings": (Meeting, MEETING_EXPORT_FIELDS, "start_time"),
+    "participants": (Participant, PARTICIPANT_EXPORT_FIELDS, "join_time"),
+    "recordings": (Recording, RECORDING_EXPORT_FIELDS, "recording_start"),
+}
+
+
+def _load_pyarrow():
+    """Import pyarrow lazily; it is only needed for Parquet exports"""
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Parquet export requires pyarrow. Install it with: pip install pyarrow")
+    return pyarrow
+
+
+class ParquetExportService:
+    async def export_all(
+        self,
+        output_dir: Optional[str] = None,
+        full: bool = False,
+        chunk_size: int = PARQUET_CHUNK_SIZE
+    ) -> Dict:
+        """Export every table to month-partitioned Parquet files"""
+        pa = _load_pyarrow()
+        output = Path(output_dir or PARQUET_EXPORT_DIR)
+        output.mkdir(parents=True, exist_ok=True)
+
+        watermarks = {} if full else self.load_watermarks(output)
+        # Rows changed after this instant are left for the next run
+        run_started = datetime.utcnow()
+        run_id = run_started.strftime("%Y%m%dT%H%M%S%f")
+
+        tables = {}
+        for name in EXPORT_TABLES:
+            since = watermarks.get(name)
+            tables[name] = await self.export_table(
+                pa, name, output, run_id, datetime.fromisoformat(since) if since else None,
+                run_started, chunk_size
+            )
+            watermarks[name] = run_started.isoformat()
+
+        self.save_watermarks(output, watermarks)
+        return {
+            "output_dir": str(output),
+            "incremental": not full,
+            "watermark": run_started.isoformat(),
+            "tables": tables
+        }
+
+    async def export_table(
+        self,
+        pa,
+        name: str,
+        output: Path,
+        run_id: str,
+        since: Optional[datetime],
+        until: datetime,
+        chunk_size: int
+    ) -> Dict:
+        """Export rows of one table changed in (since, until] in bounded chunks.
+
+        Earlier copies of the exported rows are then removed from older part
+        files, so each id is in exactly one file; without since every older
+        part file is removed.
+        """
+        model, fields, partition_field = EXPORT_TABLES[name]
+        schema = self._schema(pa, model, fields)
+
+        # Rows written before updated_at existed only carry created_at
+        changed_at = func.coalesce(model.updated_at, model.created_at)
+        query = select(model).where(changed_at <= until).order_by(model.id)
+        if since:
+            query = query.where(changed_at > since)
+
+        writers = {}
+        exported_ids = set()
+        rows = 0
+        started = time.perf_counter()
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await session.stream_scalars(query.execution_options(yield_per=chunk_size))
+                async for chunk in result.partitions():
+                    by_month = {}
+                    for row in chunk:
+                        month = self._partition_month(row, partition_field)
+                        by_month.setdefault(month, []).append(
+                            {field: getattr(row, field) for field in fields}
+                        )
+                    for month, month_rows in by_month.items():
+                        writer = writers.get(month)
+                        if writer is None:
+                            partition_dir = output / name / f"month={month}"
+                            partition_dir.mkdir(parents=True, exist_ok=True)
+                            writer = pa.parquet.ParquetWriter(
+                                str(partition_dir / f"part-{run_id}.parquet"), schema
+                            )
+                            writers[month] = writer
+                        table = pa.Table.from_pylist(month_rows, schema=schema)
+                        await asyncio.to_thread(writer.write_table, table)
+                    rows += len(chunk)
+                    if since:
+                        exported_ids.update(row.id for row in chunk)
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+        replaced = await asyncio.to_thread(
+            self._remove_earlier_copies, pa, output / name, run_id, exported_ids if since else None
+        )
+        elapsed = time.perf_counter() - started
+        return {
+            "rows": rows,
+            "replaced": replaced,
+            "partitions": sorted(writers),
+            "seconds": round(elapsed, 3),
+            "rows_per_sec": round(rows / elapsed, 1) if elapsed > 0 else 0
+        }
+
+    def _remove_earlier_copies(self, pa, table_dir: Path, run_id: str, ids: Optional[set]) -> int:
+        """Drop rows with the given ids (every row if None) from part files of earlier runs.
+
+        Only the id column is read to find them, and only files holding one
+        are rewritten. A row whose partition month changed is found in its old
+        month too. Returns the number of rows dropped.
+        """
+        current = f"part-{run_id}.parquet"
+        id_set = None if ids is None else pa.array(sorted(ids), pa.int64())
+        dropped = 0
+        for path in sorted(table_dir.glob("month=*/part-*.parquet")):
+            if path.name == current:
+                continue
+            if id_set is None:
+                dropped += pa.parquet.ParquetFile(path).metadata.num_rows
+                path.unlink()
+                continue
+            if not len(id_set):
+                break
+            stale = pa.compute.is_in(pa.parquet.read_table(path, columns=["id"])["id"], value_set=id_set)
+            count = pa.compute.sum(stale).as_py() or 0
+            if not count:
+                continue
+            if count == len(stale):
+                path.unlink()
+            else:
+                # Written beside the file and renamed over it, so readers never see half of it
+                kept = pa.parquet.read_table(path).filter(pa.compute.invert(stale))
+                tmp_path = path.with_suffix(".tmp")
+                pa.parquet.write_table(kept, str(tmp_path))
+                os.replace(tmp_path, path)
+            dropped += count
+        return dropped
+
+    def load_watermarks(self, output: Path) -> Dict:
+        """Read the per-table watermarks of the last export"""
+        path = output / WATERMARK_FILE
+        if not path.exists():
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def save_watermarks(self, output: Path, watermarks: Dict):
+        """Persist per-table watermarks atomically"""
+        path = output / WATERMARK_FILE
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(watermarks, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def _schema(self, pa, model, fields):
+        """Derive an Arrow schema from the model's column types"""
+        # Mapper columns include the decoded lookup attributes
+        columns = model.__mapper__.columns
+        arrow_fields = []
+        for field in fields:
+            column_type = columns[field].type
+            if isinstance(column_type, DateTime):
+                arrow_type = pa.timestamp("us")
+            elif isinstance(column_type, Integer):
+                arrow_type = pa.int64()
+            else:
+                arrow_type = pa.string()
+            arrow_fields.append(pa.field(field, arrow_type))
+        return pa.schema(arrow_fields)
+
+    def _partition_month(self, row, partition_field: str) -> str:
+        """Month partition key, falling back to created_at"""
+        value = getattr(row, partition_field) or row.created_at
+        return value.strftime("%Y-%m") if value else "unknown"
+
+
+# Singleton instance
+parquet_export_service = ParquetExportService()
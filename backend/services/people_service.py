@@ -0,0 +1,196 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy import select, insert, update, func, bindparam
+from typing import Dict, List, Optional
+from config.database import Meeting, Participant, Person
+from services.serializers import serialize_person
+
+PEOPLE_SORT_FIELDS = ["meetings_attended", "total_duration", "last_seen", "user_name"]
+
+# Keys per IN / multi-row VALUES statement, well under SQLite's variable limit
+RESOLVE_CHUNK_SIZE = 500
+
+PERSON_DETAILS = ("user_id", "user_name", "user_email")
+
+
+class PeopleService:
+    """Directory of attendees across meetings.
+
+    Participant rows point at their person; the person's totals are kept
+    current by database triggers as those rows are written.
+    """
+
+    def directory_key(self, info: Dict) -> Optional[str]:
+        """Identity of a person across meetings: email, else user id, else name"""
+        if info.get("user_email"):
+            return f"email:{info['user_email'].strip().lower()}"
+        if info.get("user_id"):
+            return f"id:{info['user_id']}"
+        if info.get("user_name"):
+            return f"name:{info['user_name'].strip()}"
+        return None
+
+    async def resolve_people(self, db: AsyncSession, infos: List[Dict]) -> Dict[str, int]:
+        """Find or create the people for attendee infos; returns directory key -> person id.
+
+        Known people are read, not rewritten: only new people are inserted, and
+        only people whose stored details differ from the infos are updated.
+        """
+        people = {}
+        for info in infos:
+            key = self.directory_key(info)
+            if key is not None:
+                details = people.setdefault(key, {})
+                details.update({field: info[field] for field in PERSON_DETAILS if info.get(field) is not None})
+        if not people:
+            return {}
+
+        keys = list(people)
+        person_ids = {}
+        for start in range(0, len(keys), RESOLVE_CHUNK_SIZE):
+            chunk = keys[start:start + RESOLVE_CHUNK_SIZE]
+            known = await self._known_people(db, chunk)
+
+            new = [key for key in chunk if key not in known]
+            if new:
+                await db.execute(self._insert_people(db), [
+                    {"person_key": key, **{field: people[key].get(field) for field in PERSON_DETAILS},
+                     "meetings_attended": 0, "total_duration": 0}
+                    for key in new
+                ])
+                known.update(await self._known_people(db, new))
+
+            # Newer details replace stored ones; a missing detail keeps the stored one
+            changed = [
+                {"key": key, **{f"new_{field}": people[key].get(field) for field in PERSON_DETAILS}}
+                for key in chunk
+                if key not in new and any(
+                    value != getattr(known[key], field) for field, value in people[key].items()
+                )
+            ]
+            if changed:
+                table = Person.__table__
+                await db.execute(
+                    update(table)
+                    .where(table.c.person_key == bindparam("key"))
+                    .values({field: func.coalesce(bindparam(f"new_{field}"), table.c[field]) for field in PERSON_DETAILS}),
+                    changed
+                )
+            person_ids.update({key: row.id for key, row in known.items()})
+        return person_ids
+
+    async def _known_people(self, db: AsyncSession, keys: List[str]) -> Dict:
+        result = await db.execute(
+            select(Person.person_key, Person.id, *[getattr(Person, field) for field in PERSON_DETAILS])
+            .where(Person.person_key.in_(keys))
+        )
+        return {row.person_key: row for row in result.all()}
+
+    def _insert_people(self, db: AsyncSession):
+        # Another worker may insert the same person first; its row is used
+        if db.bind.dialect.name != "sqlite":
+            return insert(Person.__table__)
+        return sqlite_insert(Person.__table__).on_conflict_do_nothing(index_elements=[Person.person_key])
+
+    async def backfill(self, db: AsyncSession, batch_size: int = 1000) -> int:
+        """Link participant rows written before the directory existed"""
+        linked = 0
+        last_id = 0
+        while True:
+            result = await db.execute(
+                select(Participant.id, Participant.user_id, Participant.user_name, Participant.user_email)
+                .where(Participant.person_id.is_(None), Participant.id > last_id)
+                .order_by(Participant.id)
+                .limit(batch_size)
+            )
+            rows = result.mappings().all()
+            if not rows:
+                return linked
+            last_id = rows[-1]["id"]
+
+            person_ids = await self.resolve_people(db, rows)
+            links = [
+                {"row_id": row["id"], "person_id": person_ids[key]}
+                for row in rows
+                if (key := self.directory_key(row)) is not None
+            ]
+            if links:
+                await db.execute(
+                    update(Participant.__table__)
+                    .where(Participant.__table__.c.id == bindparam("row_id"))
+                    .values(person_id=bindparam("person_id")),
+                    links
+                )
+                linked += len(links)
+            await db.commit()
+
+    async def list_people(
+        self,
+        db: AsyncSession,
+        email: Optional[str] = None,
+        sort: str = "meetings_attended",
+        order: str = "desc",
+        limit: int = 50,
+        offset: int = 0
+    ) -> List[Dict]:
+        """Get a page of the directory"""
+        query = select(Person)
+        if email:
+            # Case-insensitive through the unique directory key
+            query = query.where(Person.person_key == self.directory_key({"user_email": email}))
+        sort_column = getattr(Person, sort)
+        if order == "desc":
+            query = query.order_by(sort_column.desc(), Person.id.desc())
+        else:
+            query = query.order_by(sort_column.asc(), Person.id.asc())
+        result = await db.execute(query.limit(limit).offset(offset))
+        return [self._person_to_dict(person) for person in result.scalars().all()]
+
+    async def get_person(self, db: AsyncSession, person_id: int) -> Optional[Dict]:
+        """Get one person with their totals"""
+        person = await db.get(Person, person_id)
+        return self._person_to_dict(person) if person else None
+
+    async def get_attendance(
+        self,
+        db: AsyncSession,
+        person_id: int,
+        limit: int = 50,
+        offset: int = 0
+    ) -> Optional[Dict]:
+        """Get the meetings a person attended, most recent first"""
+        person = await db.get(Person, person_id)
+        if not person:
+            return None
+
+        result = await db.execute(
+            select(
+                Participant.meeting_id,
+                Meeting.topic,
+                Meeting.start_time,
+                Participant.join_time,
+                Participant.leave_time,
+                Participant.duration
+            )
+            .join(Meeting, Meeting.meeting_id == Participant.meeting_id)
+            .where(Participant.person_id == person_id)
+            .order_by(Participant.join_time.desc(), Participant.id.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        return {
+            "person": self._person_to_dict(person),
+            "meetings": [dict(row) for row in result.mappings().all()],
+            "total": person.meetings_attended,
+            "limit": limit,
+            "offset": offset
+        }
+
+    def _person_to_dict(self, person: Person) -> Dict:
+        data = serialize_person(person)
+        data["total_minutes"] = round((person.total_duration or 0) / 60, 1)
+        return data
+
+
+# Singleton instance
+people_service = PeopleService()
@@ -0,0 +1,154 @@
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, Optional, Tuple
+import os
+from services.coordination import coordinator
+
+
+class CachedResponse:
+    __slots__ = ("body", "etag", "tags")
+
+    def __init__(self, body: bytes, etag: Optional[str], tags: Tuple[str, ...]):
+        self.body = body
+        self.etag = etag
+        self.tags = tags
+
+
+class ResponseCache:
+    """Bounded LRU of pre-serialized response bodies with tag-based invalidation.
+
+    Entries are tagged with the data they were built from (e.g. "meeting:123",
+    "meetings:list"); MeetingService write methods invalidate those tags after
+    committing.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024, enabled: bool = True):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._keys_by_tag: Dict[str, set] = {}
+        # Invalidation clock, and its value at each tag's latest invalidation, so a
+        # response computed from pre-write data is not stored. Only the most recent
+        # tags are remembered; _forgotten is the newest clock value dropped from them.
+        self._clock = 0
+        self._invalidated_at: "OrderedDict[str, int]" = OrderedDict()
+        self._forgotten = 0
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        """Look up a cached response and mark it recently used"""
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def generation(self, tags: Iterable[str]) -> int:
+        """Snapshot the invalidation clock before computing a response"""
+        return self._clock
+
+    def _invalidated_since(self, tags: Iterable[str], generation: int) -> bool:
+        # A tag no longer remembered may have been invalidated after the snapshot
+        return any(self._invalidated_at.get(tag, self._forgotten) > generation for tag in tags)
+
+    def set(
+        self,
+        key: Hashable,
+        body: bytes,
+        tags: Tuple[str, ...],
+        generation: int,
+        etag: Optional[str] = None
+    ):
+        """Store a response unless one of its tags was invalidated meanwhile"""
+        if not self.enabled or len(body) > self.max_bytes:
+            return
+        if self._invalidated_since(tags, generation):
+            return
+
+        self._remove(key)
+        self._entries[key] = CachedResponse(body, etag, tags)
+        self._bytes += len(body)
+        for tag in tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, *tags: str):
+        """Drop every entry built from any of the given tags, in every worker"""
+        self._invalidate(*tags)
+        coordinator.publish("cache.invalidate", *tags)
+
+    def _invalidate(self, *tags: str):
+        self._clock += 1
+        for tag in tags:
+            self._invalidated_at[tag] = self._clock
+            self._invalidated_at.move_to_end(tag)
+            for key in self._keys_by_tag.pop(tag, set()):
+                if self._remove(key):
+                    self.invalidations += 1
+        # Responses take far less time to compute than max_entries invalidations
+        while len(self._invalidated_at) > self.max_entries:
+            _, self._forgotten = self._invalidated_at.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries"""
+        self._entries.clear()
+        self._keys_by_tag.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict:
+        """Hit-rate and occupancy metrics"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions
+        }
+
+    def _remove(self, key: Hashable) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= len(entry.body)
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+        return True
+
+
+def meeting_tag(meeting_id: str) -> str:
+    """Cache tag for responses built from one meeting and its participants"""
+    return f"meeting:{meeting_id}"
+
+
+MEETINGS_LIST_TAG = "meetings:list"
+
+
+# Singleton instance
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024")),
+    max_bytes=int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    enabled=os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+)
+coordinator.subscribe("cache.invalidate", response_cache._invalidate)
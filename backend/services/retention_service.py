@@ -0,0 +1,283 @@
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy import create_engine, select, delete, func, text, bindparam
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta
+from pathlib import Path
+import asyncio
+import os
+from config.database import (
+    engine,
+    AsyncSessionLocal,
+    Base,
+    ArchivedMeeting,
+    Meeting,
+    Participant,
+    ParticipantEvent,
+    ParticipantSession,
+    Recording,
+    TranscriptSegment,
+    _upgrade_schema
+)
+from services.response_cache import response_cache, meeting_tag, MEETINGS_LIST_TAG
+from services.serializers import serialize_meeting, serialize_participant, serialize_recording
+from services.structured_logging import log_context, new_job_id
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Age limits in days per table; 0 keeps rows forever
+RETENTION_POLICIES = {
+    # Meetings move, with their participants, sessions, recordings and transcripts, to monthly archive files
+    "meetings": int(os.getenv("RETENTION_MEETINGS_DAYS", "0")),
+    # Per-session detail is deleted; the per-person participant rows stay
+    "participant_sessions": int(os.getenv("RETENTION_SESSIONS_DAYS", "0")),
+    # Join/leave events never compacted (the meeting.ended webhook was missed)
+    "participant_events": int(os.getenv("RETENTION_EVENTS_DAYS", "0")),
+}
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "./data/archive")
+# Meetings (or rows) per transaction, so each write lock is held briefly
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "200"))
+# Hours between scheduled runs; 0 runs only on demand
+RETENTION_INTERVAL_HOURS = float(os.getenv("RETENTION_INTERVAL_HOURS", "0"))
+# Free pages returned to the filesystem per run
+RETENTION_VACUUM_PAGES = int(os.getenv("RETENTION_VACUUM_PAGES", "5000"))
+
+# Tables copied to the archive, and deleted from the live database children first
+ARCHIVED_TABLES = [Meeting, Participant, ParticipantSession, Recording, TranscriptSegment]
+DELETE_ORDER = [TranscriptSegment, ParticipantEvent, ParticipantSession, Participant, Recording, Meeting]
+
+# When a meeting happened, for age and archive month. created_at is always set,
+# so every meeting has a month; the comparison with the cutoff skips any row
+# written around the ORM without one.
+_meeting_time = func.coalesce(Meeting.end_time, Meeting.start_time, Meeting.created_at)
+_meeting_month = func.strftime("%Y-%m", _meeting_time)
+
+
+class RetentionService:
+    """Ages data out of the live database.
+
+    Old meetings are moved to per-month SQLite files under ARCHIVE_DIR, which
+    are attached on demand to read them back; detail rows past their policy
+    are deleted. Everything runs in small batches so webhooks and syncs keep
+    getting the write lock.
+    """
+
+    def archive_path(self, month: str) -> Path:
+        return Path(ARCHIVE_DIR) / f"meetings-{month}.db"
+
+    async def run(self, dry_run: bool = False, vacuum: bool = True, policies: Optional[Dict] = None) -> Dict:
+        """Apply every configured policy, then reclaim free pages"""
+        policies = {**RETENTION_POLICIES, **(policies or {})}
+        now = datetime.utcnow()
+        report = {"dry_run": dry_run, "tables": {}}
+
+        days = policies["meetings"]
+        if days > 0:
+            report["tables"]["meetings"] = await self.archive_meetings(now - timedelta(days=days), dry_run)
+        days = policies["participant_sessions"]
+        if days > 0:
+            report["tables"]["participant_sessions"] = await self.purge(
+                ParticipantSession, ParticipantSession.created_at, now - timedelta(days=days), dry_run
+            )
+        days = policies["participant_events"]
+        if days > 0:
+            report["tables"]["participant_events"] = await self.purge(
+                ParticipantEvent, ParticipantEvent.created_at, now - timedelta(days=days), dry_run
+            )
+
+        if vacuum and not dry_run:
+            report["vacuum"] = await self.incremental_vacuum()
+        return report
+
+    async def archive_meetings(self, cutoff: datetime, dry_run: bool = False) -> Dict:
+        """Move meetings older than cutoff into their month's archive file"""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(_meeting_month, func.count())
+                .where(_meeting_time < cutoff)
+                .group_by(_meeting_month)
+                .order_by(_meeting_month)
+            )
+            months = dict(result.all())
+        if dry_run or not months:
+            return {"cutoff": cutoff, "months": months, "archived": 0}
+
+        archived = 0
+        for month in months:
+            archived += await self._archive_month(month, cutoff)
+        return {"cutoff": cutoff, "months": months, "archived": archived}
+
+    async def _archive_month(self, month: str, cutoff: datetime) -> int:
+        """Copy one month's old meetings into its archive file, batch by batch"""
+        path = self.archive_path(month)
+        await asyncio.to_thread(self._prepare_archive, path)
+
+        moved = 0
+        async with engine.connect() as conn:
+            # ATTACH is not allowed inside a transaction
+            await conn.exec_driver_sql("ATTACH DATABASE ? AS archive", (str(path),))
+            await conn.commit()
+            try:
+                await conn.exec_driver_sql(
+                    "INSERT OR IGNORE INTO archive.lookup_values (id, kind, value) "
+                    "SELECT id, kind, value FROM main.lookup_values"
+                )
+                await conn.commit()
+
+                while True:
+                    result = await conn.execute(
+                        select(Meeting.meeting_id)
+                        .where(_meeting_time < cutoff, _meeting_month == month)
+                        .order_by(Meeting.id)
+                        .limit(RETENTION_BATCH_SIZE)
+                    )
+                    meeting_ids = result.scalars().all()
+                    if not meeting_ids:
+                        break
+                    await self._move_batch(conn, meeting_ids, month)
+                    await conn.commit()
+                    moved += len(meeting_ids)
+                    response_cache.invalidate(MEETINGS_LIST_TAG, *[meeting_tag(m) for m in meeting_ids])
+                    # Let queued writers in between batches
+                    await asyncio.sleep(0)
+            finally:
+                await conn.rollback()
+                await conn.exec_driver_sql("DETACH DATABASE archive")
+                await conn.commit()
+        logger.info("Archived %d meetings to %s", moved, path)
+        return moved
+
+    async def _move_batch(self, conn: AsyncConnection, meeting_ids: List[str], month: str):
+        """Copy a batch of meetings and their rows to the archive, then delete them"""
+        ids = bindparam("ids", expanding=True)
+        for model in ARCHIVED_TABLES:
+            columns = ", ".join(f'"{column.name}"' for column in model.__table__.columns)
+            table = model.__tablename__
+            await conn.execute(
+                text(
+                    f"INSERT OR REPLACE INTO archive.{table} ({columns}) "
+                    f"SELECT {columns} FROM main.{table} WHERE meeting_id IN :ids"
+                ).bindparams(ids),
+                {"ids": meeting_ids}
+            )
+        now = datetime.utcnow()
+        await conn.execute(
+            text(
+                "INSERT OR REPLACE INTO archived_meetings (meeting_id, month, archived_at) "
+                "VALUES (:meeting_id, :month, :archived_at)"
+            ),
+            [{"meeting_id": m, "month": month, "archived_at": now} for m in meeting_ids]
+        )
+        for model in DELETE_ORDER:
+            await conn.execute(delete(model).where(model.meeting_id.in_(meeting_ids)))
+
+    def _prepare_archive(self, path: Path):
+        """Create or upgrade an archive file's tables"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        archive_engine = create_engine(f"sqlite:///{path}")
+        try:
+            with archive_engine.begin() as conn:
+                tables = [Base.metadata.tables["lookup_values"]] + [m.__table__ for m in ARCHIVED_TABLES]
+                Base.metadata.create_all(conn, tables=tables)
+                _upgrade_schema(conn)
+        finally:
+            archive_engine.dispose()
+
+    async def purge(self, model, column, cutoff: datetime, dry_run: bool = False) -> Dict:
+        """Delete rows older than cutoff in id batches"""
+        async with AsyncSessionLocal() as db:
+            if dry_run:
+                count = await db.scalar(select(func.count()).select_from(model).where(column < cutoff))
+                return {"cutoff": cutoff, "matching": count, "deleted": 0}
+
+            deleted = 0
+            while True:
+                batch = select(model.id).where(column < cutoff).limit(RETENTION_BATCH_SIZE)
+                result = await db.execute(delete(model).where(model.id.in_(batch)))
+                await db.commit()
+                deleted += result.rowcount
+                if result.rowcount < RETENTION_BATCH_SIZE:
+                    break
+                await asyncio.sleep(0)
+        return {"cutoff": cutoff, "deleted": deleted}
+
+    async def incremental_vacuum(self, pages: int = RETENTION_VACUUM_PAGES) -> Dict:
+        """Return up to `pages` free pages to the filesystem without a full VACUUM"""
+        async with engine.connect() as conn:
+            mode = (await conn.exec_driver_sql("PRAGMA auto_vacuum")).scalar()
+            free_before = (await conn.exec_driver_sql("PRAGMA freelist_count")).scalar()
+            if mode != 2:
+                return {
+                    "enabled": False,
+                    "free_pages": free_before,
+                    "hint": "run scripts/retention.py --enable-incremental-vacuum once"
+                }
+            # A plain execute steps the pragma once, freeing a single page;
+            # executescript runs it to completion
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+            free_after = (await conn.exec_driver_sql("PRAGMA freelist_count")).scalar()
+        return {"enabled": True, "freed_pages": free_before - free_after, "free_pages": free_after}
+
+    async def enable_incremental_vacuum(self):
+        """Switch an existing database to incremental auto-vacuum (one full VACUUM)"""
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+            await conn.exec_driver_sql("VACUUM")
+
+    async def get_archived_meeting(self, meeting_id: str) -> Optional[Dict]:
+        """Read an archived meeting back by attaching its month's file"""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(ArchivedMeeting.month).where(ArchivedMeeting.meeting_id == meeting_id)
+            )
+            month = result.scalar_one_or_none()
+        if month is None or not self.archive_path(month).exists():
+            return None
+
+        async with engine.connect() as conn:
+            await conn.exec_driver_sql("ATTACH DATABASE ? AS archive", (str(self.archive_path(month)),))
+            await conn.commit()
+            try:
+                archive = await conn.execution_options(schema_translate_map={None: "archive"})
+                async with AsyncSession(bind=archive) as db:
+                    result = await db.execute(select(Meeting).where(Meeting.meeting_id == meeting_id))
+                    meeting = result.scalar_one_or_none()
+                    if meeting is None:
+                        return None
+                    participants = await db.execute(
+                        select(Participant)
+                        .where(Participant.meeting_id == meeting_id)
+                        .order_by(Participant.join_time)
+                    )
+                    recordings = await db.execute(
+                        select(Recording)
+                        .where(Recording.meeting_id == meeting_id)
+                        .order_by(Recording.recording_start)
+                    )
+                    details = serialize_meeting(meeting)
+                    details["participants"] = [serialize_participant(p) for p in participants.scalars().all()]
+                    details["recordings"] = [serialize_recording(r) for r in recordings.scalars().all()]
+                details["archived"] = True
+                details["archive_month"] = month
+                return details
+            finally:
+                await conn.rollback()
+                await conn.exec_driver_sql("DETACH DATABASE archive")
+                await conn.commit()
+
+    async def run_periodically(self, interval_hours: float = RETENTION_INTERVAL_HOURS):
+        """Background loop started by the app when RETENTION_INTERVAL_HOURS is set"""
+        while True:
+            await asyncio.sleep(interval_hours * 3600)
+            with log_context(job_id=new_job_id("retention")):
+                try:
+                    report = await self.run()
+                    logger.info("Retention run finished", extra={"report": report})
+                except Exception:
+                    logger.exception("Retention run failed")
+
+
+# Singleton instance
+retention_service = RetentionService()
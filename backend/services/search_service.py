@@ -0,0 +1,163 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, literal_column, null, table, column
+from typing import Dict, List, Optional, Tuple
+import os
+import re
+from config.database import Meeting, Participant, TranscriptSegment
+from services.serializers import (
+    MEETING_FIELDS,
+    PARTICIPANT_FIELDS,
+    SEGMENT_FIELDS,
+    serialize_meeting,
+    serialize_participant,
+    serialize_segment
+)
+
+# bm25 column weights: a topic hit outranks a host email hit, a name hit an email hit
+MEETING_WEIGHTS = (10.0, 1.0)
+PARTICIPANT_WEIGHTS = (5.0, 1.0)
+# Transcript text and speaker: a word spoken counts as much as a name
+TRANSCRIPT_WEIGHTS = (1.0, 1.0)
+
+# Queries matching more rows than this are listed newest first instead of by bm25
+SEARCH_RANK_MAX_MATCHES = int(os.getenv("SEARCH_RANK_MAX_MATCHES", "5000"))
+
+# The FTS5 tables created by config.database._create_search_indexes
+_meetings_fts = table("meetings_fts", column("rowid"))
+_participants_fts = table("participants_fts", column("rowid"))
+_transcripts_fts = table("transcript_segments_fts", column("rowid"))
+
+# Words of the query; FTS5's unicode61 tokenizer splits on the same boundaries
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(q: str) -> Optional[str]:
+    """Turn free text into an FTS5 query: every word must match as a prefix.
+
+    Each word is quoted so FTS5 operators and punctuation in user input are
+    searched literally, e.g. 'alice@exa' -> '"alice"* "exa"*'.
+    """
+    tokens = _TOKEN_RE.findall(q)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+class SearchService:
+    """Ranked prefix search over meetings, participants and transcripts via SQLite FTS5"""
+
+    async def _matching_ids(
+        self,
+        db: AsyncSession,
+        fts_table,
+        weights,
+        match: str,
+        limit: int,
+        offset: int
+    ) -> Tuple[List, bool]:
+        """One page of (rowid, score) for a MATCH, read from the index alone.
+
+        bm25 has to score every match before the top rows are known, so broad
+        queries (a two-letter prefix over a million names) are returned newest
+        first instead, with no score.
+        """
+        matches = literal_column(fts_table.name).op("MATCH")(match)
+        capped = select(fts_table.c.rowid).where(matches).limit(SEARCH_RANK_MAX_MATCHES + 1).subquery()
+        ranked = await db.scalar(select(func.count()).select_from(capped)) <= SEARCH_RANK_MAX_MATCHES
+
+        if ranked:
+            score = func.bm25(literal_column(fts_table.name), *weights)
+            query = select(fts_table.c.rowid, score).where(matches).order_by(score)
+        else:
+            query = select(fts_table.c.rowid, null()).where(matches).order_by(fts_table.c.rowid.desc())
+        result = await db.execute(query.limit(limit + 1).offset(offset))
+        return result.all(), ranked
+
+    async def search_meetings(self, db: AsyncSession, match: str, limit: int, offset: int) -> Dict:
+        hits, ranked = await self._matching_ids(db, _meetings_fts, MEETING_WEIGHTS, match, limit, offset)
+        ids = [rowid for rowid, _ in hits[:limit]]
+        result = await db.execute(
+            select(*[getattr(Meeting, field) for field in MEETING_FIELDS]).where(Meeting.id.in_(ids))
+        )
+        return self._page(hits, result.all(), limit, ranked, serialize_meeting)
+
+    async def search_participants(self, db: AsyncSession, match: str, limit: int, offset: int) -> Dict:
+        hits, ranked = await self._matching_ids(db, _participants_fts, PARTICIPANT_WEIGHTS, match, limit, offset)
+        ids = [rowid for rowid, _ in hits[:limit]]
+        result = await db.execute(
+            select(
+                *[getattr(Participant, field) for field in PARTICIPANT_FIELDS],
+                Participant.meeting_id,
+                Meeting.topic.label("meeting_topic")
+            )
+            .outerjoin(Meeting, Meeting.meeting_id == Participant.meeting_id)
+            .where(Participant.id.in_(ids))
+        )
+        return self._page(hits, result.all(), limit, ranked, self._participant_hit)
+
+    async def search_transcripts(self, db: AsyncSession, match: str, limit: int, offset: int) -> Dict:
+        hits, ranked = await self._matching_ids(db, _transcripts_fts, TRANSCRIPT_WEIGHTS, match, limit, offset)
+        ids = [rowid for rowid, _ in hits[:limit]]
+        result = await db.execute(
+            select(
+                *[getattr(TranscriptSegment, field) for field in SEGMENT_FIELDS],
+                TranscriptSegment.meeting_id,
+                Meeting.topic.label("meeting_topic")
+            )
+            .outerjoin(Meeting, Meeting.meeting_id == TranscriptSegment.meeting_id)
+            .where(TranscriptSegment.id.in_(ids))
+        )
+        return self._page(hits, result.all(), limit, ranked, self._segment_hit)
+
+    async def search(
+        self,
+        db: AsyncSession,
+        q: str,
+        types: List[str],
+        limit: int = 20,
+        offset: int = 0
+    ) -> Dict:
+        """Search the requested types; each gets its own ranked page"""
+        match = build_match_query(q)
+        response = {"query": q}
+        for search_type in types:
+            if match is None:
+                response[search_type] = {"results": [], "has_more": False, "ranked": True}
+            elif search_type == "meetings":
+                response[search_type] = await self.search_meetings(db, match, limit, offset)
+            elif search_type == "participants":
+                response[search_type] = await self.search_participants(db, match, limit, offset)
+            else:
+                response[search_type] = await self.search_transcripts(db, match, limit, offset)
+        return response
+
+    @staticmethod
+    def _participant_hit(row) -> Dict:
+        hit = serialize_participant(row)
+        hit["meeting_id"] = row.meeting_id
+        hit["meeting_topic"] = row.meeting_topic
+        return hit
+
+    @staticmethod
+    def _segment_hit(row) -> Dict:
+        hit = serialize_segment(row)
+        hit["meeting_id"] = row.meeting_id
+        hit["meeting_topic"] = row.meeting_topic
+        return hit
+
+    @staticmethod
+    def _page(hits, rows, limit: int, ranked: bool, serialize) -> Dict:
+        """Serialize one page in index order, trimming the look-ahead hit"""
+        by_id = {row.id: row for row in rows}
+        results = []
+        for rowid, score in hits[:limit]:
+            row = by_id.get(rowid)
+            if row is None:
+                continue
+            hit = serialize(row)
+            hit["score"] = score
+            results.append(hit)
+        return {"results": results, "has_more": len(hits) > limit, "ranked": ranked}
+
+# Singleton instance
+search_service = SearchService()
@@ -0,0 +1,84 @@
+from fastapi.responses import JSONResponse
+from typing import Any, Callable, Dict, Sequence
+from datetime import date, datetime
+import json
+from services.tracing import span
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+# Fields exposed by the API for each model, in response order
+MEETING_FIELDS = [
+    "id", "meeting_id", "topic", "start_time", "end_time", "duration",
+    "participant_count", "host_email", "created_at"
+]
+PARTICIPANT_FIELDS = [
+    "id", "person_id", "user_id", "user_name", "user_email", "join_time", "leave_time",
+    "duration", "device", "ip_address", "location"
+]
+SESSION_FIELDS = [
+    "id", "user_id", "user_name", "user_email", "join_time", "leave_time", "duration"
+]
+PERSON_FIELDS = [
+    "id", "user_id", "user_name", "user_email", "meetings_attended", "total_duration",
+    "first_seen", "last_seen"
+]
+RECORDING_FIELDS = [
+    "id", "recording_id", "recording_type", "file_size", "file_type",
+    "recording_start", "recording_end", "file_path", "status", "play_url",
+    "transcript_status", "segment_count"
+]
+SEGMENT_FIELDS = [
+    "id", "recording_id", "kind", "start_seconds", "end_seconds", "speaker", "text"
+]
+
+
+def compile_serializer(fields: Sequence[str], name: str = "serialize") -> Callable[[Any], Dict]:
+    """Build a row-to-dict function with the attribute reads unrolled.
+
+    Works on ORM instances and on column Rows alike. Datetimes are left as-is
+    and encoded by FastJSONResponse.
+    """
+    items = ", ".join(f"{field!r}: row.{field}" for field in fields)
+    source = f"def {name}(row):\n    return {{{items}}}\n"
+    namespace = {}
+    exec(source, namespace)
+    return namespace[name]
+
+
+serialize_meeting = compile_serializer(MEETING_FIELDS, "serialize_meeting")
+serialize_participant = compile_serializer(PARTICIPANT_FIELDS, "serialize_participant")
+serialize_session = compile_serializer(SESSION_FIELDS, "serialize_session")
+serialize_person = compile_serializer(PERSON_FIELDS, "serialize_person")
+serialize_recording = compile_serializer(RECORDING_FIELDS, "serialize_recording")
+serialize_segment = compile_serializer(SEGMENT_FIELDS, "serialize_segment")
+
+
+def _json_default(value):
+    """Fallback encoder for the stdlib json path"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content to JSON bytes, using orjson when available"""
+    with span("serialize") as current:
+        if orjson is not None:
+            body = orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        else:
+            body = json.dumps(content, default=_json_default, separators=(",", ":")).encode("utf-8")
+        current.annotate(bytes=len(body))
+    return body
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Return it directly from routes to skip FastAPI's jsonable_encoder pass.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
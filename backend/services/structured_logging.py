@@ -0,0 +1,248 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+
+# Root level, and per-logger overrides as "name=LEVEL,name=LEVEL"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+# "json" (one object per line) or "text"
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+# Records waiting for the writer thread; beyond this they are dropped and counted
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Throttled messages are logged this many times per window, then counted until it ends
+LOG_RATE_LIMIT_BURST = int(os.getenv("LOG_RATE_LIMIT_BURST", "5"))
+LOG_RATE_LIMIT_WINDOW_SECONDS = float(os.getenv("LOG_RATE_LIMIT_WINDOW_SECONDS", "60"))
+
+# Ids stamped on every record logged while they are set
+_context: Dict[str, ContextVar] = {
+    name: ContextVar(name, default=None) for name in ("request_id", "meeting_id", "job_id")
+}
+
+# LogRecord attributes that aren't caller-supplied extras
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message", "asctime", "throttle", "color_message", *_context
+}
+
+_listener: Optional[QueueListener] = None
+
+
+@contextmanager
+def log_context(**ids):
+    """Attach request_id, meeting_id or job_id to records logged inside the block"""
+    tokens = [(_context[name], _context[name].set(str(value))) for name, value in ids.items() if value is not None]
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+def new_job_id(kind: str) -> str:
+    return f"{kind}-{uuid.uuid4().hex[:12]}"
+
+
+class RateLimitFilter(logging.Filter):
+    """Lets a message logged with extra={"throttle": True} through LOG_RATE_LIMIT_BURST
+    times per window; the first one after a window with drops carries the count.
+
+    Messages are told apart by logger and format string, so log them with
+    %-style arguments rather than f-strings.
+    """
+
+    def __init__(self, burst: int = LOG_RATE_LIMIT_BURST, window: float = LOG_RATE_LIMIT_WINDOW_SECONDS):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        # (logger, format string) -> [window start, logged, suppressed]
+        self._seen: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "throttle", False):
+            return True
+        now = time.monotonic()
+        key = (record.name, str(record.msg))
+        with self._lock:
+            state = self._seen.get(key)
+            if state is None or now - state[0] >= self.window:
+                suppressed = state[2] if state else 0
+                self._seen[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if state[1] < self.burst:
+                state[1] += 1
+                return True
+            state[2] += 1
+            return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Hands records to the writer thread without ever waiting on it.
+
+    The message, context ids and traceback text are resolved here, on the
+    calling thread, so arguments that change afterwards can't alter the
+    record; JSON encoding and the write happen on the writer thread.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        for name, var in _context.items():
+            value = var.get()
+            if value is not None:
+                setattr(record, name, value)
+        if self.dropped:
+            record.dropped = self.dropped
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+        else:
+            # The count went out with this record
+            self.dropped -= getattr(record, "dropped", 0)
+
+
+def _extras(record: logging.LogRecord) -> Dict:
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, pid, message, context ids and extras"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "pid": record.process,
+            "message": record.getMessage()
+        }
+        for name in _context:
+            value = getattr(record, name, None)
+            if value is not None:
+                entry[name] = value
+        entry.update(_extras(record))
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines with context ids and extras as key=value pairs"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s [%(process)d] %(name)s %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        pairs = {name: getattr(record, name) for name in _context if getattr(record, name, None) is not None}
+        pairs.update(_extras(record))
+        if pairs:
+            suffix = " ".join(f"{key}={value}" for key, value in pairs.items())
+            first, newline, rest = line.partition("\n")
+            line = f"{first} {suffix}{newline}{rest}"
+        return line
+
+
+def _parse_levels(spec: str) -> Dict[str, str]:
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging(level: str = LOG_LEVEL, levels: str = LOG_LEVELS, fmt: str = LOG_FORMAT):
+    """Route every logger through a queue drained by a background writer thread.
+
+    Safe to call more than once; later calls only re-apply the levels.
+    uvicorn's own handlers are removed so access and error logs take the same
+    path. SQL statements are logged by raising "sqlalchemy.engine" to INFO,
+    and each HTTP request to Zoom by raising "httpx" to INFO.
+    """
+    global _listener
+    root = logging.getLogger()
+    root.setLevel(level.upper())
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+    # httpx logs every request at INFO; failed Zoom calls are logged by zoom_service
+    for name in ("httpx", "httpcore"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    for name, name_level in _parse_levels(levels).items():
+        logging.getLogger(name).setLevel(name_level)
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(TextFormatter() if fmt == "text" else JsonFormatter())
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    handler = NonBlockingQueueHandler(log_queue)
+    handler.addFilter(RateLimitFilter())
+
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
+
+    _listener = QueueListener(log_queue, stream)
+    _listener.start()
+    # Write out whatever is still queued at exit
+    atexit.register(_listener.stop)
+
+
+class RequestIdMiddleware:
+    """ASGI middleware giving each request an id for its log records.
+
+    An incoming X-Request-ID (from a proxy) is kept; either way the id is
+    returned in the X-Request-ID response header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id" and 0 < len(value) <= 64:
+                request_id = value.decode("latin-1")
+                break
+        request_id = request_id or uuid.uuid4().hex[:16]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", request_id.encode())]
+            await send(message)
+
+        with log_context(request_id=request_id):
+            await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,333 @@
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+import heapq
+import hmac
+import itertools
+import os
+import random
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Fraction of requests traced at random; requests can also ask with X-Profile
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+# Traces kept, slowest first
+SLOW_TRACE_BUFFER_SIZE = int(os.getenv("SLOW_TRACE_BUFFER_SIZE", "50"))
+# Spans recorded per trace; a sync of a large meeting can run thousands of statements
+PROFILING_MAX_SPANS = int(os.getenv("PROFILING_MAX_SPANS", "1000"))
+# Longest SQL text kept on a span
+SQL_SPAN_TEXT_LENGTH = 300
+
+# The trace of the request being handled, and the span new spans nest under
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+_parent_span: ContextVar[Optional[int]] = ContextVar("parent_span", default=None)
+
+
+class Trace:
+    """Span breakdown of one request"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, method: str, path: str, forced: bool):
+        self.id = f"{os.getpid()}-{next(self._ids)}"
+        self.method = method
+        self.path = path
+        self.route: Optional[str] = None
+        self.status: Optional[int] = None
+        self.forced = forced
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.spans: List[Dict] = []
+        self.dropped_spans = 0
+
+    def open_span(self, kind: str, name: str, started: Optional[float] = None) -> Optional[int]:
+        """Append a span and return its index, or None once the trace is full"""
+        if len(self.spans) >= PROFILING_MAX_SPANS:
+            self.dropped_spans += 1
+            return None
+        self.spans.append({
+            "kind": kind,
+            "name": name,
+            "parent": _parent_span.get(),
+            "start_ms": round(((started or time.perf_counter()) - self.started) * 1000, 3),
+            "duration_ms": None
+        })
+        return len(self.spans) - 1
+
+    def close_span(self, index: Optional[int], ended: Optional[float] = None, **details):
+        if index is None:
+            return
+        span = self.spans[index]
+        span["duration_ms"] = round(((ended or time.perf_counter()) - self.started) * 1000 - span["start_ms"], 3)
+        if details:
+            span.update(details)
+
+    def breakdown(self) -> Dict[str, Dict]:
+        """Self time per span kind: a commit span's flush statements count as sql, not commit"""
+        child_ms = [0.0] * len(self.spans)
+        for span in self.spans:
+            if span["parent"] is not None and span["duration_ms"] is not None:
+                child_ms[span["parent"]] += span["duration_ms"]
+        totals = {}
+        for span, children in zip(self.spans, child_ms):
+            if span["duration_ms"] is None:
+                continue
+            entry = totals.setdefault(span["kind"], {"count": 0, "ms": 0.0})
+            entry["count"] += 1
+            # Concurrent children can add up to more than their parent
+            entry["ms"] = round(entry["ms"] + max(span["duration_ms"] - children, 0.0), 3)
+        return totals
+
+    def summary(self) -> Dict:
+        total_ms = round((self.duration or 0) * 1000, 3)
+        breakdown = self.breakdown()
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "forced": self.forced,
+            "started_at": self.started_at,
+            "duration_ms": total_ms,
+            "breakdown": breakdown,
+            "other_ms": round(total_ms - sum(entry["ms"] for entry in breakdown.values()), 3),
+            "span_count": len(self.spans),
+            "dropped_spans": self.dropped_spans
+        }
+
+    def details(self) -> Dict:
+        return {**self.summary(), "spans": self.spans}
+
+    def server_timing(self) -> str:
+        """Server-Timing header value with the breakdown so far"""
+        elapsed = (time.perf_counter() - self.started) * 1000
+        parts = [
+            f'{kind};dur={entry["ms"]:.1f};desc="{entry["count"]}x"'
+            for kind, entry in self.breakdown().items()
+        ]
+        parts.append(f"total;dur={elapsed:.1f}")
+        return ", ".join(parts)
+
+
+class _Span:
+    """Context manager for a span under the current trace"""
+
+    __slots__ = ("trace", "kind", "name", "index", "token", "details")
+
+    def __init__(self, trace: Trace, kind: str, name: str):
+        self.trace = trace
+        self.kind = kind
+        self.name = name
+        self.details = {}
+
+    def annotate(self, **details):
+        self.details.update(details)
+
+    def __enter__(self):
+        self.index = self.trace.open_span(self.kind, self.name)
+        self.token = _parent_span.set(self.index) if self.index is not None else None
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.token is not None:
+            _parent_span.reset(self.token)
+        if exc_info[0] is not None:
+            self.details["error"] = exc_info[0].__name__
+        self.trace.close_span(self.index, **self.details)
+
+
+class _NoSpan:
+    """Stand-in when the request isn't traced"""
+
+    __slots__ = ()
+
+    def annotate(self, **details):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(kind: str, name: str = ""):
+    """Time a block as a span of the current request's trace; a no-op when not tracing"""
+    trace = _current_trace.get()
+    if trace is None:
+        return _NO_SPAN
+    return _Span(trace, kind, name)
+
+
+class SlowTraceBuffer:
+    """The N slowest finished traces, kept in a min-heap on duration"""
+
+    def __init__(self, size: int = SLOW_TRACE_BUFFER_SIZE):
+        self.size = size
+        self._heap: List[tuple] = []
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def add(self, trace: Trace):
+        entry = (trace.duration, trace.id, trace)
+        with self._lock:
+            self.recorded += 1
+            if len(self._heap) < self.size:
+                heapq.heappush(self._heap, entry)
+            elif trace.duration > self._heap[0][0]:
+                heapq.heapreplace(self._heap, entry)
+
+    def slowest(self, limit: Optional[int] = None) -> List[Trace]:
+        with self._lock:
+            traces = [trace for _, _, trace in sorted(self._heap, reverse=True)]
+        return traces[:limit] if limit else traces
+
+    def get(self, trace_id: str) -> Optional[Trace]:
+        with self._lock:
+            for _, _, trace in self._heap:
+                if trace.id == trace_id:
+                    return trace
+        return None
+
+    def clear(self):
+        with self._lock:
+            self._heap.clear()
+
+
+# Singleton instance
+slow_traces = SlowTraceBuffer()
+
+
+def _profile_requested(headers: List[tuple]) -> bool:
+    """X-Profile asks for a trace; with ADMIN_TOKEN set it must come with X-Admin-Token"""
+    profile = admin = None
+    for name, value in headers:
+        if name == b"x-profile":
+            profile = value
+        elif name == b"x-admin-token":
+            admin = value
+    if profile is None or profile.lower() not in (b"1", b"true"):
+        return False
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token:
+        return True
+    return admin is not None and hmac.compare_digest(admin, admin_token.encode())
+
+
+class TracingMiddleware:
+    """ASGI middleware that traces sampled or X-Profile requests into slow_traces.
+
+    Untraced requests cost a header lookup and, with PROFILING_SAMPLE_RATE
+    set, one random draw; the span hooks see no current trace and return.
+    Traced requests asked for with X-Profile get an X-Trace-Id and a
+    Server-Timing header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        forced = _profile_requested(scope["headers"])
+        if not forced and not (PROFILING_SAMPLE_RATE > 0 and random.random() < PROFILING_SAMPLE_RATE):
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(scope["method"], scope["path"], forced)
+        token = _current_trace.set(trace)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                trace.status = message["status"]
+                if forced:
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-trace-id", trace.id.encode()),
+                        (b"server-timing", trace.server_timing().encode())
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_trace.reset(token)
+            trace.duration = time.perf_counter() - trace.started
+            trace.route = getattr(scope.get("route"), "path", None)
+            slow_traces.add(trace)
+
+
+def trace_engine(engine):
+    """Record each statement, commit and refresh as spans of the current trace"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        trace = _current_trace.get()
+        if trace is not None:
+            conn.info.setdefault("trace_spans", []).append(
+                trace.open_span("sql", statement[:SQL_SPAN_TEXT_LENGTH])
+            )
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany):
+        trace = _current_trace.get()
+        if trace is not None and conn.info.get("trace_spans"):
+            trace.close_span(conn.info["trace_spans"].pop(), rows=cursor.rowcount)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(context):
+        trace = _current_trace.get()
+        spans = context.connection.info.get("trace_spans") if context.connection is not None else None
+        if trace is not None and spans:
+            trace.close_span(spans.pop(), error=type(context.original_exception).__name__)
+
+
+def _end_commit(session, **details):
+    started = session.info.pop("trace_commit", None)
+    trace = _current_trace.get()
+    if started is None or trace is None:
+        return
+    index, token = started
+    _parent_span.reset(token)
+    trace.close_span(index, **details)
+
+
+@event.listens_for(Session, "before_commit")
+def _before_commit(session):
+    trace = _current_trace.get()
+    if trace is None:
+        return
+    # Flush statements run inside the commit span
+    index = trace.open_span("commit", "flush + commit")
+    session.info["trace_commit"] = (index, _parent_span.set(index))
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    _end_commit(session)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _after_rollback(session, previous_transaction):
+    _end_commit(session, error="rollback")
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _orm_execute(orm_execute_state):
+    if (
+        _current_trace.get() is None
+        or not orm_execute_state.is_select
+        or orm_execute_state.load_options._refresh_state is None
+    ):
+        return None
+    mapper = orm_execute_state.bind_mapper
+    with span("refresh", mapper.class_.__name__ if mapper is not None else ""):
+        return orm_execute_state.invoke_statement()
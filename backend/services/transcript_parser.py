@@ -0,0 +1,138 @@
+"""
+Parsers for the text files Zoom cloud recordings include: WebVTT audio
+transcripts and closed captions, and in-meeting chat logs.
+
+Kept to the standard library with no app imports, so the pool processes
+that run them (see services.transcript_service) start quickly.
+"""
+from typing import List, Optional, Tuple
+import multiprocessing.context
+import re
+import sys
+import types
+
+# (start_seconds, end_seconds, speaker, text, words); end is None for chat
+Segment = Tuple[float, Optional[float], Optional[str], str, int]
+
+# "00:01:02.500 --> 00:01:04.000 align:start"; hours are optional
+_CUE_TIMING_RE = re.compile(
+    r"^((?:\d+:)?\d{1,2}:\d{2}[.,]\d{1,3})\s+-->\s+((?:\d+:)?\d{1,2}:\d{2}[.,]\d{1,3})"
+)
+# <v Alice Smith>text</v>, the standard WebVTT voice span
+_VOICE_RE = re.compile(r"<v(?:\.[^\s>]*)?\s+([^>]+)>")
+_TAG_RE = re.compile(r"</?[^>]+>")
+# "Alice Smith: text", how Zoom attributes transcript cues
+_SPEAKER_PREFIX_RE = re.compile(r"^([^:]{1,80}?):\s+(.*)$", re.DOTALL)
+# Longer prefixes are more likely a sentence with a colon than a name
+SPEAKER_PREFIX_MAX_WORDS = 5
+
+# "00:01:23\t From  Alice : text" (older) or "00:01:23 From Alice to Everyone:" (newer)
+_CHAT_LINE_RE = re.compile(
+    r"^(\d{1,2}:\d{2}:\d{2})\s+From\s+(.+?)(?:\s+to\s+(.+?))?\s*:(?:\s(.*))?$", re.IGNORECASE
+)
+
+
+def _seconds(timestamp: str) -> float:
+    parts = timestamp.replace(",", ".").split(":")
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def _split_speaker(text: str) -> Tuple[Optional[str], str]:
+    voice = _VOICE_RE.search(text)
+    if voice:
+        return voice.group(1).strip(), _TAG_RE.sub("", text).strip()
+    text = _TAG_RE.sub("", text).strip()
+    prefix = _SPEAKER_PREFIX_RE.match(text)
+    if prefix:
+        name = prefix.group(1).strip()
+        if name and len(name.split()) <= SPEAKER_PREFIX_MAX_WORDS and not name[0].islower():
+            return name, prefix.group(2).strip()
+    return None, text
+
+
+def parse_vtt(text: str) -> List[Segment]:
+    """Cues of a WebVTT file as segments, speakers taken from voice spans or
+    "Name: " prefixes. Cue numbers, NOTE, STYLE and REGION blocks are skipped.
+    """
+    segments = []
+    for block in re.split(r"\n\s*\n", text.replace("\r\n", "\n").replace("\r", "\n")):
+        lines = block.strip("\n").split("\n")
+        for index, line in enumerate(lines):
+            timing = _CUE_TIMING_RE.match(line.strip())
+            if timing:
+                break
+        else:
+            continue
+        body = " ".join(line.strip() for line in lines[index + 1:] if line.strip())
+        if not body:
+            continue
+        speaker, body = _split_speaker(body)
+        if body:
+            segments.append((_seconds(timing.group(1)), _seconds(timing.group(2)), speaker, body, len(body.split())))
+    return segments
+
+
+def parse_chat(text: str) -> List[Segment]:
+    """Messages to everyone in a Zoom chat log; direct and private messages
+    are left out. Continuation lines are joined to their message.
+    """
+    segments = []
+    current = None
+    for line in text.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+        header = _CHAT_LINE_RE.match(line)
+        if header:
+            if current:
+                segments.append(current)
+            timestamp, speaker, recipient, body = header.groups()
+            if recipient and not recipient.strip().lower().startswith("everyone"):
+                current = None
+                continue
+            current = [_seconds(timestamp), speaker.strip(), (body or "").strip()]
+        elif current is not None and line.strip():
+            current[2] = f"{current[2]} {line.strip()}" if current[2] else line.strip()
+    if current:
+        segments.append(current)
+    return [(start, None, speaker, body, len(body.split())) for start, speaker, body in segments if body]
+
+
+PARSERS = {
+    "transcript": parse_vtt,
+    "captions": parse_vtt,
+    "chat": parse_chat,
+}
+
+
+def parse_file(kind: str, path: str) -> List[Segment]:
+    """Read and parse one downloaded file; runs in a pool process"""
+    with open(path, encoding="utf-8-sig", errors="replace") as f:
+        return PARSERS[kind](f.read())
+
+
+class ParserProcess(multiprocessing.context.SpawnProcess):
+    """A spawned pool process that doesn't run the app's main script first.
+
+    spawn re-imports the parent's __main__ in every child, so functions
+    defined there can be unpickled. Under `python main.py` that is the
+    whole app (logging, the engine, every router), over a second per child.
+    parse_file needs none of it; an initializer can't help, as it runs
+    after the import. The class itself is unpickled in the child, hence
+    its place here rather than in services.transcript_service.
+    """
+
+    def start(self):
+        # spawn sends the main module to re-import when the child is started;
+        # an empty one sends nothing. Only the pool start-up runs meanwhile.
+        main = sys.modules["__main__"]
+        sys.modules["__main__"] = types.ModuleType("__main__")
+        try:
+            super().start()
+        finally:
+            sys.modules["__main__"] = main
+
+
+class ParserContext(multiprocessing.context.SpawnContext):
+    """The spawn context, with ParserProcess for a pool's processes"""
+    Process = ParserProcess
@@ -0,0 +1,267 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, insert, func, literal_column, table, column
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+import asyncio
+import logging
+import os
+import time
+from config.database import AsyncSessionLocal, Meeting, Recording, TranscriptSegment
+from services.coordination import coordinator
+from services.metrics import TRANSCRIPT_PARSE_LATENCY, TRANSCRIPT_SEGMENTS
+from services.serializers import SEGMENT_FIELDS, serialize_segment
+from services.structured_logging import log_context, new_job_id
+from services.transcript_parser import ParserContext, parse_file
+
+logger = logging.getLogger(__name__)
+
+# Processes parsing transcript and chat files; 0 parses on a thread of the app process instead
+TRANSCRIPT_WORKERS = int(os.getenv("TRANSCRIPT_WORKERS", "2"))
+# Files handed to the pool at once
+TRANSCRIPT_BATCH_SIZE = int(os.getenv("TRANSCRIPT_BATCH_SIZE", "8"))
+# How often the parsing worker looks for files queued by other workers
+TRANSCRIPT_POLL_SECONDS = float(os.getenv("TRANSCRIPT_POLL_SECONDS", "5"))
+
+# Recording file types that are parsed, and the segment kind they produce
+TEXT_FILE_KINDS = {"TRANSCRIPT": "transcript", "CC": "captions", "CHAT": "chat"}
+
+# The FTS5 table created by config.database._create_search_indexes
+_segments_fts = table("transcript_segments_fts", column("rowid"))
+
+
+
+class TranscriptService:
+    """Parses downloaded transcripts and chat logs into searchable segments.
+
+    A recording's transcript_status is the queue: download_recording marks
+    text files "queued", and the worker leading "transcripts" parses them in
+    a process pool, so a large file never holds up the event loop, and
+    stores the segments. Files queued before a restart are picked up again.
+    """
+
+    def __init__(self, workers: int = TRANSCRIPT_WORKERS):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    def queue(self, recording: Recording) -> bool:
+        """Mark a downloaded recording for parsing if it is a text file; the caller commits"""
+        if recording.file_type not in TEXT_FILE_KINDS or not recording.file_path:
+            return False
+        recording.transcript_status = "queued"
+        return True
+
+    def wake(self):
+        """Have the parsing loop, in whichever worker runs it, look for queued files now"""
+        self._wake_local()
+        coordinator.publish("transcripts.wake")
+
+    def _wake_local(self):
+        if self._wake is not None:
+            self._wake.set()
+
+    async def queue_downloaded(self, db: AsyncSession, meeting_id: Optional[str] = None, force: bool = False) -> int:
+        """Queue downloaded text files never parsed (or, with force, all of them)"""
+        query = select(Recording).where(Recording.file_path.isnot(None))
+        if meeting_id is not None:
+            query = query.where(Recording.meeting_id == meeting_id)
+        if not force:
+            query = query.where(Recording.transcript_status.is_(None))
+        queued = sum(self.queue(recording) for recording in (await db.execute(query)).scalars().all())
+        await db.commit()
+        if queued:
+            self.wake()
+        return queued
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process with a running event loop and open connections is unsafe
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=ParserContext())
+        return self._executor
+
+    async def _parse(self, kind: str, path: str) -> List:
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            if self.workers > 0:
+                segments = await asyncio.get_running_loop().run_in_executor(self._pool(), parse_file, kind, path)
+            else:
+                segments = await asyncio.to_thread(parse_file, kind, path)
+            outcome = "ok"
+            return segments
+        except BrokenProcessPool:
+            # A pool process died (e.g. killed for memory); start a new pool for later files
+            self.shutdown()
+            raise
+        finally:
+            TRANSCRIPT_PARSE_LATENCY.observe(time.perf_counter() - started, kind=kind, outcome=outcome)
+
+    async def process_queued(self, limit: int = TRANSCRIPT_BATCH_SIZE) -> int:
+        """Parse and store up to limit queued files; returns how many were handled"""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Recording.id, Recording.meeting_id, Recording.recording_id, Recording.file_type,
+                       Recording.file_path)
+                .where(Recording.transcript_status == "queued")
+                .order_by(Recording.id)
+                .limit(limit)
+            )
+            rows = result.all()
+        if not rows:
+            return 0
+
+        parsed = await asyncio.gather(
+            *[self._parse(TEXT_FILE_KINDS[row.file_type], row.file_path) for row in rows],
+            return_exceptions=True
+        )
+        for row, segments in zip(rows, parsed):
+            with log_context(meeting_id=row.meeting_id):
+                await self._store(row, segments)
+        return len(rows)
+
+    async def _store(self, row, segments):
+        """Replace a recording's segments with a fresh parse, or mark it failed"""
+        kind = TEXT_FILE_KINDS[row.file_type]
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(TranscriptSegment).where(TranscriptSegment.recording_id == row.recording_id))
+            if isinstance(segments, BaseException):
+                logger.warning("Could not parse %s %s: %s", kind, row.recording_id, segments)
+                status, count = "failed", 0
+            else:
+                if segments:
+                    await db.execute(insert(TranscriptSegment), [
+                        {
+                            "meeting_id": row.meeting_id,
+                            "recording_id": row.recording_id,
+                            "kind": kind,
+                            "start_seconds": start,
+                            "end_seconds": end,
+                            "speaker": speaker,
+                            "text": text,
+                            "words": words
+                        }
+                        for start, end, speaker, text, words in segments
+                    ])
+                status, count = "parsed", len(segments)
+                TRANSCRIPT_SEGMENTS.inc(count, kind=kind)
+            await db.execute(
+                update(Recording).where(Recording.id == row.id).values(transcript_status=status, segment_count=count)
+            )
+            # Recording responses and their ETags change with the status
+            await db.execute(
+                update(Meeting)
+                .where(Meeting.meeting_id == row.meeting_id)
+                .values({
+                    Meeting.recordings_version: func.coalesce(Meeting.recordings_version, 0) + 1,
+                    Meeting.updated_at: Meeting.updated_at
+                })
+            )
+            await db.commit()
+        if status == "parsed":
+            logger.info("Parsed %s %s into %d segments", kind, row.recording_id, count)
+
+    async def run_periodically(self, poll_seconds: float = TRANSCRIPT_POLL_SECONDS):
+        """Background loop run by the worker leading "transcripts" """
+        self._wake = asyncio.Event()
+        async with AsyncSessionLocal() as db:
+            backlog = await self.queue_downloaded(db)
+        if backlog:
+            logger.info("Queued %d downloaded transcript and chat files for parsing", backlog)
+        while True:
+            with log_context(job_id=new_job_id("transcripts")):
+                try:
+                    while await self.process_queued() > 0:
+                        pass
+                except Exception:
+                    logger.exception("Transcript parsing failed")
+            try:
+                await asyncio.wait_for(self._wake.wait(), poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def list_segments(
+        self,
+        db: AsyncSession,
+        meeting_id: str,
+        match: Optional[str] = None,
+        speaker: Optional[str] = None,
+        kind: Optional[str] = None,
+        limit: int = 200,
+        offset: int = 0
+    ) -> Dict:
+        """A meeting's segments in time order, optionally only those matching an FTS5 query"""
+        query = select(*[getattr(TranscriptSegment, field) for field in SEGMENT_FIELDS]).where(
+            TranscriptSegment.meeting_id == meeting_id
+        )
+        if match is not None:
+            matching = select(_segments_fts.c.rowid).where(literal_column(_segments_fts.name).op("MATCH")(match))
+            query = query.where(TranscriptSegment.id.in_(matching))
+        if speaker is not None:
+            query = query.where(TranscriptSegment.speaker == speaker)
+        if kind is not None:
+            query = query.where(TranscriptSegment.kind == kind)
+        result = await db.execute(
+            query.order_by(TranscriptSegment.start_seconds, TranscriptSegment.id).limit(limit + 1).offset(offset)
+        )
+        rows = result.all()
+        return {
+            "meeting_id": meeting_id,
+            "segments": [serialize_segment(row) for row in rows[:limit]],
+            "has_more": len(rows) > limit
+        }
+
+    async def talk_time(self, db: AsyncSession, meeting_id: str) -> Dict:
+        """Seconds spoken, segments and words per speaker, plus chat messages sent.
+
+        Talk time comes from the audio transcripts, or from the closed
+        captions when a meeting has no transcript; the two cover the same
+        speech, so adding both would count it twice.
+        """
+        result = await db.execute(
+            select(
+                TranscriptSegment.kind,
+                TranscriptSegment.speaker,
+                func.count(TranscriptSegment.id).label("segments"),
+                func.sum(TranscriptSegment.words).label("words"),
+                func.sum(TranscriptSegment.end_seconds - TranscriptSegment.start_seconds).label("seconds")
+            )
+            .where(TranscriptSegment.meeting_id == meeting_id)
+            .group_by(TranscriptSegment.kind, TranscriptSegment.speaker)
+        )
+        rows = result.all()
+        spoken_kind = "transcript" if any(row.kind == "transcript" for row in rows) else "captions"
+
+        speakers: Dict[Optional[str], Dict] = {}
+        for row in rows:
+            entry = speakers.setdefault(row.speaker, {
+                "speaker": row.speaker, "talk_seconds": 0.0, "share": 0.0,
+                "segments": 0, "words": 0, "chat_messages": 0
+            })
+            if row.kind == "chat":
+                entry["chat_messages"] += row.segments
+            elif row.kind == spoken_kind:
+                entry["talk_seconds"] = round(row.seconds or 0.0, 3)
+                entry["segments"] = row.segments
+                entry["words"] = row.words or 0
+
+        total = sum(entry["talk_seconds"] for entry in speakers.values())
+        for entry in speakers.values():
+            entry["share"] = round(entry["talk_seconds"] / total, 4) if total else 0.0
+        return {
+            "meeting_id": meeting_id,
+            "source": spoken_kind if total else None,
+            "total_talk_seconds": round(total, 3),
+            "speakers": sorted(speakers.values(), key=lambda entry: (-entry["talk_seconds"], -entry["chat_messages"]))
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Singleton instance
+transcript_service = TranscriptService()
+coordinator.subscribe("transcripts.wake", transcript_service._wake_local)
@@ -0,0 +1,170 @@
+from typing import Dict, Iterator, Optional
+import gzip
+import heapq
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from services.coordination import coordinator, WORKERS
+
+logger = logging.getLogger(__name__)
+
+# Record every verified webhook delivery here (gzip JSON lines); empty = off
+WEBHOOK_CAPTURE_PATH = os.getenv("WEBHOOK_CAPTURE_PATH", "")
+# Where POST /webhooks/capture may create logs; it only takes a file name
+WEBHOOK_CAPTURE_DIR = os.getenv("WEBHOOK_CAPTURE_DIR", "./data")
+# Deliveries waiting for the writer thread before new ones are dropped
+WEBHOOK_CAPTURE_QUEUE_SIZE = int(os.getenv("WEBHOOK_CAPTURE_QUEUE_SIZE", "10000"))
+
+# Request headers kept with each event; the rest is proxy noise
+CAPTURED_HEADERS = ("content-type", "x-zoom-signature", "x-zm-request-timestamp", "x-zoom-request-id")
+
+
+def capture_path(name: str) -> str:
+    """The path of a capture log called name, inside WEBHOOK_CAPTURE_DIR"""
+    if not name or name != os.path.basename(name) or name.startswith("."):
+        raise ValueError(f"Capture name must be a plain file name, not {name!r}")
+    return os.path.join(WEBHOOK_CAPTURE_DIR, name)
+
+
+class WebhookCapture:
+    """Appends raw webhook deliveries to a gzip JSON-lines log for later replay.
+
+    Each line holds the receive time, the signature headers and the body
+    exactly as it arrived, so benchmarks/replay_webhooks.py can re-deliver a
+    production storm with its original timing. record() only queues the
+    line; a writer thread compresses and writes it, and flushes whenever it
+    has caught up, so the log is readable up to about the last event even
+    if the app is killed.
+    """
+
+    def __init__(self, path: str = WEBHOOK_CAPTURE_PATH, queue_size: int = WEBHOOK_CAPTURE_QUEUE_SIZE):
+        self.path: Optional[str] = None
+        # The path asked for; with several workers each writes its own file next to it
+        self.requested_path: Optional[str] = None
+        self.queue_size = queue_size
+        self.captured = 0
+        self.dropped = 0
+        self.started_at: Optional[float] = None
+        self._queue: Optional[queue.SimpleQueue] = None
+        self._writer: Optional[threading.Thread] = None
+        if path:
+            # Every worker reads the same setting, so nothing is published
+            self._start(path)
+
+    @property
+    def active(self) -> bool:
+        return self._queue is not None
+
+    def start(self, path: str):
+        """Begin appending to path in every worker, stopping any capture in progress"""
+        self._start(path)
+        coordinator.publish("capture.start", path)
+
+    def stop(self):
+        """Stop recording in every worker"""
+        self._stop()
+        coordinator.publish("capture.stop")
+
+    def _start(self, path: str):
+        self.requested_path = path
+        if WORKERS > 1:
+            # Workers can't share one gzip stream; each writes webhooks.<pid>.jsonl.gz
+            head, _, tail = os.path.basename(path).partition(".")
+            path = os.path.join(os.path.dirname(path), f"{head}.{os.getpid()}.{tail}" if tail else f"{head}.{os.getpid()}")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._stop()
+        # Appending adds a gzip member; readers see one continuous stream
+        log = gzip.open(path, "ab")
+        self._queue = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write, args=(log, self._queue), name="webhook-capture", daemon=True)
+        self._writer.start()
+        self.path = path
+        self.captured = 0
+        self.dropped = 0
+        self.started_at = time.time()
+        logger.info("Capturing webhooks to %s", path)
+
+    def _stop(self):
+        """Stop recording; the writer thread writes out what is queued and closes the log"""
+        if self._queue is not None:
+            self._queue.put(None)
+            self._queue = None
+
+    def close(self, timeout: float = 5.0):
+        """Stop and wait for the writer thread to finish, at this worker's shutdown"""
+        writer = self._writer
+        self._stop()
+        if writer is not None:
+            writer.join(timeout)
+            self._writer = None
+
+    @staticmethod
+    def _write(log, lines: queue.SimpleQueue):
+        try:
+            while True:
+                line = lines.get()
+                if line is None:
+                    break
+                log.write(line)
+                if lines.empty():
+                    log.flush()
+        except Exception:
+            logger.exception("Webhook capture stopped writing")
+        finally:
+            log.close()
+
+    def record(self, body: bytes, headers) -> None:
+        """Queue one delivery for the writer thread; a no-op when capture is off"""
+        lines = self._queue
+        if lines is None:
+            return
+        if lines.qsize() >= self.queue_size:
+            # The disk can't keep up; losing a record beats stalling the webhook
+            self.dropped += 1
+            return
+        lines.put(json.dumps({
+            "received_at": time.time(),
+            "headers": {name: headers[name] for name in CAPTURED_HEADERS if name in headers},
+            "body": body.decode("utf-8", "replace")
+        }).encode() + b"\n")
+        self.captured += 1
+
+    def stats(self) -> Dict:
+        return {
+            "active": self.active,
+            "path": self.path,
+            "captured": self.captured,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "started_at": self.started_at
+        }
+
+
+def _read_log(path: str) -> Iterator[Dict]:
+    with gzip.open(path, "rb") as f:
+        try:
+            for line in f:
+                if line.endswith(b"\n"):
+                    yield json.loads(line)
+        except EOFError:
+            return
+
+
+def read_capture(*paths: str) -> Iterator[Dict]:
+    """Captured deliveries in the order they were received, merged across
+    the per-worker logs of a multi-worker capture.
+
+    A log cut off mid-write (the app was killed) ends at the last whole record.
+    """
+    return heapq.merge(*[_read_log(path) for path in paths], key=lambda record: record["received_at"])
+
+
+# Singleton instance
+webhook_capture = WebhookCapture()
+coordinator.subscribe("capture.start", webhook_capture._start)
+coordinator.subscribe("capture.stop", webhook_capture._stop)
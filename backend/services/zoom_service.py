@@ -1,39 +1,157 @@
-import httpx
 import os
 import base64
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple, Callable, Awaitable
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from config.database import OAuthToken
+from config.database import AsyncSessionLocal, OAuthToken
+from services.metrics import (
+    ZOOM_LATENCY,
+    ZOOM_RATE_LIMITED,
+    ZOOM_RETRIES,
+    ZOOM_STALE_RESPONSES,
+    DOWNLOAD_BYTES,
+    DOWNLOAD_LATENCY,
+    DOWNLOAD_THROUGHPUT
+)
+from services.tracing import span
+from services.coordination import coordinator
+from services.circuit_breaker import zoom_circuits, CircuitOpenError
+from services.lazy_import import lazy_import
 import asyncio
+import logging
+import time
+
+# Loaded on the first Zoom call (or by warm_up) rather than at startup
+httpx = lazy_import("httpx")
+aiofiles = lazy_import("aiofiles")
+
+logger = logging.getLogger(__name__)
+
+# Point these at benchmarks/fake_zoom.py to load-test without Zoom
+ZOOM_API_BASE_URL = os.getenv("ZOOM_API_BASE_URL", "https://api.zoom.us/v2")
+ZOOM_OAUTH_BASE_URL = os.getenv("ZOOM_OAUTH_BASE_URL", "https://zoom.us")
+
+# Retries of a call answered with 429, waiting for Retry-After (capped) in between
+ZOOM_MAX_RETRIES = int(os.getenv("ZOOM_MAX_RETRIES", "2"))
+ZOOM_MAX_RETRY_WAIT_SECONDS = float(os.getenv("ZOOM_MAX_RETRY_WAIT_SECONDS", "10"))
+
+# Seconds to connect, and to wait for each read or write, before a call fails (and counts against its circuit)
+ZOOM_TIMEOUT_SECONDS = float(os.getenv("ZOOM_TIMEOUT_SECONDS", "5"))
+ZOOM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("ZOOM_CONNECT_TIMEOUT_SECONDS", "3"))
+
+# Reads with a last good response serve it once Zoom takes longer than this
+ZOOM_STALE_AFTER_SECONDS = float(os.getenv("ZOOM_STALE_AFTER_SECONDS", "2"))
+
+# Upper bound on a worker's wait for another to finish refreshing the OAuth token
+TOKEN_REFRESH_LEASE_SECONDS = 30
+
+# Path segments kept in endpoint classes; anything else is an id
+ZOOM_RESOURCE_SEGMENTS = {"meetings", "past_meetings", "participants", "recordings", "report", "users"}
+
+
+def endpoint_class(endpoint: str) -> str:
+    """Metrics label for an API path: "/past_meetings/123/participants" -> "/past_meetings/{id}/participants" """
+    return "/".join(
+        segment if not segment or segment in ZOOM_RESOURCE_SEGMENTS else "{id}"
+        for segment in endpoint.split("?", 1)[0].split("/")
+    )
+
+
+def is_outage(error: BaseException) -> bool:
+    """Whether an error means Zoom is failing, rather than answering no (401, 404...)"""
+    if isinstance(error, (CircuitOpenError, httpx.TransportError)):
+        return True
+    return isinstance(error, httpx.HTTPStatusError) and (
+        error.response.status_code >= 500 or error.response.status_code == 429
+    )
 
 class ZoomService:
     def __init__(self):
-        self.base_url = "https://api.zoom.us/v2"
+        self.base_url = ZOOM_API_BASE_URL.rstrip("/")
+        self.oauth_base_url = ZOOM_OAUTH_BASE_URL.rstrip("/")
         self.account_id = os.getenv("ZOOM_ACCOUNT_ID")
         self.client_id = os.getenv("ZOOM_CLIENT_ID")
         self.client_secret = os.getenv("ZOOM_CLIENT_SECRET")
         self.redirect_uri = os.getenv("ZOOM_REDIRECT_URI")
+        # One refresh at a time in this process; the "oauth_refresh" lease does it across workers
+        self._refresh_lock = asyncio.Lock()
+        # Shared by every call so connections and the TLS setup are reused
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Read key -> (Unix time fetched, last good response) for read_or_stale
+        self._last_good: Dict[tuple, Tuple[float, Dict]] = {}
+        # Read key -> (monotonic start, task) of the fetch refreshing it
+        self._revalidating: Dict[tuple, Tuple[float, asyncio.Task]] = {}
+
+    def _http(self) -> "httpx.AsyncClient":
+        """The shared HTTP client, created on first use in the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            # A client can't outlive its event loop (scripts call asyncio.run more than once)
+            self._client = self._new_client()
+            self._client_loop = loop
+        return self._client
+
+    @staticmethod
+    def _new_client() -> "httpx.AsyncClient":
+        # No connection cap: concurrent syncs are bounded by Zoom's rate limits, not a pool wait
+        return httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=20),
+            timeout=httpx.Timeout(ZOOM_TIMEOUT_SECONDS, connect=ZOOM_CONNECT_TIMEOUT_SECONDS)
+        )
+
+    async def warm_up(self):
+        """Import httpx and build the client off the event loop, ahead of the first call.
+
+        Loading the TLS context alone takes tens of milliseconds.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._client_loop is loop:
+            return
+        client = await asyncio.to_thread(self._new_client)
+        if self._client is not None and self._client_loop is loop:
+            # A call created one in the meantime
+            await client.aclose()
+            return
+        self._client = client
+        self._client_loop = loop
+
+    async def close(self):
+        for _, task in self._revalidating.values():
+            task.cancel()
+        if self._client is not None and self._client_loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
 
     async def get_access_token(self, db: AsyncSession) -> Optional[str]:
         """Get access token from database, refresh if expired"""
-        result = await db.execute(
-            select(OAuthToken).order_by(OAuthToken.created_at.desc()).limit(1)
-        )
-        token_record = result.scalar_one_or_none()
+        token_record = await self._latest_token(db)
 
         if not token_record:
             raise Exception("No access token found. Please authenticate first.")
 
         # Check if token is expired
         if token_record.expires_at and datetime.utcnow() >= token_record.expires_at:
-            # Token expired, refresh it
-            new_token = await self.refresh_access_token(db, token_record.refresh_token)
-            return new_token
+            # Zoom invalidates a refresh token once used, so only one caller may
+            # refresh; the rest wait and pick up the token it stored
+            async with self._refresh_lock:
+                async with coordinator.exclusive("oauth_refresh", TOKEN_REFRESH_LEASE_SECONDS):
+                    token_record = await self._latest_token(db)
+                    if token_record.expires_at and datetime.utcnow() >= token_record.expires_at:
+                        return await self.refresh_access_token(db, token_record.refresh_token)
 
         return token_record.access_token
 
+    async def _latest_token(self, db: AsyncSession) -> Optional[OAuthToken]:
+        # populate_existing: another caller may have refreshed the row this session already loaded
+        result = await db.execute(
+            select(OAuthToken).order_by(OAuthToken.created_at.desc()).limit(1)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
     async def refresh_access_token(self, db: AsyncSession, refresh_token: Optional[str]) -> str:
         """Refresh access token using refresh token"""
         if not refresh_token:
@@ -41,43 +159,43 @@ class ZoomService:
 
         auth = base64.b64encode(f"{self.client_id}:{self.client_secret}".encode()).decode()
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://zoom.us/oauth/token",
-                data={
-                    "grant_type": "refresh_token",
-                    "refresh_token": refresh_token
-                },
-                headers={
-                    "Authorization": f"Basic {auth}",
-                    "Content-Type": "application/x-www-form-urlencoded"
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
+        client = self._http()
+        response = await self._guarded("/oauth/token", lambda: client.post(
+            f"{self.oauth_base_url}/oauth/token",
+            data={
+                "grant_type": "refresh_token",
+                "refresh_token": refresh_token
+            },
+            headers={
+                "Authorization": f"Basic {auth}",
+                "Content-Type": "application/x-www-form-urlencoded"
+            }
+        ))
+        response.raise_for_status()
+        data = response.json()
 
-            # Update token in database
-            result = await db.execute(
-                select(OAuthToken).order_by(OAuthToken.created_at.desc()).limit(1)
+        # Update token in database
+        result = await db.execute(
+            select(OAuthToken).order_by(OAuthToken.created_at.desc()).limit(1)
+        )
+        token_record = result.scalar_one_or_none()
+
+        if token_record:
+            expires_at = datetime.utcnow() + timedelta(seconds=data["expires_in"])
+            token_record.access_token = data["access_token"]
+            token_record.refresh_token = data.get("refresh_token", refresh_token)
+            token_record.expires_at = expires_at
+        else:
+            expires_at = datetime.utcnow() + timedelta(seconds=data["expires_in"])
+            token_record = OAuthToken(
+                access_token=data["access_token"],
+                refresh_token=data.get("refresh_token", refresh_token),
+                expires_at=expires_at
             )
-            token_record = result.scalar_one_or_none()
-
-            if token_record:
-                expires_at = datetime.utcnow() + timedelta(seconds=data["expires_in"])
-                token_record.access_token = data["access_token"]
-                token_record.refresh_token = data.get("refresh_token", refresh_token)
-                token_record.expires_at = expires_at
-            else:
-                expires_at = datetime.utcnow() + timedelta(seconds=data["expires_in"])
-                token_record = OAuthToken(
-                    access_token=data["access_token"],
-                    refresh_token=data.get("refresh_token", refresh_token),
-                    expires_at=expires_at
-                )
-                db.add(token_record)
+            db.add(token_record)
 
-            await db.commit()
-            return data["access_token"]
+        await db.commit()
+        return data["access_token"]
 
     async def make_request(
         self, 
@@ -89,28 +207,138 @@ class ZoomService:
     ) -> Dict:
         """Make authenticated API request to Zoom"""
         access_token = await self.get_access_token(db)
+        label = endpoint_class(endpoint)
+        response = await self._guarded(label, lambda: self._send(method, endpoint, label, access_token, data, params))
+        if response.status_code != 200:
+            error_msg = f"Zoom API Error ({response.status_code})"
+            try:
+                error_body = response.json()
+                error_msg = error_body.get("message", error_body.get("error", str(error_body)))
+            except:
+                error_msg = response.text or error_msg
+            logger.warning("Zoom API request failed: %s %s - %s", method, endpoint, error_msg,
+                           extra={"status": response.status_code})
+        response.raise_for_status()
+        return response.json()
 
-        async with httpx.AsyncClient() as client:
-            response = await client.request(
-                method,
-                f"{self.base_url}{endpoint}",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Content-Type": "application/json"
-                },
-                json=data,
-                params=params
-            )
-            if response.status_code != 200:
-                error_msg = f"Zoom API Error ({response.status_code})"
-                try:
-                    error_body = response.json()
-                    error_msg = error_body.get("message", error_body.get("error", str(error_body)))
-                except:
-                    error_msg = response.text or error_msg
-                print(f"Zoom API request failed: {method} {endpoint} - {error_msg}")
-            response.raise_for_status()
-            return response.json()
+    async def _guarded(self, label: str, send: Callable[[], Awaitable["httpx.Response"]]) -> "httpx.Response":
+        """Call send() through label's circuit breaker.
+
+        Timeouts, connection errors and 5xx responses count as failures; any
+        other response, 4xx and 429 included, shows Zoom is up.
+        """
+        breaker = zoom_circuits.get(label)
+        breaker.before_call()
+        try:
+            response = await send()
+        except httpx.TransportError:
+            breaker.failure()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        if response.status_code >= 500:
+            breaker.failure()
+        else:
+            breaker.success()
+        return response
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        label: str,
+        access_token: str,
+        data: Optional[Dict],
+        params: Optional[Dict]
+    ) -> "httpx.Response":
+        """One API call, retried while Zoom answers 429"""
+        client = self._http()
+        for attempt in range(ZOOM_MAX_RETRIES + 1):
+            # Per-second budget and 429 back-off shared by all workers
+            await coordinator.acquire_call(label, ZOOM_MAX_RETRY_WAIT_SECONDS)
+            started = time.perf_counter()
+            with span("zoom", f"{method} {label}") as current:
+                response = await client.request(
+                    method,
+                    f"{self.base_url}{endpoint}",
+                    headers={
+                        "Authorization": f"Bearer {access_token}",
+                        "Content-Type": "application/json"
+                    },
+                    json=data,
+                    params=params
+                )
+                current.annotate(status=response.status_code, attempt=attempt)
+            ZOOM_LATENCY.observe(time.perf_counter() - started, endpoint=label, status=response.status_code)
+            if response.status_code != 429:
+                break
+            ZOOM_RATE_LIMITED.inc(endpoint=label)
+            wait = self._retry_after(response, attempt)
+            await coordinator.block_calls(label, wait)
+            if attempt == ZOOM_MAX_RETRIES:
+                break
+            ZOOM_RETRIES.inc(endpoint=label)
+            await asyncio.sleep(wait)
+        return response
+
+    async def read_or_stale(
+        self,
+        label: str,
+        key: tuple,
+        fetch: Callable[[AsyncSession], Awaitable[Dict]]
+    ) -> Tuple[Dict, Optional[float]]:
+        """fetch's result, or the last good one for key while Zoom is failing or slow.
+
+        Concurrent reads of a key share one fetch, run on its own session so
+        it can outlive the request. Once a last good response exists, a fetch
+        failing with an outage, or still running ZOOM_STALE_AFTER_SECONDS
+        after it started, is answered with that instead; a slow fetch keeps
+        going and refreshes it for later reads. Returns the response and,
+        when it is stale, the Unix time it was fetched.
+        """
+        loop = asyncio.get_running_loop()
+        started, task = self._revalidating.get(key, (None, None))
+        if task is None or task.get_loop() is not loop:
+            started = time.monotonic()
+            task = asyncio.create_task(self._revalidate(key, fetch))
+            # Retrieved here in case every reader was answered stale before it failed
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self._revalidating[key] = (started, task)
+
+        last = self._last_good.get(key)
+        try:
+            if last is None:
+                return await asyncio.shield(task), None
+            remaining = max(started + ZOOM_STALE_AFTER_SECONDS - time.monotonic(), 0)
+            return await asyncio.wait_for(asyncio.shield(task), remaining), None
+        except asyncio.TimeoutError:
+            reason = "slow"
+        except Exception as e:
+            if last is None or not is_outage(e):
+                raise
+            reason = "outage"
+        ZOOM_STALE_RESPONSES.inc(endpoint=label, reason=reason)
+        fetched_at, response = last
+        return response, fetched_at
+
+    async def _revalidate(self, key: tuple, fetch: Callable[[AsyncSession], Awaitable[Dict]]) -> Dict:
+        try:
+            async with AsyncSessionLocal() as db:
+                response = await fetch(db)
+            self._last_good[key] = (time.time(), response)
+            return response
+        finally:
+            self._revalidating.pop(key, None)
+
+    @staticmethod
+    def _retry_after(response: "httpx.Response", attempt: int) -> float:
+        """Seconds to wait before retrying a 429: Retry-After, else exponential backoff"""
+        try:
+            wait = float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            wait = 2 ** attempt
+        return min(max(wait, 0), ZOOM_MAX_RETRY_WAIT_SECONDS)
 
     async def get_meeting_details(self, meeting_id: str, db: AsyncSession) -> Dict:
         """Get meeting details"""
@@ -131,28 +359,30 @@ class ZoomService:
                 try:
                     response = await self.make_request("GET", f"/meetings/{meeting_id}", db)
                     return response.get("participants", [])
-                except:
+                except httpx.HTTPStatusError as fallback_error:
+                    if is_outage(fallback_error):
+                        raise
                     return []
             elif e.response.status_code == 403 or "Paid" in str(e.response.text) or "ZMP" in str(e.response.text):
                 # Free account limitation - past meeting participants require paid account
-                print(f"Note: Past meeting participants require a paid Zoom account. Meeting ID: {meeting_id}")
+                logger.info("Past meeting participants require a paid Zoom account (meeting %s)", meeting_id,
+                            extra={"throttle": True})
                 # Try to get meeting report instead (might work for some data)
-                try:
-                    report = await self.get_meeting_report(meeting_id, db)
-                    if report and report.get("participants"):
-                        return report.get("participants", [])
-                except:
-                    pass
+                report = await self.get_meeting_report(meeting_id, db)
+                if report and report.get("participants"):
+                    return report.get("participants", [])
                 # Return empty list with a note
                 return []
             raise
 
     async def get_meeting_report(self, meeting_id: str, db: AsyncSession) -> Optional[Dict]:
-        """Get meeting report"""
+        """Get meeting report, or None if Zoom declines it; outages are raised"""
         try:
             return await self.make_request("GET", f"/report/meetings/{meeting_id}", db)
-        except Exception as e:
-            print(f"Error getting meeting report: {e}")
+        except httpx.HTTPStatusError as e:
+            if is_outage(e):
+                raise
+            logger.warning("Error getting meeting report for %s: %s", meeting_id, e)
             return None
 
     async def get_meeting_recordings(self, meeting_id: str, db: AsyncSession) -> List[Dict]:
@@ -166,7 +396,7 @@ class ZoomService:
             return response.get("recording_files", [])
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
-                print("No recordings found for this meeting")
+                logger.info("No recordings found for meeting %s", meeting_id, extra={"throttle": True})
                 return []
             raise
 
@@ -177,16 +407,15 @@ class ZoomService:
         db: AsyncSession
     ) -> str:
         """Download recording file"""
-        import aiofiles
-        import os
-
         access_token = await self.get_access_token(db)
 
         # Ensure directory exists
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
-        async with httpx.AsyncClient() as client:
-            async with client.stream(
+        started = time.perf_counter()
+        downloaded = 0
+        with span("zoom", "GET recording download") as current:
+            async with self._http().stream(
                 "GET",
                 download_url,
                 headers={"Authorization": f"Bearer {access_token}"}
@@ -195,7 +424,15 @@ class ZoomService:
                 async with aiofiles.open(file_path, "wb") as f:
                     async for chunk in response.aiter_bytes():
                         await f.write(chunk)
+                        # Counted per chunk so the byte rate shows during long downloads
+                        DOWNLOAD_BYTES.inc(len(chunk))
+                        downloaded += len(chunk)
+            current.annotate(bytes=downloaded)
 
+        elapsed = time.perf_counter() - started
+        DOWNLOAD_LATENCY.observe(elapsed)
+        if elapsed > 0:
+            DOWNLOAD_THROUGHPUT.observe(downloaded / elapsed)
         return file_path
 
     async def list_meetings(
@@ -215,6 +452,30 @@ class ZoomService:
             params={"type": meeting_type, "page_size": page_size}
         )
 
+    async def list_meetings_or_stale(
+        self,
+        user_id: str = "me",
+        meeting_type: str = "past",
+        page_size: int = 30
+    ) -> Tuple[Dict, Optional[float]]:
+        """list_meetings, falling back to its last good response (see read_or_stale)"""
+        return await self.read_or_stale(
+            "/users/{id}/meetings",
+            ("list_meetings", user_id, meeting_type, page_size),
+            lambda db: self.list_meetings(user_id, meeting_type, db, page_size=page_size)
+        )
+
+    def stats(self) -> Dict:
+        """Circuit states per endpoint class, and the age of each last good response"""
+        now = time.time()
+        return {
+            "circuits": zoom_circuits.stats(),
+            "last_good": [
+                {"key": list(key), "age_seconds": round(now - fetched_at, 1), "revalidating": key in self._revalidating}
+                for key, (fetched_at, _) in self._last_good.items()
+            ]
+        }
+
 
 # Singleton instance
 zoom_service = ZoomService()
@@ -0,0 +1,28 @@
+"""Shared test setup: a scratch database, set before any app module creates the engine"""
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='meeting-tracker-tests-')}/test.db"
+
+
+@pytest.fixture
+def run():
+    """Run a coroutine in a fresh event loop, closing the engine's connections after"""
+    from config.database import engine
+
+    def run(coro):
+        async def main():
+            try:
+                return await coro
+            finally:
+                await engine.dispose()
+        return asyncio.run(main())
+    return run
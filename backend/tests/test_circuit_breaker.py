@@ -0,0 +1,145 @@
+import asyncio
+import time
+import httpx
+import pytest
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN, HALF_OPEN, zoom_circuits
+from services.zoom_service import ZoomService, zoom_service
+
+OPEN_SECONDS = 0.05
+
+
+def _opened(failure_threshold: int = 3) -> CircuitBreaker:
+    breaker = CircuitBreaker("test", failure_threshold=failure_threshold, open_seconds=OPEN_SECONDS)
+    for _ in range(failure_threshold):
+        breaker.before_call()
+        breaker.failure()
+    return breaker
+
+
+def test_failures_open_the_circuit():
+    breaker = CircuitBreaker("test", failure_threshold=3, open_seconds=OPEN_SECONDS)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.failure()
+    assert breaker.state == CLOSED
+    # A success starts the count again
+    breaker.before_call()
+    breaker.success()
+    for _ in range(2):
+        breaker.before_call()
+        breaker.failure()
+    assert breaker.state == CLOSED
+    breaker.before_call()
+    breaker.failure()
+    assert breaker.state == OPEN
+
+
+def test_open_circuit_fails_fast():
+    breaker = _opened()
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.before_call()
+    assert 0 < error.value.retry_after <= OPEN_SECONDS
+    assert breaker.rejected == 1
+    assert breaker.stats()["state"] == OPEN
+
+
+def test_half_open_lets_one_probe_through():
+    breaker = _opened()
+    time.sleep(OPEN_SECONDS)
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_probe_failure_opens_again():
+    breaker = _opened()
+    time.sleep(OPEN_SECONDS)
+    breaker.before_call()
+    breaker.failure()
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_probe_success_closes():
+    breaker = _opened()
+    time.sleep(OPEN_SECONDS)
+    breaker.before_call()
+    breaker.success()
+    assert breaker.state == CLOSED
+    assert breaker.failures == 0
+    breaker.before_call()
+    breaker.before_call()
+
+
+def test_release_lets_the_next_call_probe():
+    breaker = _opened()
+    time.sleep(OPEN_SECONDS)
+    breaker.before_call()
+    breaker.release()
+    assert breaker.state == HALF_OPEN
+    breaker.before_call()
+
+
+def test_cancelled_probe_is_released(run):
+    breaker = zoom_circuits.get("/test/cancelled")
+    breaker.failure_threshold = 1
+    breaker.open_seconds = OPEN_SECONDS
+
+    async def down():
+        raise httpx.ConnectTimeout("timed out")
+
+    async def hangs():
+        await asyncio.sleep(10)
+
+    async def up():
+        return httpx.Response(200)
+
+    async def scenario():
+        with pytest.raises(httpx.ConnectTimeout):
+            await zoom_service._guarded("/test/cancelled", down)
+        assert breaker.state == OPEN
+        await asyncio.sleep(OPEN_SECONDS)
+        probe = asyncio.create_task(zoom_service._guarded("/test/cancelled", hangs))
+        await asyncio.sleep(0)
+        assert breaker.state == HALF_OPEN
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        # Without release() the circuit would refuse every call from here on
+        response = await zoom_service._guarded("/test/cancelled", up)
+        assert response.status_code == 200
+        assert breaker.state == CLOSED
+
+    run(scenario())
+
+
+def _status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://api.zoom.us/v2/test")
+    return httpx.HTTPStatusError("test", request=request, response=httpx.Response(status, request=request))
+
+
+def _participants_after(first: int, fallback: Exception):
+    """get_meeting_participants where the past-meeting call answers `first` and its fallback raises"""
+    service = ZoomService()
+
+    async def make_request(method, endpoint, db, data=None, params=None):
+        if endpoint.startswith("/past_meetings/"):
+            raise _status_error(first)
+        raise fallback
+
+    service.make_request = make_request
+    return service.get_meeting_participants("123", None)
+
+
+@pytest.mark.parametrize("first", [404, 403])
+@pytest.mark.parametrize("outage", [CircuitOpenError("meetings", 30), httpx.ReadTimeout("slow"), _status_error(503)])
+def test_participant_fallbacks_raise_outages(first, outage):
+    with pytest.raises(type(outage)):
+        asyncio.run(_participants_after(first, outage))
+
+
+@pytest.mark.parametrize("first", [404, 403])
+def test_participant_fallbacks_declined_return_nothing(first):
+    assert asyncio.run(_participants_after(first, _status_error(404))) == []
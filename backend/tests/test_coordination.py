@@ -0,0 +1,187 @@
+import asyncio
+from sqlalchemy import delete, text
+from config.database import engine, Lease, WorkerBroadcast, _autoincrement_broadcast_ids
+from services.coordination import Coordinator, coordinator
+from services.live_state import LiveStateStore
+
+
+class Recorder:
+    def __init__(self, coordinator):
+        self.coordinator = coordinator
+        self.calls = []
+
+    def note(self, *args):
+        self.coordinator.publish("test.note", *args)
+        self._note(*args)
+
+    def _note(self, *args):
+        self.calls.append(args)
+
+
+async def _workers(*names):
+    """Coordinators acting as separate workers, each with a Recorder publishing "test.note" """
+    workers = []
+    for name in names:
+        coordinator = Coordinator(workers=2)
+        await coordinator.setup()
+        coordinator.worker_id = name
+        recorder = Recorder(coordinator)
+        coordinator.subscribe("test.note", recorder._note)
+        workers.append((coordinator, recorder))
+    async with engine.begin() as conn:
+        await conn.execute(delete(WorkerBroadcast))
+        await conn.execute(delete(Lease))
+    return workers
+
+
+async def _send(coordinator, recorder, *args):
+    recorder.note(*args)
+    await coordinator._flush()
+
+
+def test_broadcasts_are_received_in_order_and_not_echoed(run):
+    async def scenario():
+        (a, a_calls), (b, b_calls) = await _workers("a", "b")
+        a_calls.note(1)
+        a_calls.note(2)
+        await a._flush()
+        await b._receive()
+        await a._receive()
+        # b's replay is not broadcast back
+        await b._flush()
+        await a._receive()
+        return a_calls.calls, b_calls.calls, a.received, b.received
+
+    a_calls, b_calls, a_received, b_received = run(scenario())
+    assert a_calls == [(1,), (2,)]
+    assert b_calls == [(1,), (2,)]
+    assert (a_received, b_received) == (0, 2)
+
+
+def test_a_join_publishes_once():
+    live = LiveStateStore()
+    coordinator.multi_worker = True
+    try:
+        # Starts the meeting too, which is not published separately
+        live.participant_joined("m1", "u1", {"user_name": "Alice"})
+        published, coordinator._outbox = coordinator._outbox, []
+    finally:
+        coordinator.multi_worker = False
+    assert published == [("live.participant_joined", ("m1", "u1", {"user_name": "Alice"}))]
+    assert live.count("m1") == 1
+
+
+def test_broadcast_after_the_table_is_emptied_is_received(run):
+    async def scenario():
+        (a, a_calls), (b, b_calls) = await _workers("a", "b")
+        for n in range(3):
+            await _send(a, a_calls, n)
+        await b._receive()
+        # What the retention cleanup does after a quiet spell
+        async with engine.begin() as conn:
+            await conn.execute(delete(WorkerBroadcast))
+        await _send(a, a_calls, "after cleanup")
+        await b._receive()
+        return b_calls.calls
+
+    assert run(scenario())[-1] == ("after cleanup",)
+
+
+def test_receive_restarts_when_ids_go_backwards(run):
+    async def scenario():
+        (a, a_calls), (b, b_calls) = await _workers("a", "b")
+        for n in range(3):
+            await _send(a, a_calls, n)
+        await b._receive()
+        # A rebuilt table starts its ids over
+        async with engine.begin() as conn:
+            await conn.execute(delete(WorkerBroadcast))
+            await conn.execute(text("DELETE FROM sqlite_sequence WHERE name = 'worker_broadcasts'"))
+        await _send(a, a_calls, "rebuilt")
+        await b._receive()
+        return b_calls.calls
+
+    assert run(scenario())[-1] == ("rebuilt",)
+
+
+def test_old_broadcast_table_is_rebuilt_with_autoincrement(run):
+    async def scenario():
+        await _workers("a")
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP TABLE worker_broadcasts"))
+            await conn.execute(text(
+                "CREATE TABLE worker_broadcasts (id INTEGER NOT NULL, origin VARCHAR NOT NULL, "
+                "topic VARCHAR NOT NULL, payload TEXT NOT NULL, created_at FLOAT NOT NULL, PRIMARY KEY (id))"
+            ))
+            await conn.execute(text(
+                "INSERT INTO worker_broadcasts VALUES (41, 'a', 'test.note', '[]', 0), (42, 'a', 'test.note', '[]', 0)"
+            ))
+            await conn.run_sync(_autoincrement_broadcast_ids)
+            kept = (await conn.execute(text("SELECT id FROM worker_broadcasts ORDER BY id"))).scalars().all()
+            await conn.execute(delete(WorkerBroadcast))
+            await conn.execute(WorkerBroadcast.__table__.insert().values(origin="a", topic="t", payload="[]", created_at=0))
+            new_id = (await conn.execute(text("SELECT max(id) FROM worker_broadcasts"))).scalar()
+        return kept, new_id
+
+    kept, new_id = run(scenario())
+    assert kept == [41, 42]
+    assert new_id == 43
+
+
+def test_lease_is_held_until_it_expires_then_taken_over(run):
+    async def scenario():
+        (a, _), (b, _) = await _workers("a", "b")
+        steps = [
+            await a.try_acquire("job", ttl=0.2),
+            await b.try_acquire("job", ttl=0.2),
+            # The holder renews
+            await a.try_acquire("job", ttl=0.2),
+        ]
+        await asyncio.sleep(0.25)
+        steps += [
+            await b.try_acquire("job", ttl=10),
+            # The old holder can't renew a lease it lost
+            await a.try_acquire("job", ttl=10),
+        ]
+        return steps
+
+    assert run(scenario()) == [True, False, True, True, False]
+
+
+def test_release_only_drops_own_lease(run):
+    async def scenario():
+        (a, _), (b, _) = await _workers("a", "b")
+        await a.try_acquire("job", ttl=10)
+        await b.release("job")
+        held_by_a = not await b.try_acquire("job", ttl=10)
+        await a.release("job")
+        return held_by_a, await b.try_acquire("job", ttl=10)
+
+    assert run(scenario()) == (True, True)
+
+
+def test_exclusive_waits_for_the_holder(run):
+    async def scenario():
+        (a, _), (b, _) = await _workers("a", "b")
+        order = []
+
+        async def hold(coordinator, name):
+            async with coordinator.exclusive("startup", ttl=10, poll=0.01):
+                order.append(f"{name} in")
+                await asyncio.sleep(0.05)
+                order.append(f"{name} out")
+
+        first = asyncio.create_task(hold(a, "a"))
+        await asyncio.sleep(0.01)
+        await asyncio.gather(first, hold(b, "b"))
+        return order
+
+    assert run(scenario()) == ["a in", "a out", "b in", "b out"]
+
+
+def test_single_worker_grants_leases_without_the_database(run):
+    async def scenario():
+        single = Coordinator(workers=1)
+        return await single.try_acquire("job", ttl=10), single.multi_worker
+
+    assert run(scenario()) == (True, False)
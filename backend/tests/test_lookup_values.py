@@ -0,0 +1,124 @@
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from sqlalchemy import insert, select, text
+from sqlalchemy.exc import StatementError
+from config.database import init_db, AsyncSessionLocal, engine, lookup_cache, Meeting, Participant
+
+BACKEND = Path(__file__).parent.parent
+
+LEGACY_SCHEMA = """
+CREATE TABLE meetings (id INTEGER PRIMARY KEY, meeting_id VARCHAR NOT NULL UNIQUE, topic VARCHAR);
+CREATE TABLE participants (
+    id INTEGER PRIMARY KEY, meeting_id VARCHAR NOT NULL, user_name VARCHAR,
+    device VARCHAR, ip_address VARCHAR, location VARCHAR
+);
+INSERT INTO meetings (meeting_id) VALUES ('m1');
+INSERT INTO participants (meeting_id, user_name, device, location) VALUES
+    ('m1', 'Alice', 'Mac', 'Berlin, DE'), ('m1', 'Bob', 'iOS', NULL);
+"""
+
+
+def test_filter_on_a_value_never_stored_matches_nothing(run):
+    async def scenario():
+        await init_db()
+        async with AsyncSessionLocal() as db:
+            db.add(Meeting(meeting_id="lookup-filter"))
+            db.add(Participant(meeting_id="lookup-filter", user_name="Alice", device="Commodore 64"))
+            await db.commit()
+            query = select(Participant.user_name).where(Participant.meeting_id == "lookup-filter")
+            return (
+                (await db.execute(query.where(Participant.device == "Commodore 64"))).scalars().all(),
+                (await db.execute(query.where(Participant.device.in_(["Never stored"])))).scalars().all(),
+                (await db.execute(query.where(Participant.device != "Never stored"))).scalars().all(),
+            )
+
+    assert run(scenario()) == (["Alice"], [], ["Alice"])
+
+
+def test_core_write_of_a_new_value_raises(run):
+    async def scenario():
+        await init_db()
+        async with AsyncSessionLocal() as db:
+            await db.execute(insert(Participant).values(meeting_id="lookup-core", device="Never interned"))
+
+    with pytest.raises(StatementError) as raised:
+        run(scenario())
+    assert isinstance(raised.value.orig, LookupError)
+
+
+def test_id_from_another_process_is_caught_up_without_blocking(run):
+    async def scenario():
+        await init_db()
+        async with engine.begin() as conn:
+            # What another worker commits before its broadcast arrives
+            lookup_id = (await conn.execute(text(
+                "INSERT INTO lookup_values (kind, value) VALUES ('device', 'Amiga') RETURNING id"
+            ))).scalar()
+        first = lookup_cache.value_for(lookup_id)
+        await lookup_cache._catching_up
+        return first, lookup_cache.value_for(lookup_id)
+
+    assert run(scenario()) == (None, "Amiga")
+
+
+def test_id_older_than_a_broadcast_one_is_caught_up(run):
+    async def scenario():
+        await init_db()
+        async with engine.begin() as conn:
+            older = (await conn.execute(text(
+                "INSERT INTO lookup_values (kind, value) VALUES ('device', 'BeOS') RETURNING id"
+            ))).scalar()
+            newer = (await conn.execute(text(
+                "INSERT INTO lookup_values (kind, value) VALUES ('device', 'Haiku') RETURNING id"
+            ))).scalar()
+        # The newer id's broadcast arrives first
+        lookup_cache.learned([[newer, "device", "Haiku"]])
+        first = lookup_cache.value_for(older)
+        await lookup_cache._catching_up
+        return first, lookup_cache.value_for(older)
+
+    assert run(scenario()) == (None, "BeOS")
+
+
+def _run_backend(database, *args):
+    env = {**os.environ, "DATABASE_URL": f"sqlite+aiosqlite:///{database}"}
+    return subprocess.run([sys.executable, *args], cwd=BACKEND, env=env, capture_output=True, text=True, timeout=120)
+
+
+def test_legacy_columns_are_encoded_only_by_the_script(tmp_path):
+    database = tmp_path / "legacy.db"
+    conn = sqlite3.connect(database)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.close()
+    start = ["-c", "import asyncio; from config.database import init_db; asyncio.run(init_db())"]
+
+    refused = _run_backend(database, *start)
+    assert refused.returncode != 0
+    assert "participants.device, participants.location" in refused.stderr
+
+    encoded = _run_backend(database, "scripts/encode_lookup_columns.py")
+    assert encoded.returncode == 0, encoded.stderr
+    assert len(list(tmp_path.glob("legacy.db.*.bak"))) == 1
+    assert _run_backend(database, *start).returncode == 0
+
+    conn = sqlite3.connect(database)
+    rows = conn.execute(
+        "SELECT p.device, d.value, l.value FROM participants p "
+        "LEFT JOIN lookup_values d ON d.id = p.device_id LEFT JOIN lookup_values l ON l.id = p.location_id "
+        "ORDER BY p.id"
+    ).fetchall()
+    conn.close()
+    # The legacy column is kept until --drop-legacy
+    assert rows == [("Mac", "Mac", "Berlin, DE"), ("iOS", "iOS", None)]
+
+    dropped = _run_backend(database, "scripts/encode_lookup_columns.py", "--drop-legacy")
+    assert dropped.returncode == 0, dropped.stderr
+    conn = sqlite3.connect(database)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(participants)")}
+    conn.close()
+    assert "device" not in columns and "device_id" in columns
+    assert len(list(tmp_path.glob("legacy.db.*.bak"))) == 2
@@ -0,0 +1,52 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import delete, func, select, update
+from config.database import init_db, AsyncSessionLocal, Meeting, Participant
+from services.parquet_export import parquet_export_service
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+MEETING_ID = "parquet-test"
+
+
+def _exported(output, table):
+    rows = pq.read_table(str(output / table)).to_pylist()
+    return sorted((row["id"], row["user_name"] if table == "participants" else row["topic"]) for row in rows)
+
+
+def test_updated_rows_replace_their_earlier_copies(run, tmp_path):
+    async def scenario():
+        await init_db()
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Participant).where(Participant.meeting_id == MEETING_ID))
+            await db.execute(delete(Meeting).where(Meeting.meeting_id == MEETING_ID))
+            db.add(Meeting(meeting_id=MEETING_ID, topic="Planning", start_time=datetime(2026, 1, 5, 10)))
+            for name in ("Alice", "Bob"):
+                db.add(Participant(meeting_id=MEETING_ID, user_name=name, join_time=datetime(2026, 1, 5, 10)))
+            await db.commit()
+            await parquet_export_service.export_all(str(tmp_path))
+
+            # Bob's row moves to another month partition
+            await db.execute(
+                update(Participant)
+                .where(Participant.meeting_id == MEETING_ID, Participant.user_name == "Bob")
+                .values(user_name="Bob B", join_time=datetime(2026, 2, 1, 9), updated_at=datetime.utcnow())
+            )
+            await db.commit()
+            incremental = await parquet_export_service.export_all(str(tmp_path))
+            participants = (await db.execute(select(Participant.id, Participant.user_name))).all()
+            meetings = (await db.execute(select(func.count()).select_from(Meeting))).scalar_one()
+
+        exported = _exported(tmp_path, "participants")
+        full = await parquet_export_service.export_all(str(tmp_path), full=True)
+        return incremental, exported, sorted(tuple(p) for p in participants), meetings, full
+
+    incremental, exported, participants, meetings, full = run(scenario())
+    assert incremental["tables"]["participants"]["replaced"] == 1
+    assert exported == participants
+    assert "Bob B" in [name for _, name in exported] and "Bob" not in [name for _, name in exported]
+    assert _exported(tmp_path, "participants") == participants
+    assert len(_exported(tmp_path, "meetings")) == meetings
+    # A full run leaves only its own files
+    assert full["tables"]["participants"]["replaced"] == len(participants)
+    assert len({path.name for path in tmp_path.glob("*/month=*/*")}) == 1
@@ -0,0 +1,114 @@
+from datetime import datetime
+from sqlalchemy import delete, func, select
+from config.database import init_db, AsyncSessionLocal, Meeting, Participant, ParticipantEvent, ParticipantSession
+from services.meeting_service import meeting_service
+
+MEETING_ID = "events-test"
+
+
+async def _meeting(db):
+    await init_db()
+    for model in (ParticipantEvent, ParticipantSession, Participant, Meeting):
+        await db.execute(delete(model).where(model.meeting_id == MEETING_ID))
+    await db.commit()
+    await meeting_service.store_meeting(db, {"meeting_id": MEETING_ID, "topic": "Standup"})
+
+
+async def _event(db, event_type, time, user_id="u1", user_name="Alice"):
+    await meeting_service.record_participant_event(db, {
+        "meeting_id": MEETING_ID,
+        "event_type": event_type,
+        "event_time": f"2026-01-05T{time}Z",
+        "user_id": user_id,
+        "user_name": user_name
+    })
+
+
+def _at(time):
+    return datetime.fromisoformat(f"2026-01-05T{time}")
+
+
+async def _sessions(db):
+    return [(s.user_id, s.join_time, s.leave_time) for s in await meeting_service.get_participant_sessions(db, MEETING_ID)]
+
+
+def test_join_shows_in_a_running_meeting(run):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            await _meeting(db)
+            await _event(db, "joined", "10:00:00")
+            await _event(db, "joined", "10:01:00", user_id="u2", user_name="Bob")
+            await _event(db, "left", "10:30:00", user_id="u2", user_name="Bob")
+
+            details = await meeting_service.get_meeting_details(db, MEETING_ID)
+            page = await meeting_service.list_participants(db, MEETING_ID)
+            stats = await meeting_service.get_participant_stats(db, MEETING_ID)
+        return details, page, stats
+
+    details, page, stats = run(scenario())
+    attendees = {p["user_name"]: p for p in details["participants"]}
+    assert attendees["Alice"]["leave_time"] is None
+    assert attendees["Alice"]["duration"] is None
+    assert attendees["Bob"]["duration"] == 29 * 60
+    assert details["participant_count"] == 2
+    assert [p["user_name"] for p in page["participants"]] == ["Alice", "Bob"]
+    # Stats cover attendance with a known duration: Bob's so far
+    assert (stats["total_participants"], stats["total_duration"]) == (1, 29 * 60)
+
+
+def test_rejoin_adds_a_session(run):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            await _meeting(db)
+            await _event(db, "joined", "10:00:00")
+            await _event(db, "left", "10:10:00")
+            await _event(db, "joined", "10:20:00")
+            # A repeated join continues the open session
+            await _event(db, "joined", "10:21:00")
+            await _event(db, "left", "10:50:00")
+            participants = (await db.execute(select(Participant).where(Participant.meeting_id == MEETING_ID))).scalars().all()
+            return participants, await _sessions(db)
+
+    participants, sessions = run(scenario())
+    assert sessions == [("u1", _at("10:00:00"), _at("10:10:00")), ("u1", _at("10:20:00"), _at("10:50:00"))]
+    assert len(participants) == 1
+    assert (participants[0].join_time, participants[0].leave_time) == (_at("10:00:00"), _at("10:50:00"))
+    assert participants[0].duration == 40 * 60
+
+
+def test_leave_delivered_before_its_join(run):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            await _meeting(db)
+            await _event(db, "left", "10:30:00")
+            await _event(db, "joined", "10:00:00")
+            return await _sessions(db)
+
+    assert run(scenario()) == [("u1", _at("10:00:00"), _at("10:30:00"))]
+
+
+def test_meeting_end_closes_open_sessions_and_drops_the_log(run):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            await _meeting(db)
+            await _event(db, "joined", "10:00:00")
+            await _event(db, "joined", "10:05:00", user_id="u2", user_name="Bob")
+            await _event(db, "left", "10:15:00", user_id="u2", user_name="Bob")
+            await meeting_service.compact_participant_events(db, MEETING_ID, _at("11:00:00"))
+            remaining = (await db.execute(
+                select(func.count()).select_from(ParticipantEvent).where(ParticipantEvent.meeting_id == MEETING_ID)
+            )).scalar_one()
+            participants = (await db.execute(
+                select(Participant.user_id, Participant.leave_time, Participant.duration)
+                .where(Participant.meeting_id == MEETING_ID)
+                .order_by(Participant.user_id)
+            )).all()
+            return remaining, await _sessions(db), participants
+
+    remaining, sessions, participants = run(scenario())
+    assert remaining == 0
+    assert sorted(sessions) == [
+        ("u1", _at("10:00:00"), _at("11:00:00")),
+        ("u2", _at("10:05:00"), _at("10:15:00")),
+    ]
+    assert [tuple(p) for p in participants] == [("u1", _at("11:00:00"), 3600), ("u2", _at("10:15:00"), 600)]
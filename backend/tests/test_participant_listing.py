@@ -0,0 +1,43 @@
+import json
+from datetime import datetime, timedelta
+from sqlalchemy import delete
+from config.database import init_db, AsyncSessionLocal, Meeting, Participant
+from routes.meetings import get_meeting_participants
+
+MEETING_ID = "listing-test"
+PARTICIPANTS = 150
+
+
+async def _list(db, limit=None, cursor=None):
+    response = await get_meeting_participants(
+        MEETING_ID, limit=limit, cursor=cursor, sort="join_time", order="asc", fields="user_name",
+        if_none_match=None, db=db
+    )
+    return json.loads(response.body)
+
+
+def test_without_limit_or_cursor_every_participant_is_returned(run):
+    async def scenario():
+        await init_db()
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Participant).where(Participant.meeting_id == MEETING_ID))
+            await db.execute(delete(Meeting).where(Meeting.meeting_id == MEETING_ID))
+            db.add(Meeting(meeting_id=MEETING_ID, participant_count=PARTICIPANTS))
+            start = datetime(2026, 1, 5, 10)
+            db.add_all([
+                Participant(meeting_id=MEETING_ID, user_name=f"User {n}", join_time=start + timedelta(seconds=n))
+                for n in range(PARTICIPANTS)
+            ])
+            await db.commit()
+            everyone = await _list(db)
+            first = await _list(db, limit=100)
+            rest = await _list(db, cursor=first["next_cursor"])
+        return everyone, first, rest
+
+    everyone, first, rest = run(scenario())
+    assert len(everyone["participants"]) == PARTICIPANTS
+    assert (everyone["limit"], everyone["next_cursor"]) == (None, None)
+    assert len(first["participants"]) == 100 and first["next_cursor"]
+    # A cursor alone pages by the default size
+    assert (len(rest["participants"]), rest["limit"], rest["next_cursor"]) == (50, 100, None)
+    assert first["participants"] + rest["participants"] == everyone["participants"]
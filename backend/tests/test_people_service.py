@@ -0,0 +1,68 @@
+from datetime import datetime
+from sqlalchemy import delete, select, text
+from config.database import init_db, AsyncSessionLocal, Meeting, Participant, Person
+from services.people_service import people_service
+
+EMAIL = "people-test@example.com"
+
+
+async def _fresh(db):
+    await init_db()
+    person = await people_service.resolve_people(db, [{"user_email": EMAIL}])
+    await db.execute(delete(Participant).where(Participant.person_id.in_(person.values())))
+    await db.execute(delete(Person).where(Person.user_email == EMAIL))
+    await db.commit()
+
+
+async def _changes(db) -> int:
+    return (await db.execute(text("SELECT total_changes()"))).scalar()
+
+
+def test_known_person_is_resolved_without_a_write(run):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            await _fresh(db)
+            info = {"user_email": EMAIL, "user_name": "Alice"}
+            first = await people_service.resolve_people(db, [info])
+            before = await _changes(db)
+            again = await people_service.resolve_people(db, [info, {"user_email": EMAIL}])
+            unchanged = await _changes(db) - before
+            renamed = await people_service.resolve_people(db, [{"user_email": EMAIL, "user_name": "Alice B", "user_id": "u9"}])
+            person = await db.get(Person, renamed[f"email:{EMAIL}"])
+            return first == again == renamed, unchanged, (person.user_name, person.user_id)
+
+    assert run(scenario()) == (True, 0, ("Alice B", "u9"))
+
+
+def test_deleting_attendance_recomputes_first_and_last_seen(run):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            await _fresh(db)
+            person_id = (await people_service.resolve_people(db, [{"user_email": EMAIL}]))[f"email:{EMAIL}"]
+            rows = []
+            for day in (1, 2, 3):
+                meeting_id = f"people-test-{day}"
+                await db.execute(delete(Participant).where(Participant.meeting_id == meeting_id))
+                await db.execute(delete(Meeting).where(Meeting.meeting_id == meeting_id))
+                db.add(Meeting(meeting_id=meeting_id))
+                row = Participant(meeting_id=meeting_id, person_id=person_id, user_email=EMAIL,
+                                  join_time=datetime(2026, 3, day, 10), duration=600)
+                db.add(row)
+                rows.append(row)
+            await db.commit()
+
+            seen = []
+            for row in (rows[0], rows[2]):
+                await db.delete(row)
+                await db.commit()
+                person = (await db.execute(
+                    select(Person.meetings_attended, Person.total_duration, Person.first_seen, Person.last_seen)
+                    .where(Person.id == person_id)
+                )).one()
+                seen.append(tuple(person))
+            return seen
+
+    assert run(scenario()) == [
+        (2, 1200, datetime(2026, 3, 2, 10), datetime(2026, 3, 3, 10)),
+        (1, 600, datetime(2026, 3, 2, 10), datetime(2026, 3, 2, 10)),
+    ]
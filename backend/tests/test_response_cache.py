@@ -0,0 +1,61 @@
+import json
+from sqlalchemy import update
+from config.database import init_db, AsyncSessionLocal, Meeting
+from routes.meetings import get_meeting
+from services.coordination import coordinator
+from services.meeting_service import meeting_service
+from services.response_cache import ResponseCache, response_cache, meeting_tag
+
+TAGS = ("meeting:1",)
+
+
+def test_response_computed_across_an_invalidation_is_not_stored():
+    cache = ResponseCache()
+    generation = cache.generation(TAGS)
+    cache._invalidate("meeting:1")
+    cache.set("key", b"old", TAGS, generation)
+    assert cache.get("key") is None
+
+    cache.set("key", b"new", TAGS, cache.generation(TAGS))
+    assert cache.get("key").body == b"new"
+
+
+def test_invalidated_tags_are_bounded():
+    cache = ResponseCache(max_entries=4)
+    generation = cache.generation(TAGS)
+    cache._invalidate("meeting:1")
+    for n in range(2, 100):
+        cache._invalidate(f"meeting:{n}")
+    assert len(cache._invalidated_at) == 4
+    # The tag was forgotten, but the response still began before its invalidation
+    cache.set("key", b"old", TAGS, generation)
+    assert cache.get("key") is None
+
+    cache.set("key", b"new", TAGS, cache.generation(TAGS))
+    assert cache.get("key").body == b"new"
+
+
+def test_cached_meeting_is_checked_against_other_workers_writes(run):
+    meeting_id = "cache-test"
+
+    async def scenario():
+        await init_db()
+        async with AsyncSessionLocal() as db:
+            await meeting_service.store_meeting(db, {"meeting_id": meeting_id, "topic": "Before"})
+            coordinator.multi_worker = True
+            try:
+                first = await get_meeting(meeting_id, None, db)
+                # Another worker's write, whose broadcast hasn't arrived yet
+                await db.execute(
+                    update(Meeting).where(Meeting.meeting_id == meeting_id)
+                    .values(topic="After", participants_version=Meeting.participants_version + 1)
+                )
+                await db.commit()
+                second = await get_meeting(meeting_id, None, db)
+            finally:
+                coordinator.multi_worker = False
+                coordinator._outbox = []
+                response_cache._invalidate(meeting_tag(meeting_id))
+        return json.loads(first.body)["topic"], json.loads(second.body)["topic"]
+
+    assert run(scenario()) == ("Before", "After")
@@ -0,0 +1,78 @@
+from concurrent.futures import ProcessPoolExecutor
+from services.transcript_parser import ParserContext, parse_chat, parse_file, parse_vtt
+
+TRANSCRIPT = """WEBVTT
+
+NOTE
+Speaker names were added by Zoom.
+
+STYLE
+::cue { color: white }
+
+1
+00:00:01.000 --> 00:00:04.500
+Alice Smith: Good morning, everyone.
+
+2
+00:00:05.000 --> 00:00:07.250 align:start position:10%
+<v Bob Jones>Morning! Can you all</v>
+<v Bob Jones>hear me?</v>
+
+3
+01:02:03,500 --> 01:02:05,000
+so the plan is: ship it on Friday.
+
+4
+00:00:09.000 --> 00:00:10.000
+
+"""
+
+CAPTIONS = """WEBVTT\r\n\r\n00:01.000 --> 00:02.500\r\nJust captions, no speaker\r\n\r\n01:05.000 --> 01:06.000\r\nthe agenda: item one\r\n"""
+
+CHAT = """00:01:02\t From  Alice Smith : Hello all
+00:02:10 From Bob Jones to Everyone: Here's the link:
+https://example.com/doc
+and the notes
+00:03:00 From Carol to Alice Smith(Direct Message): just for you
+this line is part of the direct message
+00:04:30 From Dave to Everyone:
+00:04:45 From Erin to Everyone: last one
+"""
+
+
+def test_vtt_cues_with_speakers():
+    assert parse_vtt(TRANSCRIPT) == [
+        (1.0, 4.5, "Alice Smith", "Good morning, everyone.", 3),
+        (5.0, 7.25, "Bob Jones", "Morning! Can you all hear me?", 6),
+        (3723.5, 3725.0, None, "so the plan is: ship it on Friday.", 8),
+    ]
+
+
+def test_vtt_without_hours_or_speakers():
+    assert parse_vtt(CAPTIONS) == [
+        (1.0, 2.5, None, "Just captions, no speaker", 4),
+        (65.0, 66.0, None, "the agenda: item one", 4),
+    ]
+
+
+def test_vtt_header_only():
+    assert parse_vtt("WEBVTT\n\nNOTE nothing said\n") == []
+
+
+def test_chat_messages_to_everyone():
+    assert parse_chat(CHAT) == [
+        (62.0, None, "Alice Smith", "Hello all", 2),
+        (130.0, None, "Bob Jones", "Here's the link: https://example.com/doc and the notes", 7),
+        (285.0, None, "Erin", "last one", 2),
+    ]
+
+
+def test_parse_file_in_pool(tmp_path):
+    path = tmp_path / "chat.txt"
+    path.write_text("﻿" + CHAT, encoding="utf-8")
+    with ProcessPoolExecutor(1, mp_context=ParserContext()) as pool:
+        assert pool.submit(parse_file, "chat", str(path)).result() == parse_chat(CHAT)
+        # The pool process imports the parser, not the app
+        modules = pool.submit(eval, "list(__import__('sys').modules)").result()
+    assert "services.transcript_parser" in modules
+    assert not [name for name in modules if name.split(".")[0] in ("main", "config", "routes", "fastapi")]
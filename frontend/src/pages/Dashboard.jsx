@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react'
 import { Link, useSearchParams } from 'react-router-dom'
-import { meetingsAPI } from '../services/api'
+import { meetingsAPI, eventsAPI } from '../services/api'
 import './Dashboard.css'
 
 function Dashboard() {
@@ -23,9 +23,22 @@ function Dashboard() {
     }
   }, [])
 
-  const fetchMeetings = async () => {
+  useEffect(() => {
+    // Refresh when webhooks report changes; coalesce bursts into one reload
+    let timer = null
+    const unsubscribe = eventsAPI.subscribe(() => {
+      clearTimeout(timer)
+      timer = setTimeout(() => fetchMeetings({ silent: true }), 1000)
+    })
+    return () => {
+      clearTimeout(timer)
+      unsubscribe()
+    }
+  }, [])
+
+  const fetchMeetings = async ({ silent = false } = {}) => {
     try {
-      setLoading(true)
+      if (!silent) setLoading(true)
       const response = await meetingsAPI.getAll()
       const meetingsList = response.data.meetings || []
       setMeetings(meetingsList)
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react'
 import { useParams } from 'react-router-dom'
-import { meetingsAPI } from '../services/api'
+import { meetingsAPI, eventsAPI } from '../services/api'
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer } from 'recharts'
 import './MeetingDetail.css'
 
@@ -16,9 +16,22 @@ function MeetingDetail() {
     fetchMeetingData()
   }, [meetingId])
 
-  const fetchMeetingData = async () => {
+  useEffect(() => {
+    // Refresh when webhooks report changes to this meeting
+    let timer = null
+    const unsubscribe = eventsAPI.subscribe(() => {
+      clearTimeout(timer)
+      timer = setTimeout(() => fetchMeetingData({ silent: true }), 1000)
+    }, meetingId)
+    return () => {
+      clearTimeout(timer)
+      unsubscribe()
+    }
+  }, [meetingId])
+
+  const fetchMeetingData = async ({ silent = false } = {}) => {
     try {
-      setLoading(true)
+      if (!silent) setLoading(true)
       console.log('Fetching meeting data for:', meetingId)
       const [meetingRes, statsRes, recordingsRes] = await Promise.all([
         meetingsAPI.getById(meetingId),
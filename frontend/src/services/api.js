@@ -23,6 +23,8 @@ export const meetingsAPI = {
   listFromZoom: (meetingType = 'past') => 
     api.get(`/api/meetings/zoom/list?meeting_type=${meetingType}`),
   getById: (meetingId) => api.get(`/api/meetings/${meetingId}`),
+  getBatch: (meetingIds, include = []) =>
+    api.post('/api/meetings/batch', { meeting_ids: meetingIds, include }),
   sync: (meetingId) => api.post(`/api/meetings/${meetingId}/sync`),
   getParticipants: (meetingId) => 
     api.get(`/api/meetings/${meetingId}/participants`),
@@ -37,5 +39,25 @@ export const meetingsAPI = {
     api.post(`/api/meetings/${meetingId}/recordings/${recordingId}/download`),
 }
 
+// Live webhook events (Server-Sent Events)
+const LIVE_EVENTS = [
+  'meeting.started',
+  'meeting.ended',
+  'meeting.participant_joined',
+  'meeting.participant_left',
+  'recording.completed',
+]
+
+export const eventsAPI = {
+  // Calls onEvent(data) for each event; returns a function that closes the stream
+  subscribe: (onEvent, meetingId = null) => {
+    const query = meetingId ? `?meeting_id=${encodeURIComponent(meetingId)}` : ''
+    const source = new EventSource(`${API_BASE_URL}/api/events${query}`)
+    const handler = (e) => onEvent(JSON.parse(e.data))
+    LIVE_EVENTS.forEach((type) => source.addEventListener(type, handler))
+    return () => source.close()
+  },
+}
+
 export default api
 